@@ -19,7 +19,7 @@ import json
 from datetime import datetime, date, timedelta
 from typing import Optional
 
-from flask import Blueprint, jsonify, request, current_app, send_file, redirect
+from flask import Blueprint, jsonify, request, current_app, redirect
 from flask_login import login_required, current_user
 from sqlalchemy import func, extract, or_, and_
 
@@ -31,8 +31,9 @@ from src.models.transcription_usage import TranscriptionUsage
 from src.services.token_tracking import TokenTracker
 from src.services.transcription_tracking import transcription_tracker
 from src.file_exporter import format_transcription_with_template
-from src.api.recordings import upload_file as _upload_file_ui
+from src.api.recordings import upload_file as _upload_file_ui, DEFAULT_SPEAKER_LABEL_RE
 from src.services.storage import get_storage_service
+from src.utils.file_delivery import send_audio_file
 
 # Create blueprint with /api/v1 prefix
 api_v1_bp = Blueprint('api_v1', __name__, url_prefix='/api/v1')
@@ -2011,14 +2012,14 @@ def get_recording_speakers(recording_id):
 
     # Get voice-based suggestions
     suggestions = {}
-    if recording.speaker_embeddings:
+    if recording.has_speaker_embeddings:
         try:
-            matches = find_matching_speakers(current_user.id, recording.speaker_embeddings)
-            for label, speaker_matches in matches.items():
+            for label, embedding in recording.get_speaker_embeddings().items():
+                speaker_matches = find_matching_speakers(embedding, current_user.id)
                 suggestions[label] = [{
                     'speaker_id': m['speaker_id'],
                     'name': m['name'],
-                    'similarity': round(m['similarity'] * 100, 1)
+                    'similarity': m['similarity']  # already a percentage
                 } for m in speaker_matches[:3]]
         except Exception as e:
             current_app.logger.error(f"Error getting speaker suggestions: {e}")
@@ -2048,16 +2049,19 @@ def assign_speakers(recording_id):
     }
     """
     from src.services.speaker import update_speaker_usage
-    from src.services.speaker_embedding_matcher import update_speaker_embedding
+    from src.services.speaker_embedding_matcher import update_speaker_embedding, get_speakers_by_name
     from src.services.speaker_snippets import create_speaker_snippets
     from src.services.job_queue import job_queue
 
+    # Resolve the login proxy once; the name loops below read it per speaker
+    user = current_user._get_current_object()
+    my_name = user.name or 'Me'
     try:
         recording = db.session.get(Recording, recording_id)
         if not recording:
             return jsonify({'error': 'Recording not found'}), 404
 
-        if not has_recording_access(recording, current_user, require_edit=True):
+        if not has_recording_access(recording, user, require_edit=True):
             return jsonify({'error': 'Permission denied'}), 403
 
         data = request.get_json()
@@ -2085,45 +2089,49 @@ def assign_speakers(recording_id):
 
         # --- Apply names to transcription (same logic as update_speakers in recordings.py) ---
         transcription_text = recording.transcription or ''
-        is_json = False
-        try:
-            transcription_data = json.loads(transcription_text)
-            is_json = isinstance(transcription_data, list)
-        except (json.JSONDecodeError, TypeError):
-            is_json = False
+        transcription_data = recording.transcription_parsed
+        is_json = isinstance(transcription_data, list)
 
         speaker_names_used = []
 
         if is_json:
+            # Dicts keep the applied names in first-seen order without a
+            # linear membership scan per segment. The speakers left in the
+            # transcript are collected in the same pass.
+            names_used = {}
+            final_speakers = set()
             for segment in transcription_data:
                 original_speaker_label = segment.get('speaker')
                 if original_speaker_label in speaker_map:
                     new_name_info = speaker_map[original_speaker_label]
                     new_name = new_name_info.get('name', '').strip()
                     if new_name_info.get('isMe') and not new_name:
-                        new_name = current_user.name or 'Me'
+                        new_name = my_name
                     if new_name:
                         segment['speaker'] = new_name
-                        if new_name not in speaker_names_used:
-                            speaker_names_used.append(new_name)
+                        names_used[new_name] = None
 
-            recording.transcription = json.dumps(transcription_data)
+                speaker = segment.get('speaker')
+                if speaker and str(speaker).strip():
+                    final_speakers.add(speaker)
+            speaker_names_used = list(names_used)
+
+            # Only re-serialize when a segment was actually relabelled
+            if names_used:
+                recording.set_transcription_data(transcription_data)
 
             # Update participants - exclude unresolved SPEAKER_XX labels
-            final_speakers = set()
-            for seg in transcription_data:
-                speaker = seg.get('speaker')
-                if speaker and str(speaker).strip():
-                    if not re.match(r'^SPEAKER_\d+$', str(speaker), re.IGNORECASE):
-                        final_speakers.add(speaker)
-            recording.participants = ', '.join(sorted(list(final_speakers)))
+            recording.participants = ', '.join(sorted(
+                speaker for speaker in final_speakers
+                if not DEFAULT_SPEAKER_LABEL_RE.match(str(speaker))
+            ))
         else:
             # Plain text transcript
-            new_participants = []
+            new_participants = {}
             for speaker_label, new_name_info in speaker_map.items():
                 new_name = new_name_info.get('name', '').strip()
                 if new_name_info.get('isMe') and not new_name:
-                    new_name = current_user.name or 'Me'
+                    new_name = my_name
                 if new_name:
                     transcription_text = re.sub(
                         r'\[\s*' + re.escape(speaker_label) + r'\s*\]',
@@ -2131,12 +2139,11 @@ def assign_speakers(recording_id):
                         transcription_text,
                         flags=re.IGNORECASE
                     )
-                    if new_name not in new_participants:
-                        new_participants.append(new_name)
+                    new_participants[new_name] = None
 
             recording.transcription = transcription_text
             recording.participants = ', '.join(new_participants)
-            speaker_names_used = new_participants
+            speaker_names_used = list(new_participants)
 
         # Update speaker usage statistics
         if speaker_names_used:
@@ -2145,25 +2152,23 @@ def assign_speakers(recording_id):
         # Update speaker voice embeddings if available
         embeddings_updated = 0
         snippets_created = 0
-        if recording.speaker_embeddings and speaker_map:
+        if recording.has_speaker_embeddings and speaker_map:
             try:
-                embeddings_data = json.loads(recording.speaker_embeddings) if isinstance(recording.speaker_embeddings, str) else recording.speaker_embeddings
-
                 speaker_label_to_name = {}
                 for speaker_label, speaker_info in speaker_map.items():
                     name = speaker_info.get('name', '').strip()
                     if speaker_info.get('isMe') and not name:
-                        name = current_user.name or 'Me'
-                    if name and not re.match(r'^SPEAKER_\d+$', name, re.IGNORECASE):
+                        name = my_name
+                    if name and not DEFAULT_SPEAKER_LABEL_RE.match(name):
                         speaker_label_to_name[speaker_label] = name
 
-                for speaker_label, embedding in embeddings_data.items():
-                    if speaker_label in speaker_label_to_name and embedding and len(embedding) == 256:
-                        speaker_name = speaker_label_to_name[speaker_label]
-                        speaker_obj = Speaker.query.filter_by(
-                            user_id=current_user.id,
-                            name=speaker_name
-                        ).first()
+                # Visit only the named labels, not every diarized speaker
+                embeddings_data = recording.get_speaker_embeddings() if speaker_label_to_name else {}
+                speakers_by_name = get_speakers_by_name(user.id, speaker_label_to_name.values())
+                for speaker_label, speaker_name in speaker_label_to_name.items():
+                    embedding = embeddings_data.get(speaker_label)
+                    if embedding is not None and len(embedding) == 256:
+                        speaker_obj = speakers_by_name.get(speaker_name)
                         if speaker_obj:
                             update_speaker_embedding(speaker_obj, embedding, recording.id)
                             embeddings_updated += 1
@@ -2178,10 +2183,10 @@ def assign_speakers(recording_id):
         summary_queued = False
         if regenerate_summary:
             job_queue.enqueue(
-                user_id=current_user.id,
+                user_id=user.id,
                 recording_id=recording.id,
                 job_type='summarize',
-                params={'user_id': current_user.id}
+                params={'user_id': user.id}
             )
             summary_queued = True
 
@@ -2228,11 +2233,7 @@ def identify_speakers(recording_id):
         if not recording.transcription:
             return jsonify({'error': 'No transcription available for speaker identification'}), 400
 
-        try:
-            transcription_data = json.loads(recording.transcription)
-        except (json.JSONDecodeError, TypeError):
-            return jsonify({'error': 'Transcription format not supported for auto-identification'}), 400
-
+        transcription_data = recording.transcription_parsed
         if not isinstance(transcription_data, list):
             return jsonify({'error': 'Transcription format not supported for auto-identification'}), 400
 
@@ -2540,7 +2541,7 @@ def download_audio(recording_id):
     if not delivery.local_path or not os.path.exists(delivery.local_path):
         return jsonify({'error': 'Audio file not found'}), 404
 
-    return send_file(
+    return send_audio_file(
         delivery.local_path,
         mimetype=recording.mime_type or 'audio/mpeg',
         as_attachment=download,
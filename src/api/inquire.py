@@ -17,7 +17,7 @@ from src.database import db
 from src.models import *
 from src.utils import *
 from src.services.embeddings import get_accessible_recording_ids, semantic_search_chunks, EMBEDDINGS_AVAILABLE
-from src.services.llm import call_llm_completion, call_chat_completion, process_streaming_with_thinking, client, chat_client, TokenBudgetExceeded
+from src.services.llm import call_llm_completion, call_chat_completion, process_streaming_with_thinking, client, chat_client, TokenBudgetExceeded, SSE_END_OF_STREAM_FRAME, sse_error_frame
 
 # Create blueprint
 inquire_bp = Blueprint('inquire', __name__)
@@ -28,6 +28,59 @@ ENABLE_AUTO_DELETION = os.environ.get('ENABLE_AUTO_DELETION', 'false').lower() =
 USERS_CAN_DELETE = os.environ.get('USERS_CAN_DELETE', 'true').lower() == 'true'
 ENABLE_INTERNAL_SHARING = os.environ.get('ENABLE_INTERNAL_SHARING', 'false').lower() == 'true'
 USE_ASR_ENDPOINT = os.environ.get('USE_ASR_ENDPOINT', 'false').lower() == 'true'
+CHAT_MAX_TOKENS = int(os.environ.get("CHAT_MAX_TOKENS", "2000"))
+CHAT_MODEL = os.environ.get('CHAT_MODEL')
+
+# Prefix the chat model emits when it wants the full transcript of a recording
+FULL_TRANSCRIPT_MARKER = "REQUEST_FULL_TRANSCRIPT:"
+
+# Thinking tags, matched against a lowercased mirror of the stream buffer
+_THINK_OPEN_RE = re.compile(r'<think(?:ing)?>')
+_THINK_CLOSE_RE = re.compile(r'</think(?:ing)?>')
+
+# Static part of the inquire chat system prompt. It is identical for every request and
+# is placed first so providers with prompt-prefix caching can skip re-encoding it.
+INQUIRE_SYSTEM_PROMPT_RULES = """You are a professional meeting and audio transcription analyst.
+
+IMPORTANT FORMATTING INSTRUCTIONS:
+You MUST use proper markdown formatting in your responses. Structure your response as follows:
+
+1. **Always use markdown syntax** - Use `#`, `##`, `###` for headings, `**bold**`, `*italic*`, `-` for lists, etc.
+2. Start with a brief summary or preamble if helpful
+3. Organize information by source transcript using clear markdown headings
+4. Use the format: `## [Recording Title] - [Date if available]` 
+5. Under each heading, provide the relevant information from that specific recording using bullet points and formatting
+6. Include speaker names when referring to specific statements using **bold** formatting
+7. Use bullet points (`-`) and sub-bullets for organizing information clearly
+
+**Required Example Structure:**
+Brief summary with **key points** highlighted...
+
+## Meeting Discussion on Project Implementation - 2024-06-18
+- **Speaker A** mentioned that "there's significant support needed for implementation"
+- **Speaker B** confirmed the upcoming meeting with the technical team
+- Key topics discussed:
+  - Budget planning considerations
+  - Timeline coordination needs
+
+## Budget Planning Meeting - 2024-05-30  
+- **Speaker A** reviewed the budget document
+- **Speaker C** will approve the final version for submission
+- Important details:
+  - Budget represents approximately 1/3 of the project total
+  - Coordination needed for upcoming milestones
+
+Order your response with notes from the most recent meetings first. Always use proper markdown formatting and structure by source recording for maximum clarity and readability."""
+
+
+def _lower_same_length(text):
+    """Lowercase text without changing its length so indices stay aligned with the original."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # A few non-ASCII characters expand when lowercased (e.g. 'İ'); leave those as-is
+    return ''.join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
 
 # Global helpers (will be injected from app)
 has_recording_access = None
@@ -280,7 +333,7 @@ Use proper markdown formatting including headings (##), bold (**text**), bullet
                                 {"role": "user", "content": user_message}
                             ],
                             temperature=0.7,
-                            max_tokens=int(os.environ.get("CHAT_MAX_TOKENS", "2000")),
+                            max_tokens=CHAT_MAX_TOKENS,
                             stream=True,
                             user_id=user_id,
                             operation_type='chat'
@@ -608,7 +661,11 @@ Respond with only a JSON array of strings: ["term1", "term2", ...]"""
                     
                     available_speakers = sorted(list(available_speakers))
                 
-                system_prompt = f"""You are a professional meeting and audio transcription analyst assisting {user_name}, who is a(n) {user_title} at {user_company}. {language_instruction}
+                # Static formatting rules first so prefix-caching providers can reuse them
+                # across requests; only the per-user/per-query part below varies.
+                system_prompt = INQUIRE_SYSTEM_PROMPT_RULES + f"""
+
+You are assisting {user_name}, who is a(n) {user_title} at {user_company}. {language_instruction}
 
 You are analyzing transcriptions from multiple recordings{filter_text}. The following context has been retrieved based on semantic similarity to the user's question:
 
@@ -620,60 +677,30 @@ The system has automatically analyzed your query and retrieved the most relevant
 
 **Available speakers in your recordings**: {', '.join(available_speakers) if available_speakers else 'None available'}
 
-**Recording IDs in context**: {list(recording_ids_in_context)}
-
-IMPORTANT FORMATTING INSTRUCTIONS:
-You MUST use proper markdown formatting in your responses. Structure your response as follows:
-
-1. **Always use markdown syntax** - Use `#`, `##`, `###` for headings, `**bold**`, `*italic*`, `-` for lists, etc.
-2. Start with a brief summary or preamble if helpful
-3. Organize information by source transcript using clear markdown headings
-4. Use the format: `## [Recording Title] - [Date if available]` 
-5. Under each heading, provide the relevant information from that specific recording using bullet points and formatting
-6. Include speaker names when referring to specific statements using **bold** formatting
-7. Use bullet points (`-`) and sub-bullets for organizing information clearly
-
-**Required Example Structure:**
-Brief summary with **key points** highlighted...
-
-## Meeting Discussion on Project Implementation - 2024-06-18
-- **Speaker A** mentioned that "there's significant support needed for implementation"
-- **Speaker B** confirmed the upcoming meeting with the technical team
-- Key topics discussed:
-  - Budget planning considerations
-  - Timeline coordination needs
-
-## Budget Planning Meeting - 2024-05-30  
-- **Speaker A** reviewed the budget document
-- **Speaker C** will approve the final version for submission
-- Important details:
-  - Budget represents approximately 1/3 of the project total
-  - Coordination needed for upcoming milestones
-
-Order your response with notes from the most recent meetings first. Always use proper markdown formatting and structure by source recording for maximum clarity and readability."""
+**Recording IDs in context**: {list(recording_ids_in_context)}"""
         
+                # Conversation tail shared by the initial prompt and any full-transcript re-issue
+                tail_messages = (list(message_history) if message_history else []) + [{"role": "user", "content": user_message}]
+
                 # Prepare messages array
-                messages = [{"role": "system", "content": system_prompt}]
-                if message_history:
-                    messages.extend(message_history)
-                messages.append({"role": "user", "content": user_message})
+                messages = [{"role": "system", "content": system_prompt}, *tail_messages]
 
                 # Enable streaming
                 stream = call_chat_completion(
                     messages=messages,
                     temperature=0.7,
-                    max_tokens=int(os.environ.get("CHAT_MAX_TOKENS", "2000")),
+                    max_tokens=CHAT_MAX_TOKENS,
                     stream=True,
                     user_id=user_id,
                     operation_type='chat'
                 )
 
-                # Buffer content to detect full transcript requests
-                response_buffer = ""
-
-                # Buffer content to detect full transcript requests
-                response_buffer = ""
+                # Buffer the opening of the response to detect full transcript requests.
+                # Parts are collected in a list and only joined while the prefix is undecided.
+                response_buffer_parts = []
+                check_transcript_request = True
                 content_buffer = ""
+                content_buffer_lower = ""
                 in_thinking = False
                 thinking_buffer = ""
                 
@@ -682,11 +709,21 @@ Order your response with notes from the most recent meetings first. Always use p
                         continue
                     content = chunk.choices[0].delta.content
                     if content:
-                        response_buffer += content
                         content_buffer += content
-                        
+                        content_buffer_lower += _lower_same_length(content)
+
+                        response_buffer = ""
+                        if check_transcript_request:
+                            response_buffer_parts.append(content)
+                            response_buffer = ''.join(response_buffer_parts).lstrip()
+                            # Once the opening can no longer become the marker, stop buffering
+                            if not (response_buffer.startswith(FULL_TRANSCRIPT_MARKER)
+                                    or FULL_TRANSCRIPT_MARKER.startswith(response_buffer)):
+                                check_transcript_request = False
+                                response_buffer_parts = []
+
                         # Check if this is a full transcript request
-                        if response_buffer.strip().startswith("REQUEST_FULL_TRANSCRIPT:"):
+                        if check_transcript_request and response_buffer.startswith(FULL_TRANSCRIPT_MARKER):
                             lines = response_buffer.split('\n')
                             request_line = lines[0].strip()
                             
@@ -717,10 +754,7 @@ Order your response with notes from the most recent meetings first. Always use p
                                             )
                                             
                                             # Create new messages with updated context
-                                            updated_messages = [{"role": "system", "content": updated_system_prompt}]
-                                            if message_history:
-                                                updated_messages.extend(message_history)
-                                            updated_messages.append({"role": "user", "content": user_message})
+                                            updated_messages = [{"role": "system", "content": updated_system_prompt}, *tail_messages]
                                             
                                             # Generate new response with full context
                                             yield create_status_response('responding', 'Analyzing full transcript...')
@@ -728,21 +762,21 @@ Order your response with notes from the most recent meetings first. Always use p
                                             new_stream = call_chat_completion(
                                                 messages=updated_messages,
                                                 temperature=0.7,
-                                                max_tokens=int(os.environ.get("CHAT_MAX_TOKENS", "2000")),
+                                                max_tokens=CHAT_MAX_TOKENS,
                                                 stream=True,
                                                 user_id=user_id,
                                                 operation_type='chat'
                                             )
 
                                             # Use helper function to process streaming with thinking tag support
-                                            for response in process_streaming_with_thinking(new_stream, user_id=user_id, operation_type='chat', model_name=os.environ.get('CHAT_MODEL')):
+                                            for response in process_streaming_with_thinking(new_stream, user_id=user_id, operation_type='chat', model_name=CHAT_MODEL):
                                                 yield response
                                             return
                                         else:
                                             # Recording not found or no permission
                                             error_msg = f"\n\nError: Unable to access full transcript for recording {recording_id}. Recording may not exist or you may not have permission."
                                             yield f"data: {json.dumps({'delta': error_msg})}\n\n"
-                                            yield f"data: {json.dumps({'end_of_stream': True})}\n\n"
+                                            yield SSE_END_OF_STREAM_FRAME
                                             return
                                             
                                 except (ValueError, IndexError):
@@ -754,7 +788,7 @@ Order your response with notes from the most recent meetings first. Always use p
                         while True:
                             if not in_thinking:
                                 # Look for opening thinking tag
-                                think_start = re.search(r'<think(?:ing)?>', content_buffer, re.IGNORECASE)
+                                think_start = _THINK_OPEN_RE.search(content_buffer_lower)
                                 if think_start:
                                     # Send any content before the thinking tag
                                     before_thinking = content_buffer[:think_start.start()]
@@ -764,16 +798,18 @@ Order your response with notes from the most recent meetings first. Always use p
                                     # Start capturing thinking content
                                     in_thinking = True
                                     content_buffer = content_buffer[think_start.end():]
+                                    content_buffer_lower = content_buffer_lower[think_start.end():]
                                     thinking_buffer = ""
                                 else:
                                     # No thinking tag found, send accumulated content
                                     if content_buffer:
                                         yield f"data: {json.dumps({'delta': content_buffer})}\n\n"
                                     content_buffer = ""
+                                    content_buffer_lower = ""
                                     break
                             else:
                                 # We're inside a thinking tag, look for closing tag
-                                think_end = re.search(r'</think(?:ing)?>', content_buffer, re.IGNORECASE)
+                                think_end = _THINK_CLOSE_RE.search(content_buffer_lower)
                                 if think_end:
                                     # Capture thinking content up to the closing tag
                                     thinking_buffer += content_buffer[:think_end.start()]
@@ -785,11 +821,13 @@ Order your response with notes from the most recent meetings first. Always use p
                                     # Continue processing after the closing tag
                                     in_thinking = False
                                     content_buffer = content_buffer[think_end.end():]
+                                    content_buffer_lower = content_buffer_lower[think_end.end():]
                                     thinking_buffer = ""
                                 else:
                                     # Still inside thinking tag, accumulate content
                                     thinking_buffer += content_buffer
                                     content_buffer = ""
+                                    content_buffer_lower = ""
                                     break
                 
                 # Handle any remaining content
@@ -800,14 +838,14 @@ Order your response with notes from the most recent meetings first. Always use p
                     # Regular content
                     yield f"data: {json.dumps({'delta': content_buffer})}\n\n"
                 
-                yield f"data: {json.dumps({'end_of_stream': True})}\n\n"
+                yield SSE_END_OF_STREAM_FRAME
 
             except TokenBudgetExceeded as e:
                 app.logger.warning(f"Token budget exceeded for user {user_id}: {e}")
                 yield f"data: {json.dumps({'error': str(e), 'budget_exceeded': True})}\n\n"
             except Exception as e:
                 app.logger.error(f"Error in enhanced chat generation: {e}")
-                yield f"data: {json.dumps({'error': str(e)})}\n\n"
+                yield sse_error_frame(e)
             finally:
                 ctx.pop()
 
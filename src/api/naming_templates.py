@@ -6,7 +6,6 @@ which define how recording titles are generated from filenames,
 metadata, and AI-generated content.
 """
 
-import json
 from datetime import datetime
 from flask import Blueprint, request, jsonify, current_app
 from flask_login import login_required, current_user
@@ -61,7 +60,7 @@ def create_naming_template():
         name=data['name'],
         template=data['template'],
         description=data.get('description'),
-        regex_patterns=json.dumps(regex_patterns) if regex_patterns else None,
+        regex_patterns=regex_patterns or None,
         is_default=data.get('is_default', False)
     )
 
@@ -129,7 +128,7 @@ def update_naming_template(template_id):
 
     if 'regex_patterns' in data:
         regex_patterns = data['regex_patterns']
-        template.regex_patterns = json.dumps(regex_patterns) if regex_patterns else None
+        template.regex_patterns = regex_patterns or None
 
     template.updated_at = datetime.utcnow()
 
@@ -152,8 +151,10 @@ def delete_naming_template(template_id):
 
     # Check if any tags are using this template
     from src.models import Tag
-    tags_using = Tag.query.filter_by(naming_template_id=template_id).count()
-    if tags_using > 0:
+    tags_query = Tag.query.filter_by(naming_template_id=template_id)
+    if db.session.query(tags_query.exists()).scalar():
+        # Only count the referencing tags once we know there is at least one
+        tags_using = tags_query.count()
         return jsonify({
             'error': f'Cannot delete template: {tags_using} tag(s) are using this template'
         }), 400
@@ -233,7 +234,7 @@ def create_default_naming_templates():
         name="Phone Call Format",
         template="{{caller_area}}-{{caller_ex}}-{{caller_sub}} → {{callee_area}}-{{callee_ex}}-{{callee_sub}} ({{year}}-{{month}}-{{day}})",
         description="For phone recordings: caller-callee-YYYYMMDD filenames",
-        regex_patterns=json.dumps(phone_call_patterns),
+        regex_patterns=phone_call_patterns,
         is_default=False
     )
     templates.append(template5)
@@ -2,56 +2,355 @@
 Push Notification API Endpoints
 Handles push notification subscriptions and delivery
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, current_app
 from flask_login import login_required, current_user
 from src.database import db
 from src.models.push_subscription import PushSubscription
-import json
+from src.utils.database import index_exists
+from src.utils.fast_json import dumps_bytes
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urlparse
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime
+import logging
+import threading
+import time
 
 
 push_bp = Blueprint('push', __name__)
+logger = logging.getLogger(__name__)
+
+# VAPID config, resolved once when the blueprint is registered (see _bootstrap_vapid_config)
+PUSH_ENABLED = False
+VAPID_PUBLIC_KEY = None
+VAPID_PRIVATE_KEY = None
+
+# Contact claim sent to push services in every VAPID JWT
+VAPID_CLAIMS_SUB = 'mailto:admin@speakr.app'
+# VAPID JWT lifetime; push services reject tokens valid for more than 24 hours
+VAPID_TOKEN_TTL_SECONDS = 12 * 60 * 60
+# Signed JWTs are reused per origin until an hour before they expire
+VAPID_TOKEN_REUSE_SECONDS = VAPID_TOKEN_TTL_SECONDS - 60 * 60
+_vapid_signer = (None, None)
+_vapid_header_cache = {}
+_vapid_lock = threading.Lock()
+
+# Keep bulk deletes of expired subscriptions under SQLite/PostgreSQL parameter limits
+EXPIRED_DELETE_CHUNK_SIZE = 500
+
+# Shared worker pool for webpush fan-out, created on first send and reused
+PUSH_MAX_WORKERS = 16
+_push_executor = None
+_push_executor_lock = threading.Lock()
+
+
+def _get_push_executor():
+    """Return the shared webpush executor, creating it on first use"""
+    global _push_executor
+    if _push_executor is None:
+        with _push_executor_lock:
+            if _push_executor is None:
+                _push_executor = ThreadPoolExecutor(
+                    max_workers=PUSH_MAX_WORKERS,
+                    thread_name_prefix='push-send'
+                )
+    return _push_executor
+
+
+# Background dispatcher so callers never wait on push delivery; kept separate from
+# the fan-out pool because each dispatch blocks on that pool's results
+PUSH_DISPATCH_WORKERS = 2
+_dispatch_executor = None
+
+
+def _get_dispatch_executor():
+    """Return the executor that runs queued send_push_notification calls"""
+    global _dispatch_executor
+    if _dispatch_executor is None:
+        with _push_executor_lock:
+            if _dispatch_executor is None:
+                _dispatch_executor = ThreadPoolExecutor(
+                    max_workers=PUSH_DISPATCH_WORKERS,
+                    thread_name_prefix='push-dispatch'
+                )
+    return _dispatch_executor
+
+
+# Async notifications per user are held this long and merged into one delivery
+PUSH_COALESCE_SECONDS = 0.5
+_pending = {}
+_pending_lock = threading.Lock()
+
+
+# pywebpush is optional; bound on first send and reused instead of importing per call
+_webpush = None
+_WebPushException = None
+_pywebpush_lock = threading.Lock()
+
+
+def _load_pywebpush():
+    """Return (webpush, WebPushException), importing pywebpush on first use
+
+    Raises ImportError when pywebpush is not installed.
+    """
+    global _webpush, _WebPushException
+    if _webpush is None:
+        with _pywebpush_lock:
+            if _webpush is None:
+                from pywebpush import webpush, WebPushException
+                _WebPushException = WebPushException
+                _webpush = webpush
+    return _webpush, _WebPushException
+
+
+# Concurrent deliveries allowed per push service origin, so a burst stays within
+# what one service will accept and a slow service can only tie up this many of
+# the shared workers
+PUSH_PER_ORIGIN_CONCURRENCY = 8
+_origin_semaphores = {}
+_origin_semaphores_lock = threading.Lock()
+
+
+# Per-request timeout for push service calls
+PUSH_HTTP_TIMEOUT_SECONDS = 30
+
+
+class _HttpxPushSession:
+    """requests-style post() over a shared httpx client, which is what pywebpush calls"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def post(self, url, data=None, headers=None, timeout=None):
+        kwargs = {'timeout': timeout} if timeout is not None else {}
+        response = self.client.post(url, content=data, headers=headers, **kwargs)
+        # pywebpush builds its error message from requests' Response.reason
+        response.reason = response.reason_phrase
+        return response
+
+
+def _http2_available():
+    """HTTP/2 in httpx needs the optional h2 package"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+# Shared HTTP client so sends to the same push service reuse one connection;
+# with h2 installed, concurrent sends are multiplexed over it as HTTP/2 streams
+_push_session = None
 
-# VAPID config is loaded lazily to avoid startup issues
-_vapid_config = None
+
+def _get_push_session():
+    """Return the shared session used for webpush deliveries"""
+    global _push_session
+    if _push_session is None:
+        with _push_executor_lock:
+            if _push_session is None:
+                import httpx
+
+                client = httpx.Client(
+                    http2=_http2_available(),
+                    timeout=PUSH_HTTP_TIMEOUT_SECONDS,
+                    limits=httpx.Limits(
+                        max_connections=PUSH_MAX_WORKERS,
+                        max_keepalive_connections=PUSH_MAX_WORKERS
+                    )
+                )
+                _push_session = _HttpxPushSession(client)
+    return _push_session
+
+
+def _push_origin(endpoint):
+    """Return the push service origin (scheme://host) for a subscription endpoint"""
+    parsed = urlparse(endpoint)
+    return f'{parsed.scheme}://{parsed.netloc}'
+
+
+def _get_origin_semaphore(origin):
+    """Return the semaphore bounding concurrent deliveries to one push service"""
+    semaphore = _origin_semaphores.get(origin)
+    if semaphore is None:
+        with _origin_semaphores_lock:
+            semaphore = _origin_semaphores.setdefault(
+                origin, threading.BoundedSemaphore(PUSH_PER_ORIGIN_CONCURRENCY)
+            )
+    return semaphore
+
+
+def _load_vapid(private_key):
+    """Build a py_vapid signer from a PEM or base64 (raw/DER) private key"""
+    from py_vapid import Vapid
+
+    if private_key.lstrip().startswith('-----BEGIN'):
+        return Vapid.from_pem(private_key.encode('utf-8'))
+    return Vapid.from_string(private_key=private_key)
+
+
+def _vapid_auth_headers(vapid, origin):
+    """Sign one VAPID JWT for a push service origin and return the request headers"""
+    return vapid.sign({
+        'aud': origin,
+        'sub': VAPID_CLAIMS_SUB,
+        'exp': int(time.time()) + VAPID_TOKEN_TTL_SECONDS
+    })
+
+
+def _get_vapid_signer():
+    """Return the parsed VAPID signer for VAPID_PRIVATE_KEY, parsing it only once"""
+    global _vapid_signer
+    private_key, vapid = _vapid_signer
+    if private_key != VAPID_PRIVATE_KEY or vapid is None:
+        with _vapid_lock:
+            private_key, vapid = _vapid_signer
+            if private_key != VAPID_PRIVATE_KEY or vapid is None:
+                vapid = _load_vapid(VAPID_PRIVATE_KEY)
+                _vapid_header_cache.clear()
+                _vapid_signer = (VAPID_PRIVATE_KEY, vapid)
+    return vapid
+
+
+def _cached_vapid_headers(vapid, origin):
+    """Return VAPID headers for an origin, re-signing only when the cached JWT nears expiry"""
+    now = time.time()
+    cached = _vapid_header_cache.get(origin)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    headers = _vapid_auth_headers(vapid, origin)
+    _vapid_header_cache[origin] = (now + VAPID_TOKEN_REUSE_SECONDS, headers)
+    return headers
 
 
 def _get_vapid_config():
-    """Load VAPID configuration lazily"""
-    global _vapid_config
-    if _vapid_config is None:
-        try:
-            from src.utils.vapid_keys import VAPID_PUBLIC_KEY, VAPID_PRIVATE_KEY, VAPID_ENABLED
-            _vapid_config = {
-                'enabled': VAPID_ENABLED,
-                'public_key': VAPID_PUBLIC_KEY,
-                'private_key': VAPID_PRIVATE_KEY
-            }
-        except Exception as e:
-            print(f"[Push] Failed to load VAPID config: {e}")
-            _vapid_config = {
-                'enabled': False,
-                'public_key': None,
-                'private_key': None
+    """Load VAPID configuration from the key store"""
+    try:
+        from src.utils.vapid_keys import VAPID_PUBLIC_KEY, VAPID_PRIVATE_KEY, VAPID_ENABLED
+        return {
+            'enabled': VAPID_ENABLED,
+            'public_key': VAPID_PUBLIC_KEY,
+            'private_key': VAPID_PRIVATE_KEY
+        }
+    except Exception as e:
+        logger.warning(f"Failed to load VAPID config: {e}")
+        return {
+            'enabled': False,
+            'public_key': None,
+            'private_key': None
+        }
+
+
+def _bootstrap_vapid_config(state):
+    """Resolve VAPID config once at registration so request paths only read constants"""
+    global PUSH_ENABLED, VAPID_PUBLIC_KEY, VAPID_PRIVATE_KEY
+    config = _get_vapid_config()
+    PUSH_ENABLED = bool(config['enabled'])
+    VAPID_PUBLIC_KEY = config['public_key']
+    VAPID_PRIVATE_KEY = config['private_key']
+
+
+push_bp.record_once(_bootstrap_vapid_config)
+
+
+# Whether ix_pushsub_user_endpoint exists, keyed by the engine it was checked on
+_user_endpoint_index = (None, False)
+
+
+def _has_user_endpoint_index():
+    """Check once per engine for the unique index the ON CONFLICT upsert targets"""
+    global _user_endpoint_index
+    engine = db.engine
+    checked_engine, present = _user_endpoint_index
+    if checked_engine is not engine:
+        present = index_exists(engine, 'push_subscriptions', 'ix_pushsub_user_endpoint')
+        _user_endpoint_index = (engine, present)
+    return present
+
+
+def _upsert_subscription(user_id, endpoint, p256dh_key, auth_key):
+    """
+    Insert a subscription or refresh the keys of an existing one; returns its id
+
+    PostgreSQL and SQLite do this in a single INSERT ... ON CONFLICT DO UPDATE
+    ... RETURNING statement keyed on the (user_id, endpoint) unique index, so
+    rotated browser keys are picked up without a separate SELECT. If the
+    migration could not create that index, ON CONFLICT has nothing to match,
+    so the savepoint fallback below is used instead.
+    """
+    values = {
+        'user_id': user_id,
+        'endpoint': endpoint,
+        'p256dh_key': p256dh_key,
+        'auth_key': auth_key
+    }
+    dialect = db.engine.dialect.name
+
+    if dialect in ('postgresql', 'sqlite') and _has_user_endpoint_index():
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        now = datetime.utcnow()
+        stmt = insert(PushSubscription).values(created_at=now, updated_at=now, **values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['user_id', 'endpoint'],
+            set_={
+                'p256dh_key': stmt.excluded.p256dh_key,
+                'auth_key': stmt.excluded.auth_key,
+                'updated_at': now
             }
-    return _vapid_config
+        ).returning(PushSubscription.id)
+        return db.session.execute(stmt).scalar_one()
+
+    # Other dialects, or no unique index: insert and fall back to updating the existing row
+    subscription = PushSubscription(**values)
+    try:
+        with db.session.begin_nested():
+            db.session.add(subscription)
+        return subscription.id
+    except IntegrityError:
+        existing = PushSubscription.query.filter_by(
+            user_id=user_id,
+            endpoint=endpoint
+        ).first()
+        if not existing:
+            raise
+        existing.p256dh_key = p256dh_key
+        existing.auth_key = auth_key
+        db.session.flush()
+        return existing.id
+
+
+# Serialized /api/push/config body, keyed by the config it was built from
+_config_response = (None, None)
 
 
 @push_bp.route('/api/push/config', methods=['GET'])
 def get_push_config():
     """Get push notification configuration for client"""
-    config = _get_vapid_config()
-    return jsonify({
-        'enabled': config['enabled'],
-        'public_key': config['public_key'] if config['enabled'] else None
-    })
+    global _config_response
+    key = (PUSH_ENABLED, VAPID_PUBLIC_KEY)
+    cached_key, body = _config_response
+    if cached_key != key or body is None:
+        body = dumps_bytes({
+            'enabled': PUSH_ENABLED,
+            'public_key': VAPID_PUBLIC_KEY if PUSH_ENABLED else None
+        })
+        _config_response = (key, body)
+
+    response = Response(body, mimetype='application/json')
+    # The key pair only changes on restart, so clients can skip the round trip
+    response.headers['Cache-Control'] = 'public, max-age=3600'
+    return response
 
 
 @push_bp.route('/api/push/subscribe', methods=['POST'])
 @login_required
 def subscribe():
     """Store push subscription for current user"""
-    config = _get_vapid_config()
-    if not config['enabled']:
+    if not PUSH_ENABLED:
         return jsonify({
             'success': False,
             'error': 'Push notifications not available'
@@ -66,39 +365,24 @@ def subscribe():
                 'error': 'Invalid subscription data'
             }), 400
 
-        # Check if subscription already exists
-        existing = PushSubscription.query.filter_by(
-            user_id=current_user.id,
-            endpoint=subscription_data['endpoint']
-        ).first()
-
-        if existing:
-            return jsonify({
-                'success': True,
-                'message': 'Already subscribed',
-                'subscription_id': existing.id
-            })
-
-        # Create new subscription
-        subscription = PushSubscription(
-            user_id=current_user.id,
-            endpoint=subscription_data['endpoint'],
-            p256dh_key=subscription_data.get('keys', {}).get('p256dh', ''),
-            auth_key=subscription_data.get('keys', {}).get('auth', '')
+        keys = subscription_data.get('keys', {})
+        subscription_id = _upsert_subscription(
+            current_user.id,
+            subscription_data['endpoint'],
+            keys.get('p256dh', ''),
+            keys.get('auth', '')
         )
-
-        db.session.add(subscription)
         db.session.commit()
 
         return jsonify({
             'success': True,
             'message': 'Subscription saved',
-            'subscription_id': subscription.id
+            'subscription_id': subscription_id
         })
 
     except Exception as e:
         db.session.rollback()
-        print(f"[Push] Subscription error: {e}")
+        logger.error(f"Subscription error: {e}")
         return jsonify({
             'success': False,
             'error': str(e)
@@ -109,10 +393,8 @@ def subscribe():
 @login_required
 def unsubscribe():
     """Remove push subscription for current user"""
-    config = _get_vapid_config()
-    if not config['enabled']:
-        return jsonify({'success': True, 'message': 'Push notifications not enabled'})
-
+    # Deliberately not gated on PUSH_ENABLED: subscriptions stored while push was
+    # enabled must stay removable after it is turned off
     try:
         subscription_data = request.json
 
@@ -142,7 +424,7 @@ def unsubscribe():
 
     except Exception as e:
         db.session.rollback()
-        print(f"[Push] Unsubscribe error: {e}")
+        logger.error(f"Unsubscribe error: {e}")
         return jsonify({
             'success': False,
             'error': str(e)
@@ -160,18 +442,26 @@ def send_push_notification(user_id, title, body, data=None, url=None):
         data: Optional dictionary of extra data
         url: Optional URL to open when notification is clicked
     """
-    config = _get_vapid_config()
-    if not config['enabled']:
-        print("[Push] Push notifications not enabled, skipping")
+    if not PUSH_ENABLED:
+        logger.debug("Push notifications not enabled, skipping")
         return
 
     try:
-        from pywebpush import webpush, WebPushException
-
-        subscriptions = PushSubscription.query.filter_by(user_id=user_id).all()
-
-        if not subscriptions:
-            print(f"[Push] No subscriptions found for user {user_id}")
+        webpush, WebPushException = _load_pywebpush()
+
+        # Plain (id, endpoint, p256dh, auth) rows: nothing else is read, and the
+        # tuples can be handed straight to the worker threads
+        targets = [
+            tuple(row) for row in db.session.query(
+                PushSubscription.id,
+                PushSubscription.endpoint,
+                PushSubscription.p256dh_key,
+                PushSubscription.auth_key
+            ).filter_by(user_id=user_id).all()
+        ]
+
+        if not targets:
+            logger.debug("No subscriptions found for user %s", user_id)
             return
 
         notification_data = {
@@ -185,48 +475,147 @@ def send_push_notification(user_id, title, body, data=None, url=None):
         if url:
             notification_data['data']['url'] = url
 
-        sent_count = 0
-        failed_count = 0
+        # Encrypted once per subscription, but serialized only once per notification
+        payload = dumps_bytes(notification_data)
+        session = _get_push_session()
+        vapid = _get_vapid_signer()
 
-        for subscription in subscriptions:
+        # The VAPID JWT only depends on the origin, so one signature per push
+        # service is reused across subscriptions and sends
+        origin_headers = {}
+        for origin in {_push_origin(target[1]) for target in targets}:
             try:
-                webpush(
-                    subscription_info={
-                        'endpoint': subscription.endpoint,
-                        'keys': {
-                            'p256dh': subscription.p256dh_key,
-                            'auth': subscription.auth_key
-                        }
-                    },
-                    data=json.dumps(notification_data),
-                    vapid_private_key=config['private_key'],
-                    vapid_claims={
-                        'sub': 'mailto:admin@speakr.app'
-                    }
-                )
-                sent_count += 1
-                print(f'[Push] Sent notification to user {user_id} subscription {subscription.id}')
+                origin_headers[origin] = _cached_vapid_headers(vapid, origin)
+            except Exception as e:
+                logger.warning('Failed to sign VAPID token for %s: %s', origin, e)
 
-            except WebPushException as e:
-                failed_count += 1
-                print(f'[Push] Failed to send to subscription {subscription.id}: {e}')
+        def _send_one(sub):
+            """Deliver to one subscription; returns (subscription_id, status)"""
+            sub_id, endpoint, p256dh_key, auth_key = sub
+            origin = _push_origin(endpoint)
+            vapid_headers = origin_headers.get(origin)
+            if vapid_headers is None:
+                return sub_id, 'failed'
 
-                # Remove expired subscriptions
-                if e.response and e.response.status_code in [404, 410]:
-                    print(f'[Push] Removing expired subscription {subscription.id}')
-                    db.session.delete(subscription)
+            try:
+                with _get_origin_semaphore(origin):
+                    webpush(
+                        subscription_info={
+                            'endpoint': endpoint,
+                            'keys': {
+                                'p256dh': p256dh_key,
+                                'auth': auth_key
+                            }
+                        },
+                        data=payload,
+                        headers=vapid_headers,
+                        requests_session=session
+                    )
+                logger.debug('Sent notification to user %s subscription %s', user_id, sub_id)
+                return sub_id, 'sent'
 
-            except Exception as e:
-                failed_count += 1
-                print(f'[Push] Unexpected error sending to subscription {subscription.id}: {e}')
+            except WebPushException as e:
+                logger.warning('Failed to send to subscription %s: %s', sub_id, e)
+                # Push services answer 404/410 for subscriptions that no longer exist
+                if e.response is not None and e.response.status_code in [404, 410]:
+                    return sub_id, 'expired'
+                return sub_id, 'failed'
 
-        # Commit any deletions
-        if failed_count > 0:
+            except Exception as e:
+                logger.warning('Unexpected error sending to subscription %s: %s', sub_id, e)
+                return sub_id, 'failed'
+
+        # Every subscription gets its own worker; the per-origin semaphore keeps
+        # a burst to one push service within its connection pool
+        results = list(_get_push_executor().map(_send_one, targets))
+
+        sent_count = sum(1 for _, status in results if status == 'sent')
+        failed_count = len(results) - sent_count
+
+        # Remove expired subscriptions on the request thread, one DELETE per chunk
+        expired_ids = [sub_id for sub_id, status in results if status == 'expired']
+        if expired_ids:
+            logger.info(f'Removing {len(expired_ids)} expired subscription(s): {expired_ids}')
+            for i in range(0, len(expired_ids), EXPIRED_DELETE_CHUNK_SIZE):
+                chunk = expired_ids[i:i + EXPIRED_DELETE_CHUNK_SIZE]
+                PushSubscription.query.filter(
+                    PushSubscription.id.in_(chunk)
+                ).delete(synchronize_session=False)
             db.session.commit()
 
-        print(f'[Push] Sent {sent_count} notifications, {failed_count} failed')
+        logger.info(f'Sent {sent_count} notifications, {failed_count} failed')
 
     except ImportError:
-        print("[Push] pywebpush not installed, cannot send notifications")
+        logger.warning("pywebpush not installed, cannot send notifications")
     except Exception as e:
-        print(f"[Push] Error sending notifications: {e}")
+        logger.error(f"Error sending notifications: {e}")
+
+
+def _merge_pending(messages):
+    """Collapse queued (title, body, data, url) messages into one notification"""
+    if len(messages) == 1:
+        return messages[0]
+
+    titles = [title for title, _, _, _ in messages]
+    urls = {url for _, _, _, url in messages}
+    data = dict(messages[-1][2] or {})
+    data['count'] = len(messages)
+    return (
+        f'{len(messages)} new notifications',
+        '\n'.join(titles),
+        data,
+        urls.pop() if len(urls) == 1 else None
+    )
+
+
+def _flush_user(app, user_id):
+    """Deliver everything queued for a user during the coalescing window"""
+    with _pending_lock:
+        entry = _pending.pop(user_id, None)
+    if entry is None:
+        return
+
+    messages, future = entry
+    if len(messages) > 1:
+        logger.debug('Coalesced %d notifications for user %s', len(messages), user_id)
+    title, body, data, url = _merge_pending(messages)
+
+    def _run():
+        try:
+            with app.app_context():
+                send_push_notification(user_id, title, body, data=data, url=url)
+            future.set_result(len(messages))
+        except Exception as e:
+            future.set_exception(e)
+
+    _get_dispatch_executor().submit(_run)
+
+
+def send_push_notification_async(user_id, title, body, data=None, url=None):
+    """
+    Queue a push notification for background delivery and return immediately
+
+    Takes the same arguments as send_push_notification. Notifications for the
+    same user arriving within PUSH_COALESCE_SECONDS are merged into a single
+    summary notification, then delivered on a dispatcher thread inside the
+    current app's context. Must be called with an app context active.
+
+    Returns a Future shared by every call merged into the same delivery (its
+    result is the number of merged messages), or None when push is disabled.
+    """
+    if not PUSH_ENABLED:
+        return None
+
+    app = current_app._get_current_object()
+    with _pending_lock:
+        entry = _pending.get(user_id)
+        if entry is not None:
+            entry[0].append((title, body, data, url))
+            return entry[1]
+
+        future = Future()
+        _pending[user_id] = ([(title, body, data, url)], future)
+        timer = threading.Timer(PUSH_COALESCE_SECONDS, _flush_user, args=(app, user_id))
+        timer.daemon = True
+        timer.start()
+        return future
@@ -10,6 +10,8 @@ import re
 import mimetypes
 import time
 import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 import subprocess
 from datetime import datetime, timedelta
 from src.services.job_queue import job_queue
@@ -17,12 +19,14 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash,
 from flask_login import login_required, current_user
 from werkzeug.utils import secure_filename
 from werkzeug.exceptions import RequestEntityTooLarge
-from sqlalchemy import select
+from sqlalchemy import select, delete, insert, table, column
+from sqlalchemy.orm import load_only, selectinload
 from email.utils import encode_rfc2231
 
 from src.database import db
 from src.models import *
 from src.utils import *
+from src.utils import fast_json
 from src.config.app_config import ASR_MIN_SPEAKERS, ASR_MAX_SPEAKERS, ASR_DIARIZE, USE_NEW_TRANSCRIPTION_ARCHITECTURE
 
 
@@ -73,22 +77,21 @@ def _resolve_transcription_model(value):
     default = SystemSetting.get_setting('transcription_default_model', None)
     return default or None
 from src.tasks.processing import format_transcription_for_llm, _resolve_timestamp_template_format
-from src.utils.ffmpeg_utils import FFmpegError, FFmpegNotFoundError
 from src.utils.titles import resolve_upload_title
 from src.services.speaker import update_speaker_usage, identify_unidentified_speakers_from_text
-from src.services.speaker_embedding_matcher import update_speaker_embedding
+from src.services.speaker_embedding_matcher import update_speaker_embedding, get_speakers_by_name
 from src.services.speaker_snippets import create_speaker_snippets
 
 # Incognito mode - disabled by default, enable via environment variable
 ENABLE_INCOGNITO_MODE = os.environ.get('ENABLE_INCOGNITO_MODE', 'false').lower() == 'true'
-from src.services.document import process_markdown_to_docx
+from src.services.document import process_markdown_to_docx, apply_unicode_font
 from src.services.llm import client, chat_client, call_llm_completion, call_chat_completion, process_streaming_with_thinking, TokenBudgetExceeded
 from src.services.embeddings import process_recording_chunks
 from src.file_exporter import export_recording, mark_export_as_deleted
-from src.utils.ffprobe import get_codec_info, get_creation_date, get_duration, FFProbeError
-from src.utils.audio_conversion import convert_if_needed
+from src.utils.ffprobe import probe, get_codec_info, get_creation_date, get_duration, FFProbeError
 from src.services.storage import get_storage_service
-from src.utils.file_hash import compute_file_sha256
+from src.utils.file_hash import save_stream_with_sha256
+from src.utils.file_delivery import send_audio_file
 
 # Create blueprint
 recordings_bp = Blueprint('recordings', __name__)
@@ -132,6 +135,7 @@ def reindex_recording_chunks_async(recording_id):
 
 # Global helpers (will be injected from app)
 has_recording_access = None
+get_editable_recording_ids = None
 get_user_recording_status = None
 set_user_recording_status = None
 enrich_recording_dict_with_user_status = None
@@ -140,10 +144,246 @@ csrf = None
 limiter = None
 chunking_service = None
 
+# Diarization placeholder labels (SPEAKER_00, speaker_1, ...) that are not real names
+DEFAULT_SPEAKER_LABEL_RE = re.compile(r'^SPEAKER_\d+$', re.IGNORECASE)
+
+# Download filename sanitization, shared by the transcript and Word export endpoints
+_FILENAME_STRIP_TABLE = str.maketrans('', '', '<>:"/\\|?*')
+_FILENAME_DASH_RE = re.compile(r'[-\s]+')
+_FILENAME_SAFE_RE = re.compile(r'[^a-zA-Z0-9_\-\.]')
+
+# "key:value" filters accepted by the paginated list search box
+_SEARCH_FILTER_RE = re.compile(r'(date_from|date_to|date|tag|speaker):(\S+)')
+_SEARCH_FILTER_STRIP_RE = re.compile(r'(?:date_from|date_to|date|tag|speaker):\S+', re.IGNORECASE)
+# Literal date:/date_from:/date_to: values (YYYY-MM-DD, YYYY-MM, YYYY)
+_ISO_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+_ISO_MONTH_RE = re.compile(r'^\d{4}-\d{2}$')
+_ISO_YEAR_RE = re.compile(r'^\d{4}$')
+
+
+def _apply_unicode_font(paragraph):
+    """Switch a paragraph's runs to Arial so non-Latin scripts render in Word."""
+    for run in paragraph.runs:
+        apply_unicode_font(run)
+
+
+def _add_unicode_heading(doc, text, level):
+    """Add a heading, using a Unicode-capable font when the text is not ASCII."""
+    heading = doc.add_heading(text, level)
+    if not text.isascii():
+        _apply_unicode_font(heading)
+    return heading
+
+
+def _add_unicode_paragraph(doc, text):
+    """Add a paragraph, using a Unicode-capable font when the text is not ASCII."""
+    paragraph = doc.add_paragraph(text)
+    if not text.isascii():
+        _apply_unicode_font(paragraph)
+    return paragraph
+
+
+# Word exports up to this size are built in memory; larger ones spill to a temp file
+DOCX_SPOOL_MAX_BYTES = 1024 * 1024
+DOCX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+
+# Recording columns the Word exports read besides the exported text itself
+_DOCX_RECORDING_COLUMNS = (
+    Recording.user_id, Recording.title, Recording.created_at,
+    Recording.meeting_date, Recording.participants,
+)
+
+
+def _get_recording_for_export(recording_id, *columns):
+    """Load a Recording with only the columns an export needs.
+
+    Large text columns such as the transcription stay unloaded; anything not
+    listed is still fetched lazily if it is touched.
+    """
+    return db.session.execute(
+        select(Recording)
+        .options(load_only(*_DOCX_RECORDING_COLUMNS, *columns))
+        .where(Recording.id == recording_id)
+    ).scalar_one_or_none()
+
+
+def _save_docx(doc):
+    """Save a python-docx Document to a spooled temp file, returning (stream, size)."""
+    from tempfile import SpooledTemporaryFile
+
+    doc_stream = SpooledTemporaryFile(max_size=DOCX_SPOOL_MAX_BYTES)
+    doc.save(doc_stream)
+    size = doc_stream.tell()
+    doc_stream.seek(0)
+    return doc_stream, size
+
+
+def _send_docx_stream(doc_stream, size, conditional=True):
+    """Return a saved .docx stream via send_file; the response closes it once sent.
+
+    The stream is handed to the WSGI file wrapper rather than read into the
+    response. With conditional=False (one-off documents built from a POST body)
+    range handling is skipped and the response is marked uncacheable.
+    """
+    response = send_file(
+        doc_stream, as_attachment=False, mimetype=DOCX_MIMETYPE,
+        conditional=False, etag=False, max_age=None if conditional else 0,
+    )
+    # send_file can't size a spooled file, so set the length and apply the
+    # conditional/range handling here instead
+    response.content_length = size
+    if not conditional:
+        return response
+    return response.make_conditional(request.environ, accept_ranges=True, complete_length=size)
+
+
+def _send_docx(doc, conditional=True):
+    """Save a python-docx Document to a spooled temp file and return it via send_file."""
+    return _send_docx_stream(*_save_docx(doc), conditional=conditional)
+
+
+def _set_docx_disposition(response, filename, recording_id):
+    """Attach filename as Content-Disposition, RFC 2231-encoding non-ASCII names."""
+    if filename.isascii():
+        response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+    try:
+        encoded_value = encode_rfc2231(filename, charset='utf-8')
+        response.headers['Content-Disposition'] = f'attachment; filename*={encoded_value}'
+    except Exception as e:
+        # Fallback to simple attachment with generic name
+        current_app.logger.error(f"RFC2231 encoding failed: {e}, using fallback")
+        response.headers['Content-Disposition'] = f'attachment; filename="download-{recording_id}.docx"'
+    return response
+
+
+_docx_template_bytes = None
+
+
+def _new_docx():
+    """Return a blank python-docx Document opened from cached bytes of a blank
+    default Document, so the template file is read from disk only once."""
+    global _docx_template_bytes
+    from io import BytesIO
+    from docx import Document
+
+    if _docx_template_bytes is None:
+        blank = BytesIO()
+        Document().save(blank)
+        _docx_template_bytes = blank.getvalue()
+    return Document(BytesIO(_docx_template_bytes))
+
+
+def _build_markdown_docx(title_text, metadata_lines, content):
+    """Build a Word document with a title, metadata paragraphs and markdown body."""
+    doc = _new_docx()
+    _add_unicode_heading(doc, title_text, 0)
+    for line in metadata_lines:
+        _add_unicode_paragraph(doc, line)
+    doc.add_paragraph('')  # Empty line
+    process_markdown_to_docx(doc, content)
+    return doc
+
+
+# Markdown longer than this is converted off the request thread: the download
+# endpoint answers 202 with a job id and the client polls the job's file URL.
+# Jobs live as files under the staging dir rather than in process memory, so
+# the poll can land on any gunicorn worker: <job>.json holds the owner and
+# filename, <job>.docx appears once the document is built (<job>.error if it
+# could not be).
+DOCX_BACKGROUND_THRESHOLD = 20_000
+DOCX_JOB_WORKERS = 2
+DOCX_JOB_TTL_SECONDS = 600
+_DOCX_JOB_ID_RE = re.compile(r'[0-9a-f]{32}')
+_docx_executor = None
+_docx_executor_lock = threading.Lock()
+
+
+def _get_docx_executor():
+    """Return the executor that builds large Word exports, creating it on first use"""
+    global _docx_executor
+    if _docx_executor is None:
+        with _docx_executor_lock:
+            if _docx_executor is None:
+                _docx_executor = ThreadPoolExecutor(
+                    max_workers=DOCX_JOB_WORKERS,
+                    thread_name_prefix='docx-export'
+                )
+    return _docx_executor
+
+
+def _docx_job_dir():
+    """Directory shared by all workers that holds background Word export jobs."""
+    path = os.path.join(get_storage_service().get_staging_dir(), 'docx_exports')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _write_file_atomic(path, data):
+    """Write bytes so other workers never see a partially written file."""
+    tmp_path = f'{path}.part'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _remove_docx_job_files(job_dir, job_id):
+    for ext in ('.json', '.docx', '.error'):
+        try:
+            os.remove(os.path.join(job_dir, job_id + ext))
+        except FileNotFoundError:
+            pass
+
+
+def _sweep_docx_jobs(job_dir):
+    """Delete job files older than the TTL, including documents that finished
+    after their job had already expired."""
+    cutoff = time.time() - DOCX_JOB_TTL_SECONDS
+    for name in os.listdir(job_dir):
+        path = os.path.join(job_dir, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _build_docx_job(job_dir, job_id, title_text, metadata_lines, content):
+    """Executor task: build the document into the job dir, or record the error."""
+    docx_path = os.path.join(job_dir, f'{job_id}.docx')
+    try:
+        doc = _build_markdown_docx(title_text, metadata_lines, content)
+        doc.save(f'{docx_path}.part')
+        os.replace(f'{docx_path}.part', docx_path)
+    except Exception as e:
+        _write_file_atomic(os.path.join(job_dir, f'{job_id}.error'), str(e).encode('utf-8'))
+
+
+def _submit_docx_job(recording_id, filename, title_text, metadata_lines, content):
+    """Queue a markdown Word export and return the 202 response pointing at it."""
+    job_dir = _docx_job_dir()
+    _sweep_docx_jobs(job_dir)
+
+    job_id = uuid.uuid4().hex
+    _write_file_atomic(os.path.join(job_dir, f'{job_id}.json'), json.dumps({
+        'user_id': current_user.id,
+        'recording_id': recording_id,
+        'filename': filename,
+    }).encode('utf-8'))
+    _get_docx_executor().submit(_build_docx_job, job_dir, job_id, title_text, metadata_lines, content)
+    return jsonify({
+        'status': 'processing',
+        'job_id': job_id,
+        'file_url': url_for('recordings.download_docx_job_file', recording_id=recording_id, job_id=job_id),
+    }), 202
+
+
 def init_recordings_helpers(**kwargs):
     """Initialize helper functions and extensions from app."""
-    global has_recording_access, get_user_recording_status, set_user_recording_status, enrich_recording_dict_with_user_status, bcrypt, csrf, limiter, chunking_service
+    global has_recording_access, get_editable_recording_ids, get_user_recording_status, set_user_recording_status, enrich_recording_dict_with_user_status, bcrypt, csrf, limiter, chunking_service
     has_recording_access = kwargs.get('has_recording_access')
+    get_editable_recording_ids = kwargs.get('get_editable_recording_ids')
     get_user_recording_status = kwargs.get('get_user_recording_status')
     set_user_recording_status = kwargs.get('set_user_recording_status')
     enrich_recording_dict_with_user_status = kwargs.get('enrich_recording_dict_with_user_status')
@@ -160,12 +400,28 @@ def init_recordings_helpers(**kwargs):
 def download_transcript_with_template(recording_id):
     """Download transcript with custom template formatting."""
     try:
-        import re
-        from datetime import timedelta
+        from src.utils.transcript_render import render_segments
 
-        recording = db.session.get(Recording, recording_id)
-        if not recording:
+        # Get template ID from query params; without one, use the default template
+        template_id = request.args.get('template_id', type=int)
+        if template_id:
+            template_match = TranscriptTemplate.id == template_id
+        else:
+            template_match = TranscriptTemplate.is_default == True
+
+        # Load the recording and the user's template in one round-trip
+        row = db.session.execute(
+            select(Recording, TranscriptTemplate.name, TranscriptTemplate.template)
+            .outerjoin(TranscriptTemplate, db.and_(
+                TranscriptTemplate.user_id == current_user.id,
+                template_match,
+            ))
+            .where(Recording.id == recording_id)
+            .limit(1)
+        ).first()
+        if row is None:
             return jsonify({'error': 'Recording not found'}), 404
+        recording, template_name, template_format = row
 
         if not has_recording_access(recording, current_user):
             return jsonify({'error': 'You do not have permission to access this recording'}), 403
@@ -173,105 +429,33 @@ def download_transcript_with_template(recording_id):
         if not recording.transcription:
             return jsonify({'error': 'No transcription available for this recording'}), 400
 
-        # Get template ID from query params
-        template_id = request.args.get('template_id', type=int)
-
-        # Get the template
-        if template_id:
-            template = TranscriptTemplate.query.filter_by(
-                id=template_id,
-                user_id=current_user.id
-            ).first()
-        else:
-            # Use default template
-            template = TranscriptTemplate.query.filter_by(
-                user_id=current_user.id,
-                is_default=True
-            ).first()
-
         # If no template found, use a basic format
-        if not template:
+        if template_format is None:
             template_format = "[{{speaker}}]: {{text}}"
-        else:
-            template_format = template.template
-
-        # Helper functions for formatting
-        def format_time(seconds):
-            """Format seconds to HH:MM:SS"""
-            if seconds is None:
-                return "00:00:00"
-            td = timedelta(seconds=seconds)
-            hours = int(td.total_seconds() // 3600)
-            minutes = int((td.total_seconds() % 3600) // 60)
-            secs = int(td.total_seconds() % 60)
-            return f"{hours:02d}:{minutes:02d}:{secs:02d}"
-
-        def format_srt_time(seconds):
-            """Format seconds to SRT format HH:MM:SS,mmm"""
-            if seconds is None:
-                return "00:00:00,000"
-            td = timedelta(seconds=seconds)
-            hours = int(td.total_seconds() // 3600)
-            minutes = int((td.total_seconds() % 3600) // 60)
-            secs = int(td.total_seconds() % 60)
-            millis = int((td.total_seconds() % 1) * 1000)
-            return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
 
         # Parse transcription - handle both JSON (diarized) and plain text formats
-        is_diarized = False
-        transcription_data = None
-        try:
-            transcription_data = json.loads(recording.transcription)
-            if isinstance(transcription_data, list):
-                is_diarized = True
-        except (json.JSONDecodeError, TypeError):
-            # Not JSON, treat as plain text
-            pass
+        transcription_data = recording.transcription_parsed
+        is_diarized = isinstance(transcription_data, list)
 
         # If plain text transcription, return it as-is (no template formatting applies)
         if not is_diarized:
             formatted_transcript = recording.transcription
         else:
-            # Generate formatted transcript from diarized segments
-            output_lines = []
-            for index, segment in enumerate(transcription_data, 1):
-                line = template_format
-
-                # Replace variables
-                replacements = {
-                    '{{index}}': str(index),
-                    '{{speaker}}': segment.get('speaker', 'Unknown'),
-                    '{{text}}': segment.get('sentence', ''),
-                    '{{start_time}}': format_time(segment.get('start_time')),
-                    '{{end_time}}': format_time(segment.get('end_time')),
-                }
-
-                for key, value in replacements.items():
-                    line = line.replace(key, value)
-
-                # Handle filters
-                # Upper case filter
-                line = re.sub(r'{{(.*?)\|upper}}', lambda m: replacements.get('{{' + m.group(1) + '}}', '').upper(), line)
-                # SRT time filter
-                line = re.sub(r'{{start_time\|srt}}', format_srt_time(segment.get('start_time')), line)
-                line = re.sub(r'{{end_time\|srt}}', format_srt_time(segment.get('end_time')), line)
-
-                output_lines.append(line)
-
-            # Join lines
-            formatted_transcript = '\n'.join(output_lines)
-
-        # Create response
-        response = make_response(formatted_transcript)
-        if is_diarized and template:
-            filename = f"{recording.title or 'transcript'}_{template.name}.txt"
+            # Generate formatted transcript from diarized segments; the template
+            # is parsed once (and cached) rather than regex-scanned per segment
+            formatted_transcript = render_segments(transcription_data, template_format)
+
+        # Encode once; Werkzeug sets Content-Length from the bytes body
+        response = Response(formatted_transcript.encode('utf-8'),
+                            content_type='text/plain; charset=utf-8')
+        if is_diarized and template_name is not None:
+            filename = f"{recording.title or 'transcript'}_{template_name}.txt"
         elif is_diarized:
             filename = f"{recording.title or 'transcript'}_formatted.txt"
         else:
             # Plain text transcription
             filename = f"{recording.title or 'transcript'}.txt"
-        filename = re.sub(r'[^a-zA-Z0-9_\-\.]', '_', filename)
-        response.headers['Content-Type'] = 'text/plain; charset=utf-8'
+        filename = _FILENAME_SAFE_RE.sub('_', filename)
         response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
 
         return response
@@ -288,12 +472,7 @@ def download_transcript_with_template(recording_id):
 def download_summary_word(recording_id):
     """Download recording summary as a Word document."""
     try:
-        from docx import Document
-        from docx.shared import Inches
-        import re
-        from io import BytesIO
-
-        recording = db.session.get(Recording, recording_id)
+        recording = _get_recording_for_export(recording_id, Recording.summary)
         if not recording:
             return jsonify({'error': 'Recording not found'}), 404
 
@@ -303,91 +482,28 @@ def download_summary_word(recording_id):
         if not recording.summary:
             return jsonify({'error': 'No summary available for this recording'}), 400
 
-        # Create Word document
-        doc = Document()
-
-        # Add title
         title_text = f'Summary: {recording.title or "Untitled Recording"}'
-        title = doc.add_heading(title_text, 0)
-        # Check if title needs Unicode font support
-        try:
-            title_text.encode('ascii')
-        except UnicodeEncodeError:
-            # Title contains non-ASCII characters
-            from docx.oxml.ns import qn
-            for run in title.runs:
-                run.font.name = 'Arial'
-                r = run._element
-                r.rPr.rFonts.set(qn('w:eastAsia'), 'Arial')
-
-        # Helper function to add paragraph with Unicode support
-        def add_unicode_paragraph(doc, text):
-            p = doc.add_paragraph(text)
-            try:
-                text.encode('ascii')
-            except UnicodeEncodeError:
-                from docx.oxml.ns import qn
-                for run in p.runs:
-                    run.font.name = 'Arial'
-                    r = run._element
-                    r.rPr.rFonts.set(qn('w:eastAsia'), 'Arial')
-            return p
-
-        # Add metadata
-        add_unicode_paragraph(doc, f'Uploaded: {recording.created_at.strftime("%Y-%m-%d %H:%M")}')
+        metadata_lines = [f'Uploaded: {recording.created_at.strftime("%Y-%m-%d %H:%M")}']
         if recording.meeting_date:
-            add_unicode_paragraph(doc, f'Recording Date: {recording.meeting_date.strftime("%Y-%m-%d")}')
+            metadata_lines.append(f'Recording Date: {recording.meeting_date.strftime("%Y-%m-%d")}')
         if recording.participants:
-            add_unicode_paragraph(doc, f'Participants: {recording.participants}')
+            metadata_lines.append(f'Participants: {recording.participants}')
         visible_tags = recording.get_visible_tags(current_user)
         if visible_tags:
             tags_str = ', '.join([tag.name for tag in visible_tags])
-            add_unicode_paragraph(doc, f'Tags: {tags_str}')
-        doc.add_paragraph('')  # Empty line
-
-        # Process markdown content using the helper function
-        process_markdown_to_docx(doc, recording.summary)
-
-        # Save to BytesIO
-        doc_stream = BytesIO()
-        doc.save(doc_stream)
-        doc_stream.seek(0)
+            metadata_lines.append(f'Tags: {tags_str}')
 
         # Create safe filename
-        safe_title = re.sub(r'[<>:"/\\|?*]', '', recording.title or 'Untitled')
-        safe_title = re.sub(r'[-\s]+', '-', safe_title).strip('-')
+        safe_title = (recording.title or 'Untitled').translate(_FILENAME_STRIP_TABLE)
+        safe_title = _FILENAME_DASH_RE.sub('-', safe_title).strip('-')
         filename = f'summary-{safe_title}.docx' if safe_title else f'summary-recording-{recording_id}.docx'
 
-        # Create ASCII fallback for send_file - if title has non-ASCII chars, use generic name with ID
-        ascii_filename = filename.encode('ascii', 'ignore').decode('ascii')
-        if not ascii_filename.strip() or ascii_filename.strip() in ['summary-.docx', 'summary-recording-.docx']:
-            ascii_filename = f'summary-recording-{recording_id}.docx'
+        # Long summaries are converted in the background so they don't hold a worker
+        if len(recording.summary) > DOCX_BACKGROUND_THRESHOLD:
+            return _submit_docx_job(recording_id, filename, title_text, metadata_lines, recording.summary)
 
-        response = send_file(
-            doc_stream,
-            as_attachment=False,
-            mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-        )
-        # Properly encode filename for international characters
-        # Check if filename contains non-ASCII characters
-        try:
-            # Try to encode as ASCII - if this works, use simple format
-            filename.encode('ascii')
-            # ASCII-only filename, use simple format
-            response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
-        except UnicodeEncodeError:
-            # Contains non-ASCII characters, use proper RFC 2231 encoding
-            try:
-                # Use Python's built-in RFC 2231 encoder
-                encoded_value = encode_rfc2231(filename, charset='utf-8')
-                header_value = f'attachment; filename*={encoded_value}'
-                current_app.logger.info(f"DEBUG CHINESE FILENAME (RFC2231): Original='{filename}', Header='{header_value}'")
-                response.headers['Content-Disposition'] = header_value
-            except Exception as e:
-                # Fallback to simple attachment with generic name
-                current_app.logger.error(f"RFC2231 encoding failed: {e}, using fallback")
-                response.headers['Content-Disposition'] = f'attachment; filename="download-{recording_id}.docx"'
-        return response
+        doc = _build_markdown_docx(title_text, metadata_lines, recording.summary)
+        return _set_docx_disposition(_send_docx(doc), filename, recording_id)
 
     except Exception as e:
         current_app.logger.error(f"Error generating summary Word document: {e}")
@@ -400,12 +516,7 @@ def download_summary_word(recording_id):
 def download_chat_word(recording_id):
     """Download chat conversation as a Word document."""
     try:
-        from docx import Document
-        from docx.shared import Inches
-        import re
-        from io import BytesIO
-
-        recording = db.session.get(Recording, recording_id)
+        recording = _get_recording_for_export(recording_id)
         if not recording:
             return jsonify({'error': 'Recording not found'}), 404
 
@@ -422,37 +533,15 @@ def download_chat_word(recording_id):
             return jsonify({'error': 'No messages to download'}), 400
 
         # Create Word document
-        doc = Document()
+        doc = _new_docx()
 
         # Add title
         title_text = f'Chat Conversation: {recording.title or "Untitled Recording"}'
-        title = doc.add_heading(title_text, 0)
-        # Check if title needs Unicode font support
-        try:
-            title_text.encode('ascii')
-        except UnicodeEncodeError:
-            from docx.oxml.ns import qn
-            for run in title.runs:
-                run.font.name = 'Arial'
-                r = run._element
-                r.rPr.rFonts.set(qn('w:eastAsia'), 'Arial')
-
-        # Helper function to add paragraph with Unicode support
-        def add_unicode_paragraph(doc, text):
-            p = doc.add_paragraph(text)
-            try:
-                text.encode('ascii')
-            except UnicodeEncodeError:
-                from docx.oxml.ns import qn
-                for run in p.runs:
-                    run.font.name = 'Arial'
-                    r = run._element
-                    r.rPr.rFonts.set(qn('w:eastAsia'), 'Arial')
-            return p
+        _add_unicode_heading(doc, title_text, 0)
 
         # Add metadata
-        add_unicode_paragraph(doc, f'Recording Date: {recording.created_at.strftime("%Y-%m-%d %H:%M")}')
-        add_unicode_paragraph(doc, f'Chat Export Date: {datetime.utcnow().strftime("%Y-%m-%d %H:%M")}')
+        _add_unicode_paragraph(doc, f'Recording Date: {recording.created_at.strftime("%Y-%m-%d %H:%M")}')
+        _add_unicode_paragraph(doc, f'Chat Export Date: {datetime.utcnow().strftime("%Y-%m-%d %H:%M")}')
         doc.add_paragraph('')  # Empty line
 
         # Add chat messages
@@ -487,47 +576,12 @@ def download_chat_word(recording_id):
 
             doc.add_paragraph('')  # Empty line between messages
 
-        # Save to BytesIO
-        doc_stream = BytesIO()
-        doc.save(doc_stream)
-        doc_stream.seek(0)
-
         # Create safe filename
-        safe_title = re.sub(r'[<>:"/\\|?*]', '', recording.title or 'Untitled')
-        safe_title = re.sub(r'[-\s]+', '-', safe_title).strip('-')
+        safe_title = (recording.title or 'Untitled').translate(_FILENAME_STRIP_TABLE)
+        safe_title = _FILENAME_DASH_RE.sub('-', safe_title).strip('-')
         filename = f'chat-{safe_title}.docx' if safe_title else f'chat-recording-{recording_id}.docx'
 
-        # Create ASCII fallback for send_file - if title has non-ASCII chars, use generic name with ID
-        ascii_filename = filename.encode('ascii', 'ignore').decode('ascii')
-        if not ascii_filename.strip() or ascii_filename.strip() in ['chat-.docx', 'chat-recording-.docx']:
-            ascii_filename = f'chat-recording-{recording_id}.docx'
-
-        response = send_file(
-            doc_stream,
-            as_attachment=False,
-            mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-        )
-
-        # Properly encode filename for international characters
-        # Check if filename contains non-ASCII characters
-        try:
-            # Try to encode as ASCII - if this works, use simple format
-            filename.encode('ascii')
-            # ASCII-only filename, use simple format
-            response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
-        except UnicodeEncodeError:
-            # Contains non-ASCII characters, use proper RFC 2231 encoding
-            try:
-                # Use Python's built-in RFC 2231 encoder
-                encoded_value = encode_rfc2231(filename, charset='utf-8')
-                header_value = f'attachment; filename*={encoded_value}'
-                current_app.logger.info(f"DEBUG CHINESE FILENAME (RFC2231): Original='{filename}', Header='{header_value}'")
-                response.headers['Content-Disposition'] = header_value
-            except Exception as e:
-                # Fallback to simple attachment with generic name
-                current_app.logger.error(f"RFC2231 encoding failed: {e}, using fallback")
-                response.headers['Content-Disposition'] = f'attachment; filename="download-{recording_id}.docx"'
-        return response
+        return _set_docx_disposition(_send_docx(doc, conditional=False), filename, recording_id)
 
     except Exception as e:
         current_app.logger.error(f"Error generating chat Word document: {e}")
@@ -540,12 +594,7 @@ def download_chat_word(recording_id):
 def download_notes_word(recording_id):
     """Download recording notes as a Word document."""
     try:
-        from docx import Document
-        from docx.shared import Inches
-        import re
-        from io import BytesIO
-
-        recording = db.session.get(Recording, recording_id)
+        recording = _get_recording_for_export(recording_id, Recording.notes)
         if not recording:
             return jsonify({'error': 'Recording not found'}), 404
 
@@ -555,96 +604,72 @@ def download_notes_word(recording_id):
         if not recording.notes:
             return jsonify({'error': 'No notes available for this recording'}), 400
 
-        # Create Word document
-        doc = Document()
-
-        # Add title
         title_text = f'Notes: {recording.title or "Untitled Recording"}'
-        title = doc.add_heading(title_text, 0)
-        # Check if title needs Unicode font support
-        try:
-            title_text.encode('ascii')
-        except UnicodeEncodeError:
-            from docx.oxml.ns import qn
-            for run in title.runs:
-                run.font.name = 'Arial'
-                r = run._element
-                r.rPr.rFonts.set(qn('w:eastAsia'), 'Arial')
-
-        # Helper function to add paragraph with Unicode support
-        def add_unicode_paragraph(doc, text):
-            p = doc.add_paragraph(text)
-            try:
-                text.encode('ascii')
-            except UnicodeEncodeError:
-                from docx.oxml.ns import qn
-                for run in p.runs:
-                    run.font.name = 'Arial'
-                    r = run._element
-                    r.rPr.rFonts.set(qn('w:eastAsia'), 'Arial')
-            return p
-
-        # Add metadata
-        add_unicode_paragraph(doc, f'Uploaded: {recording.created_at.strftime("%Y-%m-%d %H:%M")}')
+        metadata_lines = [f'Uploaded: {recording.created_at.strftime("%Y-%m-%d %H:%M")}']
         if recording.meeting_date:
-            add_unicode_paragraph(doc, f'Recording Date: {recording.meeting_date.strftime("%Y-%m-%d")}')
+            metadata_lines.append(f'Recording Date: {recording.meeting_date.strftime("%Y-%m-%d")}')
         if recording.participants:
-            add_unicode_paragraph(doc, f'Participants: {recording.participants}')
+            metadata_lines.append(f'Participants: {recording.participants}')
         visible_tags = recording.get_visible_tags(current_user)
         if visible_tags:
             tags_str = ', '.join([tag.name for tag in visible_tags])
-            add_unicode_paragraph(doc, f'Tags: {tags_str}')
-        doc.add_paragraph('')  # Empty line
-
-        # Process markdown content using the helper function
-        process_markdown_to_docx(doc, recording.notes)
-
-        # Save to BytesIO
-        doc_stream = BytesIO()
-        doc.save(doc_stream)
-        doc_stream.seek(0)
+            metadata_lines.append(f'Tags: {tags_str}')
 
         # Create safe filename
-        safe_title = re.sub(r'[<>:"/\\|?*]', '', recording.title or 'Untitled')
-        safe_title = re.sub(r'[-\s]+', '-', safe_title).strip('-')
+        safe_title = (recording.title or 'Untitled').translate(_FILENAME_STRIP_TABLE)
+        safe_title = _FILENAME_DASH_RE.sub('-', safe_title).strip('-')
         filename = f'notes-{safe_title}.docx' if safe_title else f'notes-recording-{recording_id}.docx'
 
-        # Create ASCII fallback for send_file - if title has non-ASCII chars, use generic name with ID
-        ascii_filename = filename.encode('ascii', 'ignore').decode('ascii')
-        if not ascii_filename.strip() or ascii_filename.strip() in ['notes-.docx', 'notes-recording-.docx']:
-            ascii_filename = f'notes-recording-{recording_id}.docx'
+        # Long notes are converted in the background so they don't hold a worker
+        if len(recording.notes) > DOCX_BACKGROUND_THRESHOLD:
+            return _submit_docx_job(recording_id, filename, title_text, metadata_lines, recording.notes)
 
-        response = send_file(
-            doc_stream,
-            as_attachment=False,
-            mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-        )
-        # Properly encode filename for international characters
-        # Check if filename contains non-ASCII characters
-        try:
-            # Try to encode as ASCII - if this works, use simple format
-            filename.encode('ascii')
-            # ASCII-only filename, use simple format
-            response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
-        except UnicodeEncodeError:
-            # Contains non-ASCII characters, use proper RFC 2231 encoding
-            try:
-                # Use Python's built-in RFC 2231 encoder
-                encoded_value = encode_rfc2231(filename, charset='utf-8')
-                header_value = f'attachment; filename*={encoded_value}'
-                current_app.logger.info(f"DEBUG CHINESE FILENAME (RFC2231): Original='{filename}', Header='{header_value}'")
-                response.headers['Content-Disposition'] = header_value
-            except Exception as e:
-                # Fallback to simple attachment with generic name
-                current_app.logger.error(f"RFC2231 encoding failed: {e}, using fallback")
-                response.headers['Content-Disposition'] = f'attachment; filename="download-{recording_id}.docx"'
-        return response
+        doc = _build_markdown_docx(title_text, metadata_lines, recording.notes)
+        return _set_docx_disposition(_send_docx(doc), filename, recording_id)
 
     except Exception as e:
         current_app.logger.error(f"Error generating notes Word document: {e}")
         return jsonify({'error': 'Failed to generate Word document'}), 500
 
 
+@recordings_bp.route('/recording/<int:recording_id>/download/<job_id>/file')
+@login_required
+def download_docx_job_file(recording_id, job_id):
+    """Return a background Word export, or 202 while it is still being built."""
+    not_found = jsonify({'error': 'Download not found or expired'}), 404
+    if not _DOCX_JOB_ID_RE.fullmatch(job_id):
+        return not_found
+    job_dir = _docx_job_dir()
+    meta_path = os.path.join(job_dir, f'{job_id}.json')
+    try:
+        with open(meta_path, 'rb') as f:
+            job = json.loads(f.read())
+        expired = time.time() - os.path.getmtime(meta_path) > DOCX_JOB_TTL_SECONDS
+    except FileNotFoundError:
+        return not_found
+    if job['user_id'] != current_user.id or job['recording_id'] != recording_id:
+        return not_found
+    if expired:
+        _remove_docx_job_files(job_dir, job_id)
+        return not_found
+
+    error_path = os.path.join(job_dir, f'{job_id}.error')
+    if os.path.exists(error_path):
+        with open(error_path, 'rb') as f:
+            error = f.read().decode('utf-8', errors='replace')
+        _remove_docx_job_files(job_dir, job_id)
+        current_app.logger.error(f"Error generating Word document for job {job_id}: {error}")
+        return jsonify({'error': 'Failed to generate Word document'}), 500
+
+    try:
+        doc_stream = open(os.path.join(job_dir, f'{job_id}.docx'), 'rb')
+    except FileNotFoundError:
+        return jsonify({'status': 'processing', 'job_id': job_id}), 202
+    # The open handle keeps the document readable after its files are removed
+    size = os.fstat(doc_stream.fileno()).st_size
+    _remove_docx_job_files(job_dir, job_id)
+    return _set_docx_disposition(_send_docx_stream(doc_stream, size), job['filename'], recording_id)
+
 
 @recordings_bp.route('/recording/<int:recording_id>/generate_summary', methods=['POST'])
 @login_required
@@ -724,12 +749,15 @@ def generate_summary_endpoint(recording_id):
 @login_required
 def update_speakers(recording_id):
     """Updates speaker labels in a transcription with provided names."""
+    # Resolve the login proxy once; the name loops below read it per speaker
+    user = current_user._get_current_object()
+    my_name = user.name or 'Me'
     try:
         recording = db.session.get(Recording, recording_id)
         if not recording:
             return jsonify({'error': 'Recording not found'}), 404
 
-        if not has_recording_access(recording, current_user, require_edit=True):
+        if not has_recording_access(recording, user, require_edit=True):
             return jsonify({'error': 'You do not have permission to edit this recording'}), 403
 
         data = request.json
@@ -740,63 +768,79 @@ def update_speakers(recording_id):
             return jsonify({'error': 'No speaker map provided'}), 400
 
         transcription_text = recording.transcription
-        is_json = False
-        try:
-            transcription_data = json.loads(transcription_text)
-            # Updated check for our new simplified JSON format (a list of segment objects)
-            is_json = isinstance(transcription_data, list)
-        except (json.JSONDecodeError, TypeError):
-            is_json = False
+        transcription_data = recording.transcription_parsed
+        # Updated check for our new simplified JSON format (a list of segment objects)
+        is_json = isinstance(transcription_data, list)
 
         speaker_names_used = []
 
         if is_json:
-            # Handle new simplified JSON transcript (list of segments)
-            for segment in transcription_data:
-                original_speaker_label = segment.get('speaker')
-                if original_speaker_label in speaker_map:
-                    new_name_info = speaker_map[original_speaker_label]
-                    new_name = new_name_info.get('name', '').strip()
-                    # If isMe is checked but no name provided, use current user's name
-                    if new_name_info.get('isMe') and not new_name:
-                        new_name = current_user.name or 'Me'
-
-                    if new_name:
-                        segment['speaker'] = new_name
-                        if new_name not in speaker_names_used:
-                            speaker_names_used.append(new_name)
-
-            recording.transcription = json.dumps(transcription_data)
-
-            # Update participants only from speakers that were actually given names (not default labels)
+            # Handle new simplified JSON transcript (list of segments), relabelling
+            # and collecting the speakers left in the transcript in one pass
+            # Resolve each label's new name once rather than per segment
+            resolved_names = {}
+            for speaker_label, new_name_info in speaker_map.items():
+                new_name = new_name_info.get('name', '').strip()
+                # If isMe is checked but no name provided, use current user's name
+                if new_name_info.get('isMe') and not new_name:
+                    new_name = my_name
+                if new_name:
+                    resolved_names[speaker_label] = new_name
+
+            names_used = {}
             final_speakers = set()
-            for seg in transcription_data:
-                speaker = seg.get('speaker')
+            for segment in transcription_data:
+                new_name = resolved_names.get(segment.get('speaker'))
+                if new_name is not None:
+                    segment['speaker'] = new_name
+                    names_used[new_name] = None
+
+                speaker = segment.get('speaker')
                 if speaker and str(speaker).strip():
-                    # Only include speakers that have been given actual names (not default labels like "SPEAKER_01", "SPEAKER_09", etc.)
-                    # Check if this speaker was updated with a real name (not a default label)
-                    if not re.match(r'^SPEAKER_\d+$', str(speaker), re.IGNORECASE):
-                        final_speakers.add(speaker)
-            recording.participants = ', '.join(sorted(list(final_speakers)))
+                    final_speakers.add(speaker)
+            speaker_names_used = list(names_used)
+
+            # Only re-serialize when a segment was actually relabelled
+            if names_used:
+                recording.set_transcription_data(transcription_data)
+
+            # Update participants only from speakers that were actually given names
+            # (not default labels like "SPEAKER_01", "SPEAKER_09", etc.)
+            recording.participants = ', '.join(sorted(
+                speaker for speaker in final_speakers
+                if not DEFAULT_SPEAKER_LABEL_RE.match(str(speaker))
+            ))
 
         else:
             # Handle plain text transcript
-            new_participants = []
+            # Ordered set of the names applied, in speaker_map order
+            new_participants = {}
+            name_map = {}
             for speaker_label, new_name_info in speaker_map.items():
                 new_name = new_name_info.get('name', '').strip()
                 # If isMe is checked but no name provided, use current user's name
                 if new_name_info.get('isMe') and not new_name:
-                    new_name = current_user.name or 'Me'
+                    new_name = my_name
 
                 if new_name:
-                    transcription_text = re.sub(r'\[\s*' + re.escape(speaker_label) + r'\s*\]', f'[{new_name}]', transcription_text, flags=re.IGNORECASE)
-                    if new_name not in new_participants:
-                        new_participants.append(new_name)
+                    name_map.setdefault(speaker_label.lower(), new_name)
+                    new_participants.setdefault(new_name, None)
+
+            if name_map and transcription_text:
+                # One pass over the text for all labels instead of one re.sub per speaker
+                labels = sorted(name_map, key=len, reverse=True)
+                label_re = re.compile(
+                    r'\[\s*(' + '|'.join(re.escape(label) for label in labels) + r')\s*\]',
+                    re.IGNORECASE
+                )
+                transcription_text = label_re.sub(
+                    lambda m: f'[{name_map[m.group(1).lower()]}]', transcription_text
+                )
 
             recording.transcription = transcription_text
             if new_participants:
                 recording.participants = ', '.join(new_participants)
-            speaker_names_used = new_participants
+            speaker_names_used = list(new_participants)
 
         # Update speaker usage statistics
         if speaker_names_used:
@@ -805,33 +849,29 @@ def update_speakers(recording_id):
         # Update speaker voice embeddings if available
         embeddings_updated = 0
         snippets_created = 0
-        if recording.speaker_embeddings and speaker_map:
+        if recording.has_speaker_embeddings and speaker_map:
             try:
-                # Parse embeddings from recording
-                embeddings_data = json.loads(recording.speaker_embeddings) if isinstance(recording.speaker_embeddings, str) else recording.speaker_embeddings
-
                 # Build reverse map: SPEAKER_XX -> actual name assigned
                 speaker_label_to_name = {}
                 for speaker_label, speaker_info in speaker_map.items():
                     name = speaker_info.get('name', '').strip()
                     # Handle isMe checkbox
                     if speaker_info.get('isMe') and not name:
-                        name = current_user.name or 'Me'
+                        name = my_name
 
                     # Only include speakers that were given real names (not SPEAKER_XX)
-                    if name and not re.match(r'^SPEAKER_\d+$', name, re.IGNORECASE):
+                    if name and not DEFAULT_SPEAKER_LABEL_RE.match(name):
                         speaker_label_to_name[speaker_label] = name
 
-                # Update embeddings for each identified speaker
-                for speaker_label, embedding in embeddings_data.items():
-                    if speaker_label in speaker_label_to_name and embedding and len(embedding) == 256:
-                        speaker_name = speaker_label_to_name[speaker_label]
-
-                        # Find or create the speaker
-                        speaker = Speaker.query.filter_by(
-                            user_id=current_user.id,
-                            name=speaker_name
-                        ).first()
+                # Update embeddings for each identified speaker, fetching all
+                # the named speakers in one query. Only the (few) named labels
+                # are visited, not every diarized speaker.
+                embeddings_data = recording.get_speaker_embeddings() if speaker_label_to_name else {}
+                speakers_by_name = get_speakers_by_name(user.id, speaker_label_to_name.values())
+                for speaker_label, speaker_name in speaker_label_to_name.items():
+                    embedding = embeddings_data.get(speaker_label)
+                    if embedding is not None and len(embedding) == 256:
+                        speaker = speakers_by_name.get(speaker_name)
 
                         if speaker:
                             # Update the speaker's voice embedding
@@ -869,16 +909,16 @@ def update_speakers(recording_id):
         if regenerate_summary:
             current_app.logger.info(f"Queueing summary regeneration for recording {recording_id} after speaker update.")
             job_queue.enqueue(
-                user_id=current_user.id,
+                user_id=user.id,
                 recording_id=recording.id,
                 job_type='summarize',
-                params={'user_id': current_user.id}
+                params={'user_id': user.id}
             )
             summary_queued = True
 
         # Return recording with per-user status
-        recording_dict = recording.to_dict(viewer_user=current_user)
-        enrich_recording_dict_with_user_status(recording_dict, recording, current_user)
+        recording_dict = recording.to_dict(viewer_user=user)
+        enrich_recording_dict_with_user_status(recording_dict, recording, user)
         return jsonify({
             'success': True,
             'message': 'Speakers updated successfully.',
@@ -897,12 +937,15 @@ def update_speakers(recording_id):
 @login_required
 def update_transcript(recording_id):
     """Updates the complete transcript data including text edits and speaker changes."""
+    # Resolve the login proxy once; the name loops below read it per speaker
+    user = current_user._get_current_object()
+    my_name = user.name or 'Me'
     try:
         recording = db.session.get(Recording, recording_id)
         if not recording:
             return jsonify({'error': 'Recording not found'}), 404
 
-        if not has_recording_access(recording, current_user, require_edit=True):
+        if not has_recording_access(recording, user, require_edit=True):
             return jsonify({'error': 'You do not have permission to edit this recording'}), 403
 
         data = request.json
@@ -913,8 +956,11 @@ def update_transcript(recording_id):
         if not transcript_data or not isinstance(transcript_data, list):
             return jsonify({'error': 'Invalid transcript data provided'}), 400
 
-        # Update speaker names in the transcript data
-        speaker_names_used = []
+        # Update speaker names in the transcript data and collect the speakers
+        # left in it in the same pass; a dict keeps the names used in
+        # first-seen order without a linear membership scan
+        speaker_names_used = {}
+        final_speakers = set()
         for segment in transcript_data:
             original_speaker_label = segment.get('speaker')
 
@@ -923,25 +969,25 @@ def update_transcript(recording_id):
                 new_name_info = speaker_map[original_speaker_label]
                 new_name = new_name_info.get('name', '').strip()
                 if new_name_info.get('isMe'):
-                    new_name = current_user.name or 'Me'
+                    new_name = my_name
 
                 if new_name:
                     segment['speaker'] = new_name
-                    if new_name not in speaker_names_used:
-                        speaker_names_used.append(new_name)
+                    speaker_names_used.setdefault(new_name, None)
+
+            speaker = segment.get('speaker')
+            if speaker and str(speaker).strip():
+                final_speakers.add(speaker)
+        speaker_names_used = list(speaker_names_used)
 
         # Save the updated transcript
-        recording.transcription = json.dumps(transcript_data)
+        recording.set_transcription_data(transcript_data)
 
-        # Update participants
-        final_speakers = set()
-        for seg in transcript_data:
-            speaker = seg.get('speaker')
-            if speaker and str(speaker).strip():
-                # Only include speakers with real names (not default labels)
-                if not re.match(r'^SPEAKER_\d+$', str(speaker), re.IGNORECASE):
-                    final_speakers.add(speaker)
-        recording.participants = ', '.join(sorted(list(final_speakers)))
+        # Update participants, only with real names (not default labels)
+        recording.participants = ', '.join(sorted(
+            speaker for speaker in final_speakers
+            if not DEFAULT_SPEAKER_LABEL_RE.match(str(speaker))
+        ))
 
         # Update speaker usage statistics
         if speaker_names_used:
@@ -957,10 +1003,10 @@ def update_transcript(recording_id):
         if regenerate_summary:
             current_app.logger.info(f"Queueing summary regeneration for recording {recording_id} after transcript update.")
             job_queue.enqueue(
-                user_id=current_user.id,
+                user_id=user.id,
                 recording_id=recording.id,
                 job_type='summarize',
-                params={'user_id': current_user.id}
+                params={'user_id': user.id}
             )
             summary_queued = True
             # Export will happen after summary regenerates
@@ -969,8 +1015,8 @@ def update_transcript(recording_id):
             export_recording(recording_id)
 
         # Return recording with per-user status
-        recording_dict = recording.to_dict(viewer_user=current_user)
-        enrich_recording_dict_with_user_status(recording_dict, recording, current_user)
+        recording_dict = recording.to_dict(viewer_user=user)
+        enrich_recording_dict_with_user_status(recording_dict, recording, user)
         return jsonify({
             'success': True,
             'message': 'Transcript updated successfully.',
@@ -1005,11 +1051,7 @@ def auto_identify_speakers(recording_id):
         if not recording.transcription:
             return jsonify({'error': 'No transcription available for speaker identification'}), 400
 
-        try:
-            transcription_data = json.loads(recording.transcription)
-        except (json.JSONDecodeError, TypeError):
-            return jsonify({'error': 'Transcription format not supported for auto-identification'}), 400
-
+        transcription_data = recording.transcription_parsed
         if not isinstance(transcription_data, list):
             return jsonify({'error': 'Transcription format not supported for auto-identification'}), 400
 
@@ -1057,7 +1099,10 @@ def reprocess_transcription(recording_id):
         recording.status = 'QUEUED'  # Will change to PROCESSING when job starts
 
         # Clear existing events since they depend on the transcription
-        Event.query.filter_by(recording_id=recording_id).delete()
+        db.session.execute(
+            delete(Event).where(Event.recording_id == recording_id)
+            .execution_options(synchronize_session=False)
+        )
 
         db.session.commit()
 
@@ -1101,23 +1146,24 @@ def reprocess_transcription(recording_id):
         #   user input > tag defaults > folder defaults > env defaults > user defaults
 
         # Tag defaults (highest priority after user input). Use the first tag's
-        # defaults when present.
-        if recording.tags:
-            for tag_association in sorted(recording.tag_associations, key=lambda x: x.order):
-                tag = tag_association.tag
-                if min_speakers is None and tag.default_min_speakers:
-                    min_speakers = tag.default_min_speakers
-                if max_speakers is None and tag.default_max_speakers:
-                    max_speakers = tag.default_max_speakers
-                if not hotwords and tag.default_hotwords:
-                    hotwords = tag.default_hotwords
-                if not initial_prompt and tag.default_initial_prompt:
-                    initial_prompt = tag.default_initial_prompt
-                if not transcription_model and tag.default_transcription_model:
-                    transcription_model = tag.default_transcription_model
-                if (min_speakers is not None and max_speakers is not None
-                        and hotwords and initial_prompt and transcription_model):
-                    break
+        # defaults when present. tag_associations is ordered by RecordingTag.order
+        # in the relationship itself, so no Python sort is needed and the loop
+        # can stop as soon as every value is resolved.
+        for tag_association in recording.tag_associations:
+            tag = tag_association.tag
+            if min_speakers is None and tag.default_min_speakers:
+                min_speakers = tag.default_min_speakers
+            if max_speakers is None and tag.default_max_speakers:
+                max_speakers = tag.default_max_speakers
+            if not hotwords and tag.default_hotwords:
+                hotwords = tag.default_hotwords
+            if not initial_prompt and tag.default_initial_prompt:
+                initial_prompt = tag.default_initial_prompt
+            if not transcription_model and tag.default_transcription_model:
+                transcription_model = tag.default_transcription_model
+            if (min_speakers is not None and max_speakers is not None
+                    and hotwords and initial_prompt and transcription_model):
+                break
 
         # Folder defaults (only if recording has no tags providing the value)
         if recording.folder:
@@ -1254,7 +1300,10 @@ def reprocess_summary(recording_id):
         recording.summary = None
 
         # Clear existing events since they might be re-extracted during summary generation
-        Event.query.filter_by(recording_id=recording_id).delete()
+        db.session.execute(
+            delete(Event).where(Event.recording_id == recording_id)
+            .execution_options(synchronize_session=False)
+        )
 
         db.session.commit()
 
@@ -1469,20 +1518,194 @@ def get_accessible_recording_ids(user_id):
     Returns:
         list: List of recording IDs the user can access
     """
-    accessible_ids = set()
+    return list(db.session.execute(accessible_recording_ids_select(user_id)).scalars())
 
-    # 1. User's own recordings
-    own_recordings = db.session.query(Recording.id).filter_by(user_id=user_id).all()
-    accessible_ids.update([r.id for r in own_recordings])
 
-    # 2. Internally shared recordings
-    if ENABLE_INTERNAL_SHARING:
-        shared_recordings = db.session.query(InternalShare.recording_id).filter_by(
-            shared_with_user_id=user_id
-        ).all()
-        accessible_ids.update([r.recording_id for r in shared_recordings])
+def accessible_recording_ids_select(user_id):
+    """
+    Build a SELECT of the recording IDs a user can access (own + shared).
+
+    The two sources are combined with UNION so callers can join or filter
+    against it in SQL instead of materializing the IDs in Python and sending
+    them back as a large IN (...) list.
 
-    return list(accessible_ids)
+    Args:
+        user_id (int): User ID to check access for
+
+    Returns:
+        Select: single-column ``id`` statement (UNION drops duplicates)
+    """
+    own = select(Recording.id.label('id')).where(Recording.user_id == user_id)
+    if not ENABLE_INTERNAL_SHARING:
+        return own
+    shared = select(InternalShare.recording_id.label('id')).where(
+        InternalShare.shared_with_user_id == user_id
+    )
+    return own.union(shared)
+
+
+# Sort key for sort_by=meeting_date. Must stay textually in sync with the
+# ix_recording_user_sortable expression index created in init_db so the
+# planner can walk the index instead of sorting the whole result set.
+_SORTABLE_DATE = db.func.coalesce(Recording.meeting_date, Recording.created_at)
+
+
+# External-content FTS5 trigram index over recording.transcription, created
+# by init_db on SQLite (TRANSCRIPTION_FTS_ENABLED).
+_recording_fts = table('recording_fts', column('rowid'), column('transcription'))
+
+# Characters that are special in a LIKE pattern (including the '/' escape
+# character SQLAlchemy's autoescape uses)
+_LIKE_WILDCARD_RE = re.compile(r'[%_/]')
+
+
+def _transcription_contains(text_query):
+    """
+    Case-insensitive substring match on the transcription.
+
+    On SQLite with the trigram index available, the LIKE runs against the
+    FTS table so candidates come from the index instead of a scan of every
+    transcript. Plain LIKE is used there because it is already
+    case-insensitive and lower() would bypass the index.
+    """
+    if current_app.config.get('TRANSCRIPTION_FTS_ENABLED'):
+        # The FTS index only serves LIKE without an ESCAPE clause, so escape
+        # only when the term actually contains wildcard characters.
+        if _LIKE_WILDCARD_RE.search(text_query):
+            fts_match = _recording_fts.c.transcription.contains(text_query, autoescape=True)
+        else:
+            fts_match = _recording_fts.c.transcription.like(f'%{text_query}%')
+        return Recording.id.in_(select(_recording_fts.c.rowid).where(fts_match))
+    return Recording.transcription.icontains(text_query, autoescape=True)
+
+
+def _midnight(day):
+    """Start of a calendar day as a naive datetime."""
+    return datetime.combine(day, datetime.min.time())
+
+
+def _today_range(today):
+    start = _midnight(today)
+    return start, start + timedelta(days=1)
+
+
+def _yesterday_range(today):
+    end = _midnight(today)
+    return end - timedelta(days=1), end
+
+
+def _this_week_range(today):
+    return _midnight(today - timedelta(days=today.weekday())), None
+
+
+def _last_week_range(today):
+    end = _midnight(today - timedelta(days=today.weekday()))
+    return end - timedelta(days=7), end
+
+
+def _this_month_range(today):
+    return _midnight(today.replace(day=1)), None
+
+
+def _last_month_range(today):
+    end = _midnight(today.replace(day=1))
+    return (end - timedelta(days=1)).replace(day=1), end
+
+
+def _iso_day_range(value):
+    start = datetime.strptime(value, '%Y-%m-%d')
+    return start, start + timedelta(days=1)
+
+
+def _iso_month_range(value):
+    start = datetime.strptime(value, '%Y-%m')
+    return start, (start + timedelta(days=32)).replace(day=1)
+
+
+def _iso_year_range(value):
+    start = datetime(int(value), 1, 1)
+    return start, start.replace(year=start.year + 1)
+
+
+# `date:` search keywords, each mapping today's date to a [start, end) range
+# (end None = open-ended)
+_NAMED_DATE_BUILDERS = {
+    'today': _today_range,
+    'yesterday': _yesterday_range,
+    'thisweek': _this_week_range,
+    'lastweek': _last_week_range,
+    'thismonth': _this_month_range,
+    'lastmonth': _last_month_range,
+}
+
+# Literal `date:` values (YYYY-MM-DD, YYYY-MM, YYYY), tried in order
+_LITERAL_DATE_BUILDERS = (
+    (_ISO_DATE_RE, _iso_day_range),
+    (_ISO_MONTH_RE, _iso_month_range),
+    (_ISO_YEAR_RE, _iso_year_range),
+)
+
+
+def _date_filter_range(date_filter, today):
+    """
+    Resolve one `date:` search value to a (start, end) range.
+
+    Returns:
+        (start, end) tuple, or None if the value is not a known keyword or
+        a valid literal date
+    """
+    builder = _NAMED_DATE_BUILDERS.get(date_filter)
+    if builder:
+        return builder(today)
+    for pattern, literal_builder in _LITERAL_DATE_BUILDERS:
+        if pattern.match(date_filter):
+            try:
+                return literal_builder(date_filter)
+            except ValueError:
+                return None  # e.g. 2024-13
+    return None
+
+
+def _recording_date_range(start=None, end=None):
+    """
+    Match recordings dated within [start, end).
+
+    A recording is dated by its meeting date, falling back to its upload time
+    when no meeting date is set. Plain range comparisons on the columns (no
+    DATE()/EXTRACT() wrapping) keep the predicate index-friendly.
+    """
+    meeting = []
+    created = [Recording.meeting_date.is_(None)]
+    if start is not None:
+        meeting.append(Recording.meeting_date >= start)
+        created.append(Recording.created_at >= start)
+    if end is not None:
+        meeting.append(Recording.meeting_date < end)
+        created.append(Recording.created_at < end)
+    return db.or_(db.and_(*meeting), db.and_(*created))
+
+
+def _encode_list_cursor(sort_value, recording_id):
+    """Keyset cursor for the recordings list: '<sort date ISO>|<id>'."""
+    if sort_value is None:
+        return None
+    return f"{sort_value.isoformat()}|{recording_id}"
+
+
+def _decode_list_cursor(cursor):
+    """
+    Parse an `after=` cursor from _encode_list_cursor.
+
+    Returns:
+        (datetime, int) tuple
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    sort_part, sep, id_part = cursor.rpartition('|')
+    if not sep:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return datetime.fromisoformat(sort_part), int(id_part)
 
 
 @recordings_bp.route('/recordings', methods=['GET'])
@@ -1493,14 +1716,26 @@ def get_recordings():
         if not current_user.is_authenticated:
             return jsonify([])  # Return empty array if not logged in
 
-        # Filter recordings by the current user
-        stmt = select(Recording).where(Recording.user_id == current_user.id).order_by(Recording.created_at.desc())
+        # Filter recordings by the current user. Tags, folder and events are
+        # eager-loaded in one SELECT ... IN each instead of lazily per row.
+        stmt = (
+            select(Recording)
+            .where(Recording.user_id == current_user.id)
+            .options(
+                selectinload(Recording.tag_associations).selectinload(RecordingTag.tag),
+                selectinload(Recording.folder),
+                selectinload(Recording.events),
+            )
+            .order_by(Recording.created_at.desc())
+        )
         recordings = db.session.execute(stmt).scalars().all()
-        # Pre-batch the duplicate-info groupings so we don't run a
-        # per-row query inside each recording's to_dict() call.
+        # Pre-batch the duplicate-info groupings and share counts so we don't
+        # run per-row queries inside each recording's to_dict() call.
         dup_map = Recording.get_duplicate_info_map(current_user.id)
+        share_counts = Recording.get_share_counts_map([r.id for r in recordings])
         return jsonify([
-            recording.to_dict(viewer_user=current_user, duplicate_info_map=dup_map)
+            recording.to_dict(viewer_user=current_user, duplicate_info_map=dup_map,
+                              share_counts_map=share_counts)
             for recording in recordings
         ])
     except Exception as e:
@@ -1512,11 +1747,12 @@ def get_recordings():
 @login_required
 def get_recordings_paginated():
     """Get recordings with pagination and server-side filtering (includes shared recordings)."""
-    import re
     try:
         # Parse query parameters
-        page = request.args.get('page', 1, type=int)
-        per_page = min(request.args.get('per_page', 25, type=int), 100)  # Cap at 100 per page
+        # Clamp to page >= 1 and 1 <= per_page <= 100; a zero or negative
+        # per_page would otherwise divide by zero or lift the LIMIT
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = max(min(request.args.get('per_page', 25, type=int), 100), 1)
         search_query = request.args.get('q', '').strip()
         show_archived = request.args.get('archived', '').lower() == 'true'
         show_shared = request.args.get('shared', '').lower() == 'true'
@@ -1525,24 +1761,20 @@ def get_recordings_paginated():
         sort_by = request.args.get('sort_by', 'created_at')  # 'created_at' or 'meeting_date'
         folder_filter = request.args.get('folder', '').strip()  # folder_id or 'none' for no folder
 
-        # Get all accessible recording IDs (own + shared)
-        accessible_recording_ids = get_accessible_recording_ids(current_user.id)
-
-        if not accessible_recording_ids:
-            return jsonify({
-                'recordings': [],
-                'pagination': {
-                    'page': page,
-                    'per_page': per_page,
-                    'total': 0,
-                    'total_pages': 0,
-                    'has_next': False,
-                    'has_prev': False
-                }
-            })
+        # Keyset pagination: `after` is the next_cursor of the previous page
+        # and replaces `page` (whose OFFSET cost grows with depth)
+        after = request.args.get('after', '').strip()
+        cursor = None
+        if after:
+            try:
+                cursor = _decode_list_cursor(after)
+            except ValueError:
+                return jsonify({'error': 'Invalid cursor'}), 400
 
-        # Build base query to include accessible recordings
-        stmt = select(Recording).where(Recording.id.in_(accessible_recording_ids))
+        # Build base query to include accessible recordings (own + shared),
+        # joined against a UNION subquery rather than an IN list of IDs
+        accessible = accessible_recording_ids_select(current_user.id).subquery()
+        stmt = select(Recording).join(accessible, Recording.id == accessible.c.id)
 
         # Apply archived filter (AND with other filters)
         if show_archived:
@@ -1606,185 +1838,60 @@ def get_recordings_paginated():
 
         # Apply search filters if provided
         if search_query:
-            # Extract date filters
-            date_filters = re.findall(r'date:(\S+)', search_query.lower())
-            date_from_filters = re.findall(r'date_from:(\S+)', search_query.lower())
-            date_to_filters = re.findall(r'date_to:(\S+)', search_query.lower())
-            tag_filters = re.findall(r'tag:(\S+)', search_query.lower())
-            speaker_filters = re.findall(r'speaker:(\S+)', search_query.lower())
-
-            # Remove special syntax to get text search
-            text_query = re.sub(r'date:\S+', '', search_query, flags=re.IGNORECASE)
-            text_query = re.sub(r'date_from:\S+', '', text_query, flags=re.IGNORECASE)
-            text_query = re.sub(r'date_to:\S+', '', text_query, flags=re.IGNORECASE)
-            text_query = re.sub(r'tag:\S+', '', text_query, flags=re.IGNORECASE)
-            text_query = re.sub(r'speaker:\S+', '', text_query, flags=re.IGNORECASE).strip()
-
-            # Apply date filters
-            for date_filter in date_filters:
-                if date_filter == 'today':
-                    today = datetime.now().date()
-                    stmt = stmt.where(
-                        db.or_(
-                            db.func.date(Recording.meeting_date) == today,
-                            db.and_(
-                                Recording.meeting_date.is_(None),
-                                db.func.date(Recording.created_at) == today
-                            )
-                        )
-                    )
-                elif date_filter == 'yesterday':
-                    yesterday = datetime.now().date() - timedelta(days=1)
-                    stmt = stmt.where(
-                        db.or_(
-                            db.func.date(Recording.meeting_date) == yesterday,
-                            db.and_(
-                                Recording.meeting_date.is_(None),
-                                db.func.date(Recording.created_at) == yesterday
-                            )
-                        )
-                    )
-                elif date_filter == 'thisweek':
-                    today = datetime.now().date()
-                    start_of_week = today - timedelta(days=today.weekday())
-                    stmt = stmt.where(
-                        db.or_(
-                            Recording.meeting_date >= start_of_week,
-                            db.and_(
-                                Recording.meeting_date.is_(None),
-                                db.func.date(Recording.created_at) >= start_of_week
-                            )
-                        )
-                    )
-                elif date_filter == 'lastweek':
-                    today = datetime.now().date()
-                    end_of_last_week = today - timedelta(days=today.weekday())
-                    start_of_last_week = end_of_last_week - timedelta(days=7)
-                    stmt = stmt.where(
-                        db.or_(
-                            db.and_(
-                                Recording.meeting_date >= start_of_last_week,
-                                Recording.meeting_date < end_of_last_week
-                            ),
-                            db.and_(
-                                Recording.meeting_date.is_(None),
-                                db.func.date(Recording.created_at) >= start_of_last_week,
-                                db.func.date(Recording.created_at) < end_of_last_week
-                            )
-                        )
-                    )
-                elif date_filter == 'thismonth':
-                    today = datetime.now().date()
-                    start_of_month = today.replace(day=1)
-                    stmt = stmt.where(
-                        db.or_(
-                            Recording.meeting_date >= start_of_month,
-                            db.and_(
-                                Recording.meeting_date.is_(None),
-                                db.func.date(Recording.created_at) >= start_of_month
-                            )
-                        )
-                    )
-                elif date_filter == 'lastmonth':
-                    today = datetime.now().date()
-                    first_day_this_month = today.replace(day=1)
-                    last_day_last_month = first_day_this_month - timedelta(days=1)
-                    first_day_last_month = last_day_last_month.replace(day=1)
-                    stmt = stmt.where(
-                        db.or_(
-                            db.and_(
-                                Recording.meeting_date >= first_day_last_month,
-                                Recording.meeting_date <= last_day_last_month
-                            ),
-                            db.and_(
-                                Recording.meeting_date.is_(None),
-                                db.func.date(Recording.created_at) >= first_day_last_month,
-                                db.func.date(Recording.created_at) <= last_day_last_month
-                            )
-                        )
-                    )
-                elif re.match(r'^\d{4}-\d{2}-\d{2}$', date_filter):
-                    # Specific date format YYYY-MM-DD
-                    target_date = datetime.strptime(date_filter, '%Y-%m-%d').date()
-                    stmt = stmt.where(
-                        db.or_(
-                            db.func.date(Recording.meeting_date) == target_date,
-                            db.and_(
-                                Recording.meeting_date.is_(None),
-                                db.func.date(Recording.created_at) == target_date
-                            )
-                        )
-                    )
-                elif re.match(r'^\d{4}-\d{2}$', date_filter):
-                    # Month format YYYY-MM
-                    year, month = map(int, date_filter.split('-'))
-                    stmt = stmt.where(
-                        db.or_(
-                            db.and_(
-                                db.extract('year', Recording.meeting_date) == year,
-                                db.extract('month', Recording.meeting_date) == month
-                            ),
-                            db.and_(
-                                Recording.meeting_date.is_(None),
-                                db.extract('year', Recording.created_at) == year,
-                                db.extract('month', Recording.created_at) == month
-                            )
-                        )
-                    )
-                elif re.match(r'^\d{4}$', date_filter):
-                    # Year format YYYY
-                    year = int(date_filter)
-                    stmt = stmt.where(
-                        db.or_(
-                            db.extract('year', Recording.meeting_date) == year,
-                            db.and_(
-                                Recording.meeting_date.is_(None),
-                                db.extract('year', Recording.created_at) == year
-                            )
-                        )
-                    )
-
-            # Apply date range filters
+            # Extract date/tag/speaker filters in a single scan
+            search_filters = {'date': [], 'date_from': [], 'date_to': [], 'tag': [], 'speaker': []}
+            for key, value in _SEARCH_FILTER_RE.findall(search_query.lower()):
+                search_filters[key].append(value)
+            date_filters = search_filters['date']
+            date_from_filters = search_filters['date_from']
+            date_to_filters = search_filters['date_to']
+            tag_filters = search_filters['tag']
+            speaker_filters = search_filters['speaker']
+
+            # Remove special syntax to get text search (one pass for all keys)
+            text_query = _SEARCH_FILTER_STRIP_RE.sub('', search_query).strip()
+
+            # Apply date filters. Each one becomes a half-open [start, end)
+            # range on the raw columns so the date indexes stay usable.
+            # Resolve "today" once so every relative filter agrees on it
+            # Several date: values match a recording dated within any of them
+            today = datetime.now().date()
+            date_ranges = [_date_filter_range(date_filter, today) for date_filter in date_filters]
+            date_conditions = [_recording_date_range(*r) for r in date_ranges if r]
+            if date_conditions:
+                stmt = stmt.where(db.or_(*date_conditions))
+
+            # Apply date range filters (date_to includes the whole day)
             if date_from_filters and date_from_filters[0]:
                 try:
-                    date_from = datetime.strptime(date_from_filters[0], '%Y-%m-%d').date()
-                    stmt = stmt.where(
-                        db.or_(
-                            Recording.meeting_date >= date_from,
-                            db.and_(
-                                Recording.meeting_date.is_(None),
-                                db.func.date(Recording.created_at) >= date_from
-                            )
-                        )
-                    )
+                    date_from = datetime.strptime(date_from_filters[0], '%Y-%m-%d')
+                    stmt = stmt.where(_recording_date_range(date_from))
                 except ValueError:
                     pass  # Invalid date format, ignore
 
             if date_to_filters and date_to_filters[0]:
                 try:
-                    date_to = datetime.strptime(date_to_filters[0], '%Y-%m-%d').date()
-                    stmt = stmt.where(
-                        db.or_(
-                            Recording.meeting_date <= date_to,
-                            db.and_(
-                                Recording.meeting_date.is_(None),
-                                db.func.date(Recording.created_at) <= date_to
-                            )
-                        )
-                    )
+                    date_to = datetime.strptime(date_to_filters[0], '%Y-%m-%d')
+                    stmt = stmt.where(_recording_date_range(None, date_to + timedelta(days=1)))
                 except ValueError:
                     pass  # Invalid date format, ignore
 
             # Apply tag filters
             if tag_filters:
-                # Join with tags table and filter by tag names
+                # Semi-join on the recording's tags so a recording matching
+                # several tags still comes back (and is counted) once
                 tag_conditions = []
                 for tag_filter in tag_filters:
                     # Replace underscores back to spaces for matching
                     tag_name = tag_filter.replace('_', ' ')
-                    tag_conditions.append(Tag.name.ilike(f'%{tag_name}%'))
+                    tag_conditions.append(Tag.name.icontains(tag_name, autoescape=True))
 
-                stmt = stmt.join(RecordingTag).join(Tag).where(db.or_(*tag_conditions))
+                stmt = stmt.where(
+                    select(RecordingTag.recording_id)
+                    .join(Tag, RecordingTag.tag_id == Tag.id)
+                    .where(RecordingTag.recording_id == Recording.id, db.or_(*tag_conditions))
+                    .exists()
+                )
 
             # Apply speaker filters
             if speaker_filters:
@@ -1792,7 +1899,7 @@ def get_recordings_paginated():
                 for speaker_filter in speaker_filters:
                     # Replace underscores back to spaces for matching
                     speaker_name = speaker_filter.replace('_', ' ')
-                    speaker_conditions.append(Recording.participants.ilike(f'%{speaker_name}%'))
+                    speaker_conditions.append(Recording.participants.icontains(speaker_name, autoescape=True))
                 stmt = stmt.where(db.or_(*speaker_conditions))
 
             # Apply text search
@@ -1804,89 +1911,156 @@ def get_recordings_paginated():
                 # - For shared recordings: search SharedRecordingState.personal_notes
 
                 text_conditions = [
-                    Recording.title.ilike(f'%{text_query}%'),
-                    Recording.participants.ilike(f'%{text_query}%'),
-                    Recording.transcription.ilike(f'%{text_query}%'),
+                    Recording.title.icontains(text_query, autoescape=True),
+                    Recording.participants.icontains(text_query, autoescape=True),
+                    _transcription_contains(text_query),
                     # Search owner's notes for owned recordings
                     db.and_(
                         Recording.user_id == current_user.id,
-                        Recording.notes.ilike(f'%{text_query}%')
+                        Recording.notes.icontains(text_query, autoescape=True)
                     )
                 ]
 
-                # Add search for personal notes in shared recordings
-                # Use a subquery to check if personal_notes match
-                shared_notes_subq = select(SharedRecordingState.recording_id).where(
-                    db.and_(
+                # Add search for personal notes in shared recordings. A
+                # correlated EXISTS probes the (recording_id, user_id) unique
+                # index per row instead of materializing every matching id.
+                text_conditions.append(
+                    select(SharedRecordingState.id).where(
+                        SharedRecordingState.recording_id == Recording.id,
                         SharedRecordingState.user_id == current_user.id,
-                        SharedRecordingState.personal_notes.ilike(f'%{text_query}%')
-                    )
-                ).scalar_subquery()
-
-                text_conditions.append(Recording.id.in_(shared_notes_subq))
+                        SharedRecordingState.personal_notes.icontains(text_query, autoescape=True)
+                    ).exists()
+                )
 
                 stmt = stmt.where(db.or_(*text_conditions))
 
-        # Apply ordering based on sort_by parameter
+        # Apply ordering based on sort_by parameter. The id tie-breaker makes
+        # the order total, which the keyset cursor relies on.
         if sort_by == 'meeting_date':
             # Sort by meeting_date first, fall back to created_at if no meeting_date
-            stmt = stmt.order_by(
-                db.case(
-                    (Recording.meeting_date.is_not(None), Recording.meeting_date),
-                    else_=db.func.date(Recording.created_at)
-                ).desc(),
-                Recording.created_at.desc()
-            )
+            sort_key = _SORTABLE_DATE
         else:
             # Default: sort by created_at (upload/processing date)
-            stmt = stmt.order_by(Recording.created_at.desc())
-
-        # Get total count for pagination info
-        count_stmt = select(db.func.count()).select_from(stmt.subquery())
-        total_count = db.session.execute(count_stmt).scalar()
-
-        # Apply pagination
-        offset = (page - 1) * per_page
-        stmt = stmt.offset(offset).limit(per_page)
+            sort_key = Recording.created_at
+        stmt = stmt.order_by(sort_key.desc(), Recording.id.desc())
+
+        list_options = Recording.list_loader_options()
+        if cursor:
+            # Seek past the cursor row; one extra row tells whether more follow
+            paged_stmt = (
+                stmt.add_columns(sort_key.label('sort_value'))
+                .where(db.tuple_(sort_key, Recording.id) < cursor)
+                .options(*list_options)
+            )
+            rows = db.session.execute(paged_stmt.limit(per_page + 1)).all()
+            has_next = len(rows) > per_page
+            rows = rows[:per_page]
+        else:
+            # Apply pagination. The total rides along on every row as a window
+            # count, so the filtered query runs once instead of again for COUNT.
+            offset = (page - 1) * per_page
+            paged_stmt = (
+                stmt.add_columns(sort_key.label('sort_value'),
+                                 db.func.count().over().label('total_count'))
+                .options(*list_options)
+            )
+            rows = db.session.execute(paged_stmt.offset(offset).limit(per_page)).all()
+
+            if rows:
+                total_count = rows[0].total_count
+            elif page > 1:
+                # Past the last page there are no rows to carry the total
+                count_stmt = select(db.func.count()).select_from(stmt.subquery())
+                total_count = db.session.execute(count_stmt).scalar()
+            else:
+                total_count = 0
+        recordings = [row[0] for row in rows]
+
+        next_cursor = _encode_list_cursor(rows[-1].sort_value, rows[-1][0].id) if rows else None
+        if cursor:
+            # The total is not counted on cursor pages; that scan is what
+            # keyset pagination avoids
+            pagination = {
+                'per_page': per_page,
+                'has_next': has_next,
+                'has_prev': True,
+                'next_cursor': next_cursor if has_next else None
+            }
+        else:
+            # Calculate pagination metadata
+            total_pages = (total_count + per_page - 1) // per_page
+            has_next = page < total_pages
+            pagination = {
+                'page': page,
+                'per_page': per_page,
+                'total': total_count,
+                'total_pages': total_pages,
+                'has_next': has_next,
+                'has_prev': page > 1,
+                'next_cursor': next_cursor if has_next else None
+            }
 
-        # Execute query
-        recordings = db.session.execute(stmt).scalars().all()
+        # Nothing on this page (no matches, or past the last page): skip the
+        # per-page batch loads and enrichment
+        if not recordings:
+            return jsonify({'recordings': [], 'pagination': pagination})
 
         # Batch-load this viewer's shares for the page so serialization can resolve
         # the #314 share-reason tag/folder without an N+1 query.
         page_rec_ids = [r.id for r in recordings]
         share_map = {}
-        if page_rec_ids:
-            for s in InternalShare.query.filter(
-                InternalShare.recording_id.in_(page_rec_ids),
-                InternalShare.shared_with_user_id == current_user.id
+        for s in InternalShare.query.filter(
+            InternalShare.recording_id.in_(page_rec_ids),
+            InternalShare.shared_with_user_id == current_user.id
+        ).all():
+            share_map[s.recording_id] = s
+
+        # Batch-load owner usernames and this viewer's per-user state for
+        # shared recordings on this page
+        shared_rec_ids = [r.id for r in recordings if r.user_id != current_user.id]
+        owner_usernames = {}
+        state_map = {}
+        if shared_rec_ids:
+            from src.models.sharing import SharedRecordingState
+            owner_ids = {r.user_id for r in recordings if r.user_id != current_user.id}
+            owner_usernames = dict(db.session.execute(
+                select(User.id, User.username).where(User.id.in_(owner_ids))
+            ).all())
+            for state in SharedRecordingState.query.filter(
+                SharedRecordingState.recording_id.in_(shared_rec_ids),
+                SharedRecordingState.user_id == current_user.id
             ).all():
-                share_map[s.recording_id] = s
+                state_map[state.recording_id] = state
+
+        # Group memberships decide tag visibility; load them once for the page
+        viewer_group_ids = Recording.get_viewer_group_ids(current_user)
+        editable_ids = get_editable_recording_ids(recordings, current_user, share_map)
 
         # Enrich recordings with sharing metadata
+        rec_dicts = Recording.to_list_dicts(recordings, viewer_user=current_user, share_map=share_map,
+                                            viewer_group_ids=viewer_group_ids)
         enriched_recordings = []
-        for recording in recordings:
-            rec_dict = recording.to_list_dict(viewer_user=current_user, share_map=share_map)
+        for recording, rec_dict in zip(recordings, rec_dicts):
 
             # Add sharing metadata
             is_owner = recording.user_id == current_user.id
             rec_dict['is_owner'] = is_owner
 
             # Get per-user status (owner uses Recording fields, recipients use SharedRecordingState)
-            user_inbox, user_highlighted = get_user_recording_status(recording, current_user)
+            user_inbox, user_highlighted = get_user_recording_status(recording, current_user, state_map)
             rec_dict['is_inbox'] = user_inbox
             rec_dict['is_highlighted'] = user_highlighted
 
-            # Add edit permission info (uses has_recording_access which checks group admin status)
-            rec_dict['can_edit'] = has_recording_access(recording, current_user, require_edit=True)
+            # Add edit permission info (batched has_recording_access, incl. group admin status)
+            rec_dict['can_edit'] = recording.id in editable_ids
 
             # Add delete permission info (only owner can delete)
             rec_dict['can_delete'] = is_owner and (USERS_CAN_DELETE or current_user.is_admin)
 
             if not is_owner:
                 # This is a shared recording - get owner info and share permissions
-                owner = db.session.get(User, recording.user_id)
-                rec_dict['owner_username'] = owner.username if owner else "Unknown"
+                owner_username = owner_usernames.get(recording.user_id, "Unknown")
+                rec_dict['owner_username'] = owner_username
                 rec_dict['is_shared'] = True
                 # Don't show outgoing share count for recordings you don't own
                 rec_dict['shared_with_count'] = 0
@@ -1898,7 +2072,7 @@ def get_recordings_paginated():
                 if share:
                     rec_dict['share_info'] = {
                         'share_id': share.id,
-                        'owner_username': owner.username if owner else "Unknown",
+                        'owner_username': owner_username,
                         'can_edit': share.can_edit,
                         'can_reshare': share.can_reshare,
                         'shared_at': share.created_at.isoformat()
@@ -1913,28 +2087,13 @@ def get_recordings_paginated():
                 rec_dict['is_shared'] = False
 
             # Check if recording has group tags (among visible tags)
-            visible_tags = recording.get_visible_tags(current_user)
+            visible_tags = recording.get_visible_tags(current_user, viewer_group_ids)
             has_group_tags = any(tag.is_group_tag for tag in visible_tags)
             rec_dict['has_group_tags'] = has_group_tags
 
             enriched_recordings.append(rec_dict)
 
-        # Calculate pagination metadata
-        total_pages = (total_count + per_page - 1) // per_page
-        has_next = page < total_pages
-        has_prev = page > 1
-
-        return jsonify({
-            'recordings': enriched_recordings,
-            'pagination': {
-                'page': page,
-                'per_page': per_page,
-                'total': total_count,
-                'total_pages': total_pages,
-                'has_next': has_next,
-                'has_prev': has_prev
-            }
-        })
+        return jsonify({'recordings': enriched_recordings, 'pagination': pagination})
 
     except Exception as e:
         current_app.logger.error(f"Error fetching paginated recordings: {e}")
@@ -2244,9 +2403,46 @@ def share_target():
     return redirect(url_for('recordings.index') + f'?share_target=ok&recording_id={recording.id}')
 
 
+def _authorized_tags(tag_ids, user_id):
+    """
+    Load the requested tags the user may apply, in request order.
+
+    A tag is allowed if it is the user's own or a group tag of a group the
+    user belongs to. Tags and memberships are fetched with one query each;
+    unknown, unauthorized, malformed and repeated ids are dropped.
+    """
+    requested = []
+    for tag_id in tag_ids:
+        try:
+            tag_id = int(tag_id)
+        except (TypeError, ValueError):
+            continue
+        if tag_id not in requested:
+            requested.append(tag_id)
+    if not requested:
+        return []
+
+    tags = {t.id: t for t in Tag.query.filter(Tag.id.in_(requested)).all()}
+    group_ids = {t.group_id for t in tags.values() if t.group_id and t.user_id != user_id}
+    member_group_ids = set()
+    if group_ids:
+        member_group_ids = set(db.session.execute(
+            select(GroupMembership.group_id).where(
+                GroupMembership.group_id.in_(group_ids),
+                GroupMembership.user_id == user_id
+            )
+        ).scalars())
+
+    return [
+        tags[tag_id] for tag_id in requested
+        if tag_id in tags and (tags[tag_id].user_id == user_id or tags[tag_id].group_id in member_group_ids)
+    ]
+
+
 @recordings_bp.route('/upload', methods=['POST'])
 @login_required
 def upload_file():
+    stored_object = None
     try:
         if 'file' not in request.files:
             return jsonify({'error': 'No file provided'}), 400
@@ -2279,7 +2475,9 @@ def upload_file():
         _ext_lower = os.path.splitext(original_filename)[1].lower()
         is_likely_video_by_ext = _ext_lower in _VIDEO_EXTS
 
-        # Get original file size
+        # Get original file size. The upload is already spooled by the form
+        # parser, so seek/tell is O(1); request.content_length would count
+        # the whole multipart body instead of this file.
         file.seek(0, os.SEEK_END)
         original_file_size = file.tell()
         file.seek(0)
@@ -2341,16 +2539,14 @@ def upload_file():
         ):
             raise RequestEntityTooLarge()
 
-        file.save(filepath)
-        current_app.logger.info(f"File saved to {filepath}")
-
-        # Compute file hash on the ORIGINAL upload before any conversion/compression.
+        # Hash the ORIGINAL upload while saving it, before any conversion/compression.
         # Lossy re-encoding (e.g. FLAC→MP3) produces different bytes each run,
         # so hashing after conversion would miss duplicates.
-        file_hash = None
+        file_hash = save_stream_with_sha256(file.stream, filepath)
+        current_app.logger.info(f"File saved to {filepath}")
+
         duplicate_warning = None
         try:
-            file_hash = compute_file_sha256(filepath)
             existing = Recording.query.filter_by(
                 user_id=current_user.id, file_hash=file_hash
             ).first()
@@ -2365,24 +2561,19 @@ def upload_file():
                     f"hash={file_hash[:12]}... matches recording {existing.id}"
                 )
         except Exception as e:
-            current_app.logger.warning(f"Could not compute file hash: {e}")
+            current_app.logger.warning(f"Could not check for duplicate uploads: {e}")
 
-        # --- Convert files only when chunking is needed ---
-        filename_lower = original_filename.lower()
-
-        # Check if chunking will be needed for this file (uses connector-aware logic)
-        needs_chunking_for_processing = bool(
-            chunking_service and
-            chunking_service.needs_chunking(filepath, USE_ASR_ENDPOINT, connector_specs)
-        )
-
-        # Probe once and use shared conversion utility
+        # Probe once to decide whether the video stream is kept. The raw
+        # probe output is reused below for the MIME type, duration and
+        # creation date, so the request forks ffprobe a single time.
         # Scale timeout based on file size — large files (especially MP4 with moov at end) need more time
-        file_size_mb = os.path.getsize(filepath) / (1024 * 1024)
+        file_size_mb = original_file_size / (1024 * 1024)
         probe_timeout = max(10, min(60, int(file_size_mb / 10)))  # 10s min, scales ~1s per 10MB, 60s max
+        probe_data = None
         codec_info = None
         try:
-            codec_info = get_codec_info(filepath, timeout=probe_timeout)
+            probe_data = probe(filepath, timeout=probe_timeout)
+            codec_info = get_codec_info(filepath, probe_data=probe_data)
             current_app.logger.info(
                 f"Detected codec for {original_filename}: "
                 f"audio_codec={codec_info.get('audio_codec')}, "
@@ -2413,107 +2604,68 @@ def upload_file():
             ((VIDEO_RETENTION and not keep_audio_only_flag) or VIDEO_PASSTHROUGH_ASR)
             and has_video
         )
+        # Codec conversion, video audio extraction and lossless compression
+        # run in a prepare_audio job ahead of transcription, not here:
+        # ffmpeg on a long file would otherwise hold the request open. The
+        # file is stored as received and swapped for the converted audio.
+        convert_upload = None
         if keep_video_for_this_upload:
             current_app.logger.info(f"Video {'passthrough' if VIDEO_PASSTHROUGH_ASR else 'retention'}: keeping original video, skipping conversion")
         else:
-            # Use shared conversion utility - handles ALL conversion needs (codec conversion + compression)
-            try:
-                result = convert_if_needed(
-                    filepath,
-                    original_filename=original_filename,
-                    codec_info=codec_info,
-                    needs_chunking=needs_chunking_for_processing,
-                    is_asr_endpoint=USE_ASR_ENDPOINT,
-                    delete_original=True,
-                    connector_specs=connector_specs  # Pass connector specs for codec restrictions
-                )
-                filepath = result.output_path
-
-                # Log what happened
-                if result.was_converted:
-                    current_app.logger.info(f"File converted: {result.original_codec} -> {result.final_codec}")
-                if result.was_compressed:
-                    current_app.logger.info(f"File compressed: {result.size_reduction_percent:.1f}% size reduction")
-
-            except FFmpegNotFoundError as e:
-                current_app.logger.error(f"FFmpeg not found: {e}")
-                return jsonify({'error': 'Audio conversion tool (FFmpeg) not found on server.'}), 500
-            except FFmpegError as e:
-                current_app.logger.error(f"FFmpeg conversion failed for {filepath}: {e}")
-                return jsonify({'error': f'Failed to convert audio file: {str(e)}'}), 500
-
-        # Get final file size (of original or converted file)
-        final_file_size = os.path.getsize(filepath)
-
-        # Post-extraction size guard. When the upload exceeded the regular
-        # max_file_size_mb under the "audio-only video" exception, the
-        # stored file (after audio extraction) must still fit the regular
-        # limit. If it does not, the user picked a video whose audio track
-        # alone is enormous AND chunking is off; reject the upload,
-        # clean up, and let the user know. When chunking is on the
-        # large extracted audio is fine — the chunking pipeline will
-        # split it for the ASR call.
-        chunking_will_handle_large_audio = (
-            chunking_service is not None and not should_enforce_size_limit
-        )
-        if (
-            effective_audio_only
-            and is_likely_video_by_ext
-            and final_file_size > regular_limit_mb * 1024 * 1024
-            and not chunking_will_handle_large_audio
-        ):
-            try:
-                if os.path.exists(filepath):
-                    os.remove(filepath)
-            except OSError:
-                pass
-            current_app.logger.warning(
-                f"Audio-only extraction left {final_file_size/1024/1024:.1f}MB of audio, "
-                f"which exceeds regular limit {regular_limit_mb}MB and chunking is off. "
-                f"Rejecting upload."
+            convert_upload = {'asr_endpoint': USE_ASR_ENDPOINT}
+
+            # Post-extraction size guard. When the upload exceeded the
+            # regular max_file_size_mb under the "audio-only video"
+            # exception, the stored file (after audio extraction) must
+            # still fit the regular limit; the job fails the recording if
+            # it does not. When chunking is on the large extracted audio
+            # is fine — the chunking pipeline will split it for the ASR call.
+            chunking_will_handle_large_audio = (
+                chunking_service is not None and not should_enforce_size_limit
             )
-            return jsonify({
-                'error': (
-                    f'The extracted audio is {final_file_size / 1024 / 1024:.0f} MB, '
-                    f'larger than the {regular_limit_mb} MB stored-file limit. '
-                    f'Enable chunking in admin settings (ENABLE_CHUNKING=true) or '
-                    f'use a shorter / lower-bitrate source video.'
-                ),
-                'max_size_mb': float(regular_limit_mb),
-                'extracted_audio_mb': round(final_file_size / 1024 / 1024, 1),
-                'audio_only_mode': True,
-                'chunking_enabled': False,
-            }), 413
-
-        # (file_hash and duplicate_warning already computed above, before conversion)
-
-        # Determine MIME type of the final file
-        mime_type, _ = mimetypes.guess_type(filepath)
-
-        # For a retained-video file, derive the MIME from the file's ACTUAL
-        # container via the shared probe-driven resolver (the same one the
-        # processing task uses) rather than the extension guess, which
-        # mislabels ambiguous containers — notably '.webm', registered as
-        # audio/webm in app.py — and would hide the video player in the UI.
-        # We already have codec_info from the probe above, so no second probe.
-        if keep_video_for_this_upload:
+            if (
+                effective_audio_only
+                and is_likely_video_by_ext
+                and not chunking_will_handle_large_audio
+            ):
+                convert_upload['size_limit_bytes'] = regular_limit_mb * 1024 * 1024
+
+        # Size of the file as stored (the bytes saved above); the job
+        # updates it after conversion
+        final_file_size = original_file_size
+
+        # Derive the MIME type from the file's ACTUAL container via the
+        # shared probe-driven resolver (the same one the processing task
+        # uses) rather than the client-supplied extension, which mislabels
+        # ambiguous containers — notably '.webm', registered as audio/webm
+        # in app.py — and would hide the video player in the UI. codec_info
+        # comes from the probe above, so there is no second probe; the
+        # extension guess is only used when that probe failed. A retained
+        # video is always resolved as video.
+        if keep_video_for_this_upload or (codec_info and codec_info.get('format_name')):
             from src.utils.mime import resolve_media_mime
-            corrected = resolve_media_mime(filepath, codec_info=codec_info, has_video=True)
-            if corrected != mime_type:
-                current_app.logger.info(f"Resolved video mime {mime_type!r} -> {corrected!r} from container for {filepath}")
-            mime_type = corrected
+            mime_type = resolve_media_mime(
+                filepath,
+                codec_info=codec_info,
+                has_video=True if keep_video_for_this_upload else None,
+            )
+        else:
+            mime_type, _ = mimetypes.guess_type(filepath)
 
         current_app.logger.info(f"Final MIME type: {mime_type} for file {filepath}")
 
         # Cache media duration while the upload is still available locally.
         # This avoids later S3 materialization just to serialize API responses.
+        # The prepare_audio job caches it from its own copy, so only a
+        # retained video (which skips that job) is probed here.
         audio_duration_seconds = None
-        try:
-            detected_duration = get_duration(filepath, timeout=30)
-            if detected_duration is not None and detected_duration > 0:
-                audio_duration_seconds = float(detected_duration)
-        except Exception as e:
-            current_app.logger.warning(f"Could not determine duration for upload {original_filename}: {e}")
+        if not convert_upload:
+            try:
+                detected_duration = get_duration(filepath, timeout=30, codec_info=codec_info)
+                if detected_duration is not None and detected_duration > 0:
+                    audio_duration_seconds = float(detected_duration)
+            except Exception as e:
+                current_app.logger.warning(f"Could not determine duration for upload {original_filename}: {e}")
 
         # Get notes from the form
         notes = request.form.get('notes')
@@ -2525,31 +2677,19 @@ def upload_file():
         # Get file's lastModified timestamp from client (milliseconds since epoch)
         file_last_modified = request.form.get('file_last_modified')
 
-        # Get selected tags if provided (multiple tags support)
-        selected_tags = []
-        tag_index = 0
+        # Get selected tags if provided (multiple tags support): tag_ids[0],
+        # tag_ids[1], ... up to the first gap
+        requested_tag_ids = []
         while True:
-            tag_id_key = f'tag_ids[{tag_index}]'
-            tag_id = request.form.get(tag_id_key)
+            tag_id = request.form.get(f'tag_ids[{len(requested_tag_ids)}]')
             if not tag_id:
                 break
-
-            # Check if tag belongs to user OR is a group tag where user is a member
-            tag = Tag.query.filter_by(id=tag_id).first()
-            if tag:
-                # Allow tag if it's user's own tag OR it's a group tag where user is a member
-                if tag.user_id == current_user.id or (tag.group_id and GroupMembership.query.filter_by(group_id=tag.group_id, user_id=current_user.id).first()):
-                    selected_tags.append(tag)
-            tag_index += 1
+            requested_tag_ids.append(tag_id)
+        selected_tags = _authorized_tags(requested_tag_ids, current_user.id)
 
         # For backward compatibility with single tag uploads
-        if not selected_tags:
-            single_tag_id = request.form.get('tag_id')
-            if single_tag_id:
-                # Check if tag belongs to user OR is a group tag where user is a member
-                tag = Tag.query.filter_by(id=single_tag_id).first()
-                if tag and (tag.user_id == current_user.id or (tag.group_id and GroupMembership.query.filter_by(group_id=tag.group_id, user_id=current_user.id).first())):
-                    selected_tags.append(tag)
+        if not selected_tags and request.form.get('tag_id'):
+            selected_tags = _authorized_tags([request.form.get('tag_id')], current_user.id)
 
         # Get folder_id if provided
         selected_folder = None
@@ -2679,9 +2819,10 @@ def upload_file():
             except (ValueError, TypeError, OSError) as e:
                 current_app.logger.warning(f"Could not parse file_last_modified '{file_last_modified}': {e}")
 
-        # Fall back to file metadata (creation_time, date tags, etc.)
-        if not meeting_date:
-            meeting_date = get_creation_date(filepath, use_file_mtime=False)
+        # Fall back to file metadata (creation_time, date tags, etc.) from
+        # the upload probe; a file ffprobe could not read has none
+        if not meeting_date and probe_data is not None:
+            meeting_date = get_creation_date(filepath, use_file_mtime=False, probe_data=probe_data)
             if meeting_date:
                 current_app.logger.info(f"Using file metadata creation date: {meeting_date}")
 
@@ -2726,23 +2867,13 @@ def upload_file():
         # always read from recording.audio_path via the storage facade.
         recording.audio_path = stored_object.locator
 
-        # Add tags to recording if selected (preserve order)
-        for order, tag in enumerate(selected_tags, 1):
-            new_association = RecordingTag(
-                recording_id=recording.id,
-                tag_id=tag.id,
-                order=order,
-                added_at=datetime.utcnow()
-            )
-            db.session.add(new_association)
-
-        db.session.commit()
-
+        # Add tags to recording if selected (preserve order), as one
+        # multi-row INSERT
         if selected_tags:
-            tag_names = [tag.name for tag in selected_tags]
-            current_app.logger.info(f"Added {len(selected_tags)} tags to recording {recording.id}: {', '.join(tag_names)}")
-
-        current_app.logger.info(f"Initial recording record created with ID: {recording.id}")
+            db.session.execute(insert(RecordingTag), [
+                {'recording_id': recording.id, 'tag_id': tag.id, 'order': order, 'added_at': now}
+                for order, tag in enumerate(selected_tags, 1)
+            ])
 
         # Validate against admin-curated list and apply admin default when
         # nothing else in the chain set a model.
@@ -2759,16 +2890,31 @@ def upload_file():
             'initial_prompt': initial_prompt,
             'transcription_model': transcription_model,
         }
-
-        current_app.logger.info(f"Queueing transcription for recording {recording.id} with params: {job_params}")
+        # Files that need preparing go through prepare_audio first, which
+        # queues the transcribe job with the same params once it is done
+        job_type = 'transcribe'
+        if convert_upload:
+            job_type = 'prepare_audio'
+            job_params['convert_upload'] = convert_upload
+
+        current_app.logger.info(f"Queueing {job_type} for recording {recording.id} with params: {job_params}")
         job_queue.enqueue(
             user_id=current_user.id,
             recording_id=recording.id,
-            job_type='transcribe',
+            job_type=job_type,
             params=job_params,
-            is_new_upload=True
+            is_new_upload=True,
+            commit=False
         )
-        current_app.logger.info(f"Transcription job queued for recording ID: {recording.id}")
+
+        # One transaction for the recording, its tags and the job, so a
+        # failure part-way leaves no recording without its job
+        db.session.commit()
+
+        if selected_tags:
+            tag_names = [tag.name for tag in selected_tags]
+            current_app.logger.info(f"Added {len(selected_tags)} tags to recording {recording.id}: {', '.join(tag_names)}")
+        current_app.logger.info(f"Recording {recording.id} created and transcription job queued")
 
         # Webhook event (#275). Fan-out happens off-request via the
         # dispatcher; this call only enqueues a delivery row per matching
@@ -2817,6 +2963,12 @@ def upload_file():
         }), 413
     except Exception as e:
         db.session.rollback()
+        if stored_object is not None:
+            # The recording row was rolled back; drop the file it pointed to
+            try:
+                get_storage_service().delete(stored_object.locator, missing_ok=True)
+            except Exception as cleanup_err:
+                current_app.logger.warning(f"Failed to delete stored upload after rollback: {cleanup_err}")
         current_app.logger.error(f"Error during file upload: {e}", exc_info=True)
         return jsonify({'error': 'An unexpected error occurred during upload.'}), 500
 
@@ -3450,6 +3602,7 @@ def get_job_queue_status():
         from src.models import ProcessingJob
         from src.services.job_queue import TRANSCRIPTION_JOBS, SUMMARY_JOBS
         from datetime import timedelta
+        from bisect import bisect_left
 
         # Expire all cached objects to ensure we see latest data from worker threads
         db.session.expire_all()
@@ -3467,9 +3620,38 @@ def get_job_queue_status():
             )
         ).order_by(ProcessingJob.created_at.desc()).all()
 
+        # Titles for every job's recording in one query
+        recording_ids = {job.recording_id for job in all_jobs if job.recording_id}
+        recordings_by_id = {}
+        if recording_ids:
+            recordings_by_id = {
+                rec.id: rec for rec in Recording.query.filter(Recording.id.in_(recording_ids))
+                .options(load_only(Recording.id, Recording.title, Recording.original_filename))
+            }
+
+        # Queue positions: load every active job's type and age once and
+        # count in Python, instead of two COUNT queries per queued job
+        queued_times = {'transcription': [], 'summary': []}
+        processing_counts = {'transcription': 0, 'summary': 0}
+        if any(job.status == 'queued' for job in all_jobs):
+            active_jobs = db.session.query(
+                ProcessingJob.job_type, ProcessingJob.status, ProcessingJob.created_at
+            ).filter(
+                ProcessingJob.status.in_(['queued', 'processing']),
+                ProcessingJob.job_type.in_(TRANSCRIPTION_JOBS + SUMMARY_JOBS)
+            ).all()
+            for job_type, status, created_at in active_jobs:
+                family = 'summary' if job_type in SUMMARY_JOBS else 'transcription'
+                if status == 'processing':
+                    processing_counts[family] += 1
+                elif created_at is not None:
+                    queued_times[family].append(created_at)
+            for times in queued_times.values():
+                times.sort()
+
         job_details = []
         for job in all_jobs:
-            recording = db.session.get(Recording, job.recording_id)
+            recording = recordings_by_id.get(job.recording_id)
             recording_title = None
             if recording:
                 recording_title = recording.title or recording.original_filename or 'Untitled'
@@ -3477,20 +3659,12 @@ def get_job_queue_status():
             # Determine queue type
             queue_type = 'summary' if job.job_type in SUMMARY_JOBS else 'transcription'
 
-            # Calculate position if queued
+            # Calculate position if queued: queued jobs created earlier in the
+            # same queue, plus the ones being processed, plus this one
             position = None
             if job.status == 'queued':
-                job_types = SUMMARY_JOBS if job.job_type in SUMMARY_JOBS else TRANSCRIPTION_JOBS
-                ahead_in_queue = ProcessingJob.query.filter(
-                    ProcessingJob.status == 'queued',
-                    ProcessingJob.job_type.in_(job_types),
-                    ProcessingJob.created_at < job.created_at
-                ).count()
-                currently_processing = ProcessingJob.query.filter(
-                    ProcessingJob.status == 'processing',
-                    ProcessingJob.job_type.in_(job_types)
-                ).count()
-                position = ahead_in_queue + currently_processing + 1
+                ahead_in_queue = bisect_left(queued_times[queue_type], job.created_at) if job.created_at else 0
+                position = ahead_in_queue + processing_counts[queue_type] + 1
 
             job_details.append({
                 'id': job.id,
@@ -3688,15 +3862,14 @@ def get_audio(recording_id):
             return jsonify({'error': 'Audio file missing from server'}), 404
 
         if download:
-            return send_file(
+            return send_audio_file(
                 delivery.local_path,
                 as_attachment=True,
                 download_name=download_name,
                 mimetype=recording.mime_type,
-                conditional=True,
             )
 
-        return send_file(delivery.local_path, mimetype=recording.mime_type, conditional=True)
+        return send_audio_file(delivery.local_path, mimetype=recording.mime_type)
     except Exception as e:
         current_app.logger.error(f"Error serving audio for recording {recording_id}: {e}", exc_info=True)
         return jsonify({'error': 'An unexpected error occurred.'}), 500
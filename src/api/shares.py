@@ -10,13 +10,14 @@ This blueprint handles:
 import os
 import re
 import json
-from flask import Blueprint, render_template, request, redirect, url_for, jsonify, send_file, current_app
+from flask import Blueprint, render_template, request, redirect, url_for, jsonify, current_app
 from flask_login import login_required, current_user
 from werkzeug.exceptions import HTTPException
 
 from src.database import db
 from src.models import Recording, Share, InternalShare, SharedRecordingState, User, TranscriptChunk, ShareAuditLog
 from src.utils import md_to_html
+from src.utils.file_delivery import send_audio_file
 from src.services.storage import get_storage_service
 
 # Configuration from environment
@@ -170,7 +171,7 @@ def get_shared_audio(public_id):
         if not delivery.local_path or not os.path.exists(delivery.local_path):
             current_app.logger.error(f"Audio file missing from server: {recording.audio_path}")
             return jsonify({'error': 'Audio file missing from server'}), 404
-        return send_file(delivery.local_path, mimetype=(recording.mime_type or delivery.mimetype), conditional=True)
+        return send_audio_file(delivery.local_path, mimetype=(recording.mime_type or delivery.mimetype))
     except HTTPException:
         # Let first_or_404() (and any other HTTP error) keep its real status —
         # an unknown public_id must stay a 404, not be masked as a 500.
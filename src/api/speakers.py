@@ -285,14 +285,10 @@ def get_speaker_suggestions(recording_id):
             return jsonify({'error': 'You do not have permission to access this recording'}), 403
 
         # Get speaker embeddings from recording
-        if not recording.speaker_embeddings:
+        embeddings_data = recording.get_speaker_embeddings()
+        if not embeddings_data:
             return jsonify({'suggestions': {}, 'message': 'No speaker embeddings available'}), 200
 
-        try:
-            embeddings_data = json.loads(recording.speaker_embeddings) if isinstance(recording.speaker_embeddings, str) else recording.speaker_embeddings
-        except (json.JSONDecodeError, TypeError):
-            return jsonify({'error': 'Invalid speaker embeddings data'}), 500
-
         # Similarity floor for showing a voice-match suggestion. Default
         # 60% (was 70%). Rationale: when auto-labelling is on, confident
         # matches are already applied automatically, so the suggestion pill
@@ -306,7 +302,7 @@ def get_speaker_suggestions(recording_id):
         # Find matches for each speaker
         suggestions = {}
         for speaker_label, embedding in embeddings_data.items():
-            if embedding and len(embedding) == 256:  # Validate embedding dimension
+            if len(embedding) == 256:  # Validate embedding dimension
                 matches = find_matching_speakers(embedding, current_user.id, threshold)
                 suggestions[speaker_label] = matches
             else:
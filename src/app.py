@@ -1,7 +1,7 @@
 # Speakr - Audio Transcription and Summarization App
 import os
 import sys
-from flask import Flask, render_template, request, jsonify, send_file, redirect, url_for, flash, Response, make_response
+from flask import Flask, render_template, request, jsonify, send_file, redirect, url_for, flash, Response, make_response, g, has_request_context
 from urllib.parse import urlparse, urljoin, quote
 from email.utils import encode_rfc2231
 from markupsafe import Markup
@@ -43,6 +43,7 @@ import logging
 import secrets
 import time
 from src.audio_chunking import AudioChunkingService, ChunkProcessingError, ChunkingNotSupportedError
+from src.utils.fast_json import FastJSONProvider
 
 # Optional imports for embedding functionality
 try:
@@ -189,6 +190,10 @@ def has_recording_access(recording, user, require_edit=False, require_reshare=Fa
     """
     Check if a user has access to a recording.
 
+    Within a request the answer is memoized per (recording, user, level), so
+    handlers and the helpers they call can re-check without repeating the
+    share and group-admin queries.
+
     Args:
         recording: Recording object to check access for
         user: User object (typically current_user)
@@ -198,6 +203,18 @@ def has_recording_access(recording, user, require_edit=False, require_reshare=Fa
     Returns:
         Boolean indicating if user has the required access level
     """
+    cache = g.get('recording_access_cache') if has_request_context() else None
+    if cache is None or recording.id is None:
+        return _check_recording_access(recording, user, require_edit, require_reshare)
+
+    key = (recording.id, user.id, require_edit, require_reshare)
+    if key not in cache:
+        cache[key] = _check_recording_access(recording, user, require_edit, require_reshare)
+    return cache[key]
+
+
+def _check_recording_access(recording, user, require_edit, require_reshare):
+    """Uncached body of has_recording_access."""
     # Owner always has full access
     if recording.user_id == user.id:
         return True
@@ -246,7 +263,53 @@ def has_recording_access(recording, user, require_edit=False, require_reshare=Fa
     return True
 
 
-def get_user_recording_status(recording, user):
+def get_editable_recording_ids(recordings, user, share_map):
+    """
+    Resolve has_recording_access(..., require_edit=True) for a page of recordings.
+
+    Same rules as the per-recording check, but the group-admin lookup runs as
+    one query for every share that does not grant edit by itself.
+
+    Args:
+        recordings: Recording objects on the page
+        user: User object (typically current_user)
+        share_map: {recording_id: InternalShare} of the user's shares for the page
+
+    Returns:
+        Set of recording ids the user may edit
+    """
+    editable_ids = {r.id for r in recordings if r.user_id == user.id}
+    if not ENABLE_INTERNAL_SHARING:
+        return editable_ids
+
+    needs_admin_check = []
+    for recording in recordings:
+        share = share_map.get(recording.id)
+        if recording.user_id == user.id or not share:
+            continue
+        if share.can_edit:
+            editable_ids.add(recording.id)
+        else:
+            needs_admin_check.append(recording.id)
+
+    if needs_admin_check:
+        admin_rows = db.session.query(RecordingTag.recording_id).join(
+            Tag, RecordingTag.tag_id == Tag.id
+        ).join(
+            GroupMembership, GroupMembership.group_id == Tag.group_id
+        ).filter(
+            RecordingTag.recording_id.in_(needs_admin_check),
+            GroupMembership.user_id == user.id,
+            GroupMembership.role == 'admin',
+            Tag.group_id.isnot(None),
+            db.or_(Tag.auto_share_on_apply == True, Tag.share_with_group_lead == True)
+        ).distinct().all()
+        editable_ids.update(row[0] for row in admin_rows)
+
+    return editable_ids
+
+
+def get_user_recording_status(recording, user, state_map=None):
     """
     Get the inbox and highlighted status for a recording from a user's perspective.
 
@@ -256,6 +319,8 @@ def get_user_recording_status(recording, user):
     Args:
         recording: Recording object
         user: User object (typically current_user)
+        state_map: optional {recording_id: SharedRecordingState} of the user's
+            states, pre-loaded by list views to avoid an N+1 query
 
     Returns:
         Tuple of (is_inbox, is_highlighted)
@@ -265,10 +330,13 @@ def get_user_recording_status(recording, user):
         return (recording.is_inbox, recording.is_highlighted)
 
     # Shared recipient uses SharedRecordingState
-    state = SharedRecordingState.query.filter_by(
-        recording_id=recording.id,
-        user_id=user.id
-    ).first()
+    if state_map is not None:
+        state = state_map.get(recording.id)
+    else:
+        state = SharedRecordingState.query.filter_by(
+            recording_id=recording.id,
+            user_id=user.id
+        ).first()
 
     if state:
         return (state.is_inbox, state.is_highlighted)
@@ -352,6 +420,8 @@ def enrich_recording_dict_with_user_status(recording_dict, recording, user):
 app = Flask(__name__, 
             template_folder='../templates',
             static_folder='../static')
+# Render jsonify() responses with orjson when it is installed
+app.json = FastJSONProvider(app)
 # Use environment variables or default paths for Docker compatibility
 app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('SQLALCHEMY_DATABASE_URI', 'sqlite:////data/instance/transcriptions.db')
 app.config['UPLOAD_FOLDER'] = os.environ.get('UPLOAD_FOLDER', '/data/uploads')
@@ -369,6 +439,11 @@ if 'sqlite' in app.config['SQLALCHEMY_DATABASE_URI']:
 # Set a secret key for session management and CSRF protection
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'default-dev-key-change-in-production')
 
+# Let Apache (mod_xsendfile) or lighttpd send locally stored audio: responses
+# carry an X-Sendfile header instead of the file body. Only enable this when
+# the web server in front of Speakr is configured for it.
+app.config['AUDIO_X_SENDFILE'] = os.environ.get('AUDIO_X_SENDFILE', 'false').lower() == 'true'
+
 # Apply ProxyFix to handle headers from a reverse proxy (like Nginx or Caddy)
 # This is crucial for request.is_secure to work correctly behind an SSL-terminating proxy.
 trusted_proxy_hops = int(os.environ.get('TRUSTED_PROXY_HOPS', '1'))
@@ -488,6 +563,12 @@ csrf = CSRFProtect(app)
 app.config['WTF_CSRF_CHECK_DEFAULT'] = False
 
 
+@app.before_request
+def reset_recording_access_cache():
+    """Start each request with an empty has_recording_access memo."""
+    g.recording_access_cache = {}
+
+
 @app.before_request
 def csrf_token_aware_check():
     """Per-request CSRF check that allows valid header-only API tokens
@@ -626,7 +707,7 @@ client, chunking_service, version = initialize_config(app)
 init_auth_extensions(bcrypt, csrf, limiter)
 init_tokens_helpers(bcrypt, csrf, limiter)
 init_shares_helpers(has_recording_access)
-init_recordings_helpers(has_recording_access=has_recording_access, get_user_recording_status=get_user_recording_status, set_user_recording_status=set_user_recording_status, enrich_recording_dict_with_user_status=enrich_recording_dict_with_user_status, bcrypt=bcrypt, csrf=csrf, limiter=limiter, chunking_service=chunking_service)
+init_recordings_helpers(has_recording_access=has_recording_access, get_editable_recording_ids=get_editable_recording_ids, get_user_recording_status=get_user_recording_status, set_user_recording_status=set_user_recording_status, enrich_recording_dict_with_user_status=enrich_recording_dict_with_user_status, bcrypt=bcrypt, csrf=csrf, limiter=limiter, chunking_service=chunking_service)
 init_tags_helpers(has_recording_access=has_recording_access, bcrypt=bcrypt, csrf=csrf, limiter=limiter)
 init_folders_helpers(has_recording_access=has_recording_access, bcrypt=bcrypt, csrf=csrf, limiter=limiter)
 init_groups_helpers(has_recording_access=has_recording_access, bcrypt=bcrypt, csrf=csrf, limiter=limiter)
@@ -11,10 +11,12 @@ import os
 import re
 import json
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 from werkzeug.utils import secure_filename
 
+from src.utils.transcript_render import render_segments
+
 # Configuration from environment
 ENABLE_AUTO_EXPORT = os.environ.get('ENABLE_AUTO_EXPORT', 'false').lower() == 'true'
 AUTO_EXPORT_DIR = os.environ.get('AUTO_EXPORT_DIR', '/data/exports')
@@ -62,55 +64,9 @@ def format_transcription_with_template(transcription_text, user):
     else:
         template_format = template.template
 
-    # Helper functions for formatting
-    def format_time(seconds):
-        """Format seconds to HH:MM:SS"""
-        if seconds is None:
-            return "00:00:00"
-        td = timedelta(seconds=seconds)
-        hours = int(td.total_seconds() // 3600)
-        minutes = int((td.total_seconds() % 3600) // 60)
-        secs = int(td.total_seconds() % 60)
-        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
-
-    def format_srt_time(seconds):
-        """Format seconds to SRT format HH:MM:SS,mmm"""
-        if seconds is None:
-            return "00:00:00,000"
-        td = timedelta(seconds=seconds)
-        hours = int(td.total_seconds() // 3600)
-        minutes = int((td.total_seconds() % 3600) // 60)
-        secs = int(td.total_seconds() % 60)
-        millis = int((td.total_seconds() % 1) * 1000)
-        return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
-
-    # Generate formatted transcript
-    output_lines = []
-    for index, segment in enumerate(transcription_data, 1):
-        line = template_format
-
-        # Replace variables
-        replacements = {
-            '{{index}}': str(index),
-            '{{speaker}}': segment.get('speaker', 'Unknown'),
-            '{{text}}': segment.get('sentence', ''),
-            '{{start_time}}': format_time(segment.get('start_time')),
-            '{{end_time}}': format_time(segment.get('end_time')),
-        }
-
-        for key, value in replacements.items():
-            line = line.replace(key, value)
-
-        # Handle filters
-        # Upper case filter
-        line = re.sub(r'{{(.*?)\|upper}}', lambda m: replacements.get('{{' + m.group(1) + '}}', '').upper(), line)
-        # SRT time filter
-        line = re.sub(r'{{start_time\|srt}}', format_srt_time(segment.get('start_time')), line)
-        line = re.sub(r'{{end_time\|srt}}', format_srt_time(segment.get('end_time')), line)
-
-        output_lines.append(line)
-
-    return '\n'.join(output_lines)
+    # Same renderer as the UI download and the summarizer input, so every
+    # path produces identical timestamps
+    return render_segments(transcription_data, template_format)
 
 
 def get_export_directory(user):
@@ -16,7 +16,7 @@ from sqlalchemy import text, inspect
 from src.database import db
 from src.models import Recording, TranscriptChunk, SystemSetting, User
 from src.services.embeddings import process_recording_chunks
-from src.utils import add_column_if_not_exists, migrate_column_type, create_index_if_not_exists
+from src.utils import add_column_if_not_exists, migrate_column_type, create_index_if_not_exists, index_exists, normalize_sqlite_datetimes, delete_duplicate_rows
 
 # Configuration
 ENABLE_INQUIRE_MODE = os.environ.get('ENABLE_INQUIRE_MODE', 'false').lower() == 'true'
@@ -217,6 +217,11 @@ def initialize_database(app):
         # Add speaker embeddings column for storing voice embeddings from diarization
         if add_column_if_not_exists(engine, 'recording', 'speaker_embeddings', 'JSON'):
             app.logger.info("Added speaker_embeddings column to recording table")
+        # Packed float32 storage for speaker embeddings (one row per speaker label)
+        if add_column_if_not_exists(engine, 'recording', 'speaker_embeddings_blob', 'BLOB'):
+            app.logger.info("Added speaker_embeddings_blob column to recording table")
+        if add_column_if_not_exists(engine, 'recording', 'speaker_embeddings_labels', 'JSON'):
+            app.logger.info("Added speaker_embeddings_labels column to recording table")
 
         # Per-recording prompt-template variables (e.g. {"agenda": "...", "attendees": "..."})
         if add_column_if_not_exists(engine, 'recording', 'prompt_variables', 'JSON'):
@@ -528,7 +533,7 @@ def initialize_database(app):
                             # SQLite: Add time component to date-only values
                             conn.execute(text("""
                                 UPDATE recording
-                                SET meeting_date = datetime(date(meeting_date) || ' 12:00:00')
+                                SET meeting_date = date(meeting_date) || ' 12:00:00.000000'
                                 WHERE meeting_date IS NOT NULL
                                 AND meeting_date NOT LIKE '%:%'
                             """))
@@ -583,15 +588,39 @@ def initialize_database(app):
             app.logger.warning(f"Error during meeting_date migration: {e}")
             app.logger.warning("New recordings will work correctly, but existing dates may need manual migration")
 
+        # SQLite stores DATETIME as text; rows written by older raw-SQL
+        # migrations lack the microseconds SQLAlchemy binds, so they compare
+        # wrongly against the recordings list's keyset cursor
+        try:
+            normalized = normalize_sqlite_datetimes(engine, 'recording', ['meeting_date', 'created_at'])
+            if normalized:
+                app.logger.info(f"Normalized {normalized} recording dates to SQLAlchemy's datetime format")
+        except Exception as e:
+            app.logger.warning(f"Could not normalize recording dates: {e}")
+
+        # Migrate naming_template.regex_patterns from serialized TEXT to JSONB (PostgreSQL only).
+        # SQLite stores the JSON type as text, so existing rows are read back unchanged there.
+        try:
+            if engine.name == 'postgresql':
+                inspector = inspect(engine)
+                if 'naming_template' in inspector.get_table_names():
+                    columns_info = {col['name']: col for col in inspector.get_columns('naming_template')}
+                    if 'regex_patterns' in columns_info:
+                        col_type = str(columns_info['regex_patterns']['type']).upper()
+                        if 'JSON' not in col_type:
+                            if migrate_column_type(engine, 'naming_template', 'regex_patterns', 'JSONB',
+                                                   'NULLIF(regex_patterns, \'\')::jsonb'):
+                                app.logger.info("Migrated naming_template.regex_patterns to JSONB")
+        except Exception as e:
+            app.logger.warning(f"Error during regex_patterns JSONB migration: {e}")
+
         # Add index on TranscriptChunk.speaker_name for performance
         # This improves speaker rename operations which update all chunks
         try:
             inspector = inspect(engine)
             if 'transcript_chunk' in inspector.get_table_names():
-                existing_indexes = [idx['name'] for idx in inspector.get_indexes('transcript_chunk')]
-
                 # Create composite index on (user_id, speaker_name) if it doesn't exist
-                if 'idx_user_speaker_name' not in existing_indexes:
+                if not index_exists(engine, 'transcript_chunk', 'idx_user_speaker_name'):
                     with engine.connect() as conn:
                         conn.execute(text(
                             'CREATE INDEX IF NOT EXISTS idx_user_speaker_name ON transcript_chunk (user_id, speaker_name)'
@@ -600,7 +629,7 @@ def initialize_database(app):
                         app.logger.info("Created index idx_user_speaker_name on transcript_chunk (user_id, speaker_name) for speaker rename performance")
 
                 # Create single-column index on speaker_name if it doesn't exist
-                if 'ix_transcript_chunk_speaker_name' not in existing_indexes:
+                if not index_exists(engine, 'transcript_chunk', 'ix_transcript_chunk_speaker_name'):
                     with engine.connect() as conn:
                         conn.execute(text(
                             'CREATE INDEX IF NOT EXISTS ix_transcript_chunk_speaker_name ON transcript_chunk (speaker_name)'
@@ -626,6 +655,17 @@ def initialize_database(app):
         except Exception as e:
             app.logger.warning(f"Could not create index on recording (user_id, file_hash): {e}")
 
+        # Expression index backing the recordings list sorted by meeting date:
+        # ORDER BY COALESCE(meeting_date, created_at) DESC, created_at DESC,
+        # scoped to the owner. Lets the planner satisfy ORDER BY + LIMIT from
+        # the index instead of sorting every matching row.
+        try:
+            if create_index_if_not_exists(engine, 'ix_recording_user_sortable', 'recording',
+                                          'user_id, (COALESCE(meeting_date, created_at)) DESC, created_at DESC'):
+                app.logger.info("Created index ix_recording_user_sortable on recording (user_id, COALESCE(meeting_date, created_at), created_at)")
+        except Exception as e:
+            app.logger.warning(f"Could not create index ix_recording_user_sortable on recording: {e}")
+
         # Composite index that backs the webhook dispatcher's main query:
         # `status IN ('pending','failed') AND next_retry_at <= now`.
         # Without this the dispatcher scans the full webhook_delivery
@@ -636,6 +676,19 @@ def initialize_database(app):
         except Exception as e:
             app.logger.warning(f"Could not create composite index on webhook_delivery: {e}")
 
+        # Composite unique index for push subscription lookups by (user_id, endpoint).
+        # The old SELECT-then-INSERT subscribe() could store the same pair twice on a
+        # double subscribe; keep the newest row of each pair so the index can be built.
+        try:
+            if not index_exists(engine, 'push_subscriptions', 'ix_pushsub_user_endpoint'):
+                removed = delete_duplicate_rows(engine, 'push_subscriptions', ['user_id', 'endpoint'])
+                if removed:
+                    app.logger.info(f"Removed {removed} duplicate push subscription(s) before creating ix_pushsub_user_endpoint")
+            if create_index_if_not_exists(engine, 'ix_pushsub_user_endpoint', 'push_subscriptions', 'user_id, endpoint', unique=True):
+                app.logger.info("Created unique index ix_pushsub_user_endpoint on push_subscriptions (user_id, endpoint)")
+        except Exception as e:
+            app.logger.warning(f"Could not create unique index on push_subscriptions (user_id, endpoint): {e}")
+
         # Add folder_id column to recording table for folders feature
         if add_column_if_not_exists(engine, 'recording', 'folder_id', 'INTEGER'):
             app.logger.info("Added folder_id column to recording table")
@@ -652,6 +705,55 @@ def initialize_database(app):
         except Exception as e:
             app.logger.warning(f"Could not create index on recording.folder_id: {e}")
 
+        # Substring index for transcript search. The list endpoint matches
+        # transcription with LIKE '%text%', which no B-tree can serve. SQLite
+        # gets an external-content FTS5 table with the trigram tokenizer (it
+        # answers the same LIKE patterns from the index), kept in sync by
+        # triggers; PostgreSQL gets a pg_trgm GIN index that ILIKE uses as is.
+        app.config['TRANSCRIPTION_FTS_ENABLED'] = False
+        try:
+            if engine.name == 'sqlite':
+                with engine.connect() as conn:
+                    exists = conn.execute(text(
+                        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'recording_fts'"
+                    )).first()
+                    if not exists:
+                        conn.execute(text(
+                            "CREATE VIRTUAL TABLE recording_fts USING fts5("
+                            "transcription, content='recording', content_rowid='id', tokenize='trigram')"
+                        ))
+                        conn.execute(text(
+                            "CREATE TRIGGER IF NOT EXISTS recording_fts_ai AFTER INSERT ON recording BEGIN "
+                            "INSERT INTO recording_fts(rowid, transcription) VALUES (new.id, new.transcription); END"
+                        ))
+                        conn.execute(text(
+                            "CREATE TRIGGER IF NOT EXISTS recording_fts_ad AFTER DELETE ON recording BEGIN "
+                            "INSERT INTO recording_fts(recording_fts, rowid, transcription) "
+                            "VALUES ('delete', old.id, old.transcription); END"
+                        ))
+                        conn.execute(text(
+                            "CREATE TRIGGER IF NOT EXISTS recording_fts_au AFTER UPDATE OF transcription ON recording BEGIN "
+                            "INSERT INTO recording_fts(recording_fts, rowid, transcription) "
+                            "VALUES ('delete', old.id, old.transcription); "
+                            "INSERT INTO recording_fts(rowid, transcription) VALUES (new.id, new.transcription); END"
+                        ))
+                        conn.execute(text("INSERT INTO recording_fts(recording_fts) VALUES ('rebuild')"))
+                        conn.commit()
+                        app.logger.info("Created trigram full-text index recording_fts for transcript search")
+                app.config['TRANSCRIPTION_FTS_ENABLED'] = True
+            elif engine.name == 'postgresql':
+                if not index_exists(engine, 'recording', 'ix_recording_transcription_trgm'):
+                    with engine.connect() as conn:
+                        conn.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+                        conn.execute(text(
+                            'CREATE INDEX IF NOT EXISTS ix_recording_transcription_trgm '
+                            'ON recording USING gin (transcription gin_trgm_ops)'
+                        ))
+                        conn.commit()
+                        app.logger.info("Created pg_trgm index ix_recording_transcription_trgm on recording.transcription")
+        except Exception as e:
+            app.logger.warning(f"Could not create transcript search index: {e}")
+
         # Initialize default system settings
         if not SystemSetting.query.filter_by(key='transcript_length_limit').first():
             SystemSetting.set_setting(
@@ -10,6 +10,7 @@ import json
 import re
 import os
 from datetime import datetime
+from sqlalchemy.dialects.postgresql import JSONB
 from src.database import db
 
 
@@ -21,7 +22,7 @@ class NamingTemplate(db.Model):
     name = db.Column(db.String(100), nullable=False)
     template = db.Column(db.Text, nullable=False)  # e.g., "{{phone}} - {{date}} {{ai_title}}"
     description = db.Column(db.String(500), nullable=True)
-    regex_patterns = db.Column(db.Text, nullable=True)  # JSON: {"phone": "\\d{10}", "caller": "^([^-]+)"}
+    regex_patterns = db.Column(db.JSON().with_variant(JSONB(), 'postgresql'), nullable=True)  # {"phone": "\\d{10}", "caller": "^([^-]+)"}
     is_default = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -36,20 +37,23 @@ class NamingTemplate(db.Model):
             'name': self.name,
             'template': self.template,
             'description': self.description,
-            'regex_patterns': json.loads(self.regex_patterns) if self.regex_patterns else {},
+            'regex_patterns': self.get_regex_patterns(),
             'is_default': self.is_default,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
     def get_regex_patterns(self):
-        """Parse and return regex patterns as dictionary."""
+        """Return regex patterns as dictionary."""
         if not self.regex_patterns:
             return {}
-        try:
-            return json.loads(self.regex_patterns)
-        except json.JSONDecodeError:
-            return {}
+        # Rows written before the JSON column migration hold serialized text
+        if isinstance(self.regex_patterns, str):
+            try:
+                return json.loads(self.regex_patterns)
+            except json.JSONDecodeError:
+                return {}
+        return self.regex_patterns
 
     def needs_ai_title(self):
         """Check if template requires AI-generated title."""
@@ -27,6 +27,12 @@ class PushSubscription(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Backs the (user_id, endpoint) lookups in subscribe/unsubscribe and the
+    # user_id scan in send_push_notification; also rejects duplicate subscribes
+    __table_args__ = (
+        db.Index('ix_pushsub_user_endpoint', 'user_id', 'endpoint', unique=True),
+    )
+
     def __repr__(self):
         return f'<PushSubscription {self.id} user={self.user_id}>'
 
@@ -7,9 +7,10 @@ This module defines models for audio recordings and their chunked transcriptions
 import logging
 import os
 from datetime import datetime
-from sqlalchemy import func
+import numpy as np
+from sqlalchemy import func, select
 from src.database import db
-from src.utils import md_to_html
+from src.utils import fast_json, md_to_html
 
 logger = logging.getLogger(__name__)
 
@@ -60,7 +61,14 @@ class Recording(db.Model):
     audio_deleted_at = db.Column(db.DateTime, nullable=True)  # When audio file was deleted (null = not deleted)
     deletion_exempt = db.Column(db.Boolean, default=False)  # Manual exemption from auto-deletion
 
-    # Speaker embeddings from diarization (JSON dict mapping speaker IDs to 256-dimensional vectors)
+    # Speaker embeddings from diarization, packed as one contiguous int8 matrix
+    # (one row per speaker) plus the row labels and per-row scales. Use
+    # set_speaker_embeddings() / get_speaker_embeddings() rather than the
+    # columns directly.
+    speaker_embeddings_blob = db.Column(db.LargeBinary, nullable=True)
+    speaker_embeddings_labels = db.Column(db.JSON, nullable=True)
+    # Legacy storage (JSON dict mapping speaker IDs to 256-dimensional vectors);
+    # only read for recordings transcribed before the packed columns existed
     speaker_embeddings = db.Column(db.JSON, nullable=True)
 
     # Per-recording prompt-template variables (e.g. {"agenda": "...", "attendees": "..."}).
@@ -86,7 +94,15 @@ class Recording(db.Model):
         """Get tags ordered by the order they were added to this recording."""
         return [assoc.tag for assoc in sorted(self.tag_associations, key=lambda x: x.order)]
 
-    def get_visible_tags(self, viewer_user):
+    @staticmethod
+    def get_viewer_group_ids(viewer_user):
+        """Set of group ids the viewer is a member of, in one query."""
+        from src.models.organization import GroupMembership
+        return set(db.session.execute(
+            select(GroupMembership.group_id).where(GroupMembership.user_id == viewer_user.id)
+        ).scalars())
+
+    def get_visible_tags(self, viewer_user, viewer_group_ids=None):
         """
         Get tags that are visible to a specific user viewing this recording.
 
@@ -99,6 +115,8 @@ class Recording(db.Model):
 
         Args:
             viewer_user: User object viewing the recording (or None for backward compatibility)
+            viewer_group_ids: optional output of ``get_viewer_group_ids`` so list
+                views resolve group-tag visibility without a query per row.
 
         Returns:
             List of Tag objects visible to the viewer
@@ -107,21 +125,18 @@ class Recording(db.Model):
         if viewer_user is None:
             return self.tags
 
-        if not self.tags:
+        tags = self.tags
+        if not tags:
             return []
 
-        # Import here to avoid circular dependencies
-        from src.models.organization import GroupMembership
+        if viewer_group_ids is None and any(tag.group_id for tag in tags):
+            viewer_group_ids = self.get_viewer_group_ids(viewer_user)
 
         visible_tags = []
-        for tag in self.tags:
+        for tag in tags:
             # Group tags: visible if viewer is a member of the group
             if tag.group_id:
-                membership = GroupMembership.query.filter_by(
-                    group_id=tag.group_id,
-                    user_id=viewer_user.id
-                ).first()
-                if membership:
+                if tag.group_id in viewer_group_ids:
                     visible_tags.append(tag)
             # Personal tags: visible only to tag creator
             else:
@@ -130,6 +145,96 @@ class Recording(db.Model):
 
         return visible_tags
 
+    @property
+    def transcription_parsed(self):
+        """
+        The transcription decoded from JSON, or None if empty or plain text.
+
+        The decoded value is cached against the exact transcription string it
+        came from, so repeated reads in one request (endpoint, speaker
+        matching, snippet extraction) parse it once, and any new value
+        assigned to ``transcription`` (or reloaded after a commit) is parsed
+        afresh. Callers that modify the returned segments must write them
+        back with ``set_transcription_data``.
+        """
+        text = self.transcription
+        cached = getattr(self, '_transcription_cache', None)
+        if cached is not None and cached[0] is text:
+            return cached[1]
+        try:
+            data = fast_json.loads(text) if text else None
+        except (ValueError, TypeError):
+            data = None
+        self._transcription_cache = (text, data)
+        return data
+
+    def set_transcription_data(self, data):
+        """Serialize ``data`` into ``transcription`` and keep it as the parsed value."""
+        self.transcription = fast_json.dumps(data)
+        self._transcription_cache = (self.transcription, data)
+
+    @property
+    def has_speaker_embeddings(self):
+        """Whether diarization stored any voice embeddings for this recording."""
+        return bool(self.speaker_embeddings_blob or self.speaker_embeddings)
+
+    def set_speaker_embeddings(self, embeddings):
+        """
+        Store diarization voice embeddings as a packed int8 matrix.
+
+        Each row is quantized symmetrically with its own scale
+        (max(|v|) / 127), which keeps cosine similarity against the
+        original vector above 0.999 at a quarter of the float32 size.
+
+        Args:
+            embeddings: dict mapping speaker labels to equal-length vectors,
+                or None/empty to clear them
+        """
+        self.speaker_embeddings = None
+        if not embeddings:
+            self.speaker_embeddings_blob = None
+            self.speaker_embeddings_labels = None
+            return
+        matrix = np.asarray(list(embeddings.values()), dtype=np.float32)
+        scales = np.abs(matrix).max(axis=1) / 127
+        scales[scales == 0] = 1.0
+        self.speaker_embeddings_labels = {'labels': list(embeddings), 'scales': scales.tolist()}
+        self.speaker_embeddings_blob = np.round(matrix / scales[:, None]).astype(np.int8).tobytes()
+
+    def get_speaker_embeddings(self):
+        """
+        Get diarization voice embeddings keyed by speaker label.
+
+        Packed recordings return rows of a single float32 matrix decoded in
+        one step (int8 rows times their scales). Legacy JSON values are
+        converted to float32 arrays; empty or malformed entries are skipped.
+
+        Returns:
+            dict: {speaker_label: numpy.ndarray}
+        """
+        if self.speaker_embeddings_blob:
+            packed = self.speaker_embeddings_labels or {}
+            labels = packed.get('labels') or []
+            if not labels:
+                return {}
+            quantized = np.frombuffer(self.speaker_embeddings_blob, dtype=np.int8).reshape(len(labels), -1)
+            scales = np.asarray(packed['scales'], dtype=np.float32)
+            return dict(zip(labels, quantized * scales[:, None]))
+
+        legacy = self.speaker_embeddings
+        if isinstance(legacy, str):
+            try:
+                legacy = fast_json.loads(legacy)
+            except (ValueError, TypeError):
+                return {}
+        if not isinstance(legacy, dict):
+            return {}
+        return {
+            label: np.asarray(vector, dtype=np.float32)
+            for label, vector in legacy.items()
+            if vector and isinstance(vector, list)
+        }
+
     def get_user_notes(self, user):
         """
         Get notes from user's perspective (owner or shared recipient).
@@ -204,17 +309,21 @@ class Recording(db.Model):
             return None
 
     @classmethod
-    def get_duplicate_info_map(cls, user_id):
+    def get_duplicate_info_map(cls, user_id, file_hashes=None):
         """Pre-compute duplicate-info groupings for one user in a single query.
 
         Returns a dict keyed by file_hash. Each value is the
         ``{'total_copies': N, 'copies': [...]}`` payload that
         ``get_duplicate_info`` returns. List endpoints pass this map
         into ``to_dict`` / ``to_list_dict`` to avoid the per-row query.
+        ``file_hashes`` optionally limits the map to those hashes (e.g.
+        the ones on a single page).
         """
+        query = cls.query.filter(cls.user_id == user_id, cls.file_hash != None)  # noqa: E711
+        if file_hashes is not None:
+            query = query.filter(cls.file_hash.in_(file_hashes))
         rows = (
-            cls.query
-            .filter(cls.user_id == user_id, cls.file_hash != None)  # noqa: E711
+            query
             .with_entities(cls.id, cls.title, cls.created_at, cls.file_hash)
             .order_by(cls.created_at)
             .all()
@@ -231,7 +340,7 @@ class Recording(db.Model):
                 'copies': [
                     {
                         'id': rid,
-                        'title': title,
+                        'title': title or f'#{rid}',
                         'created_at': created.isoformat() if created else None,
                     }
                     for (rid, title, created) in items
@@ -239,6 +348,50 @@ class Recording(db.Model):
             }
         return out
 
+    @classmethod
+    def get_share_counts_map(cls, recording_ids):
+        """Pre-compute (internal, public) share counts for many recordings.
+
+        Returns a dict keyed by recording id with ``(shared_with_count,
+        public_share_count)`` tuples; recordings without shares are
+        omitted. List endpoints pass this map into ``to_dict`` /
+        ``to_list_dict`` to avoid two COUNT queries per row.
+        """
+        from src.models.sharing import InternalShare, Share
+
+        if not recording_ids:
+            return {}
+        counts = {}
+        for index, model in enumerate((InternalShare, Share)):
+            rows = db.session.query(model.recording_id, func.count(model.id)).filter(
+                model.recording_id.in_(recording_ids)
+            ).group_by(model.recording_id).all()
+            for rid, n in rows:
+                pair = counts.setdefault(rid, [0, 0])
+                pair[index] = n
+        return {rid: tuple(pair) for rid, pair in counts.items()}
+
+    def _share_counts(self, share_counts_map):
+        """Use a pre-batched share-count map when provided, else count
+        this recording's internal and public shares directly."""
+        if share_counts_map is not None:
+            return share_counts_map.get(self.id, (0, 0))
+
+        # Import here to avoid circular dependencies
+        from src.models.sharing import InternalShare, Share
+
+        # Count internal shares for this recording
+        shared_with_count = db.session.query(func.count(InternalShare.id)).filter(
+            InternalShare.recording_id == self.id
+        ).scalar() or 0
+
+        # Count public shares (link shares) for this recording
+        public_share_count = db.session.query(func.count(Share.id)).filter(
+            Share.recording_id == self.id
+        ).scalar() or 0
+
+        return shared_with_count, public_share_count
+
     def get_duplicate_info(self):
         """Check if other recordings share the same file_hash for this user.
 
@@ -268,7 +421,7 @@ class Recording(db.Model):
             }
         return None
 
-    def _serialize_tags_and_folder(self, viewer_user, share_map=None):
+    def _serialize_tags_and_folder(self, viewer_user, share_map=None, viewer_group_ids=None):
         """Build (tags, folder, folder_id) for a viewer, applying #314 rules.
 
         For a recording the viewer does NOT own, only the tag/folder that GRANTED
@@ -279,8 +432,9 @@ class Recording(db.Model):
 
         share_map: optional {recording_id: InternalShare} to avoid an N+1 query
         in list views; falls back to a per-recording lookup when not provided.
+        viewer_group_ids: optional pre-loaded group ids, see ``get_visible_tags``.
         """
-        visible_tags = self.get_visible_tags(viewer_user)
+        visible_tags = self.get_visible_tags(viewer_user, viewer_group_ids)
         is_foreign = viewer_user is not None and self.user_id != viewer_user.id
 
         if not is_foreign:
@@ -311,7 +465,8 @@ class Recording(db.Model):
             return tags, folder, self.folder_id
         return tags, None, None
 
-    def to_list_dict(self, viewer_user=None, duplicate_info_map=None, share_map=None):
+    def to_list_dict(self, viewer_user=None, duplicate_info_map=None, share_map=None, share_counts_map=None,
+                     viewer_group_ids=None):
         """
         Lightweight dict for list views - excludes expensive HTML conversions.
 
@@ -319,21 +474,14 @@ class Recording(db.Model):
             viewer_user: User viewing the recording (for tag visibility filtering)
             share_map: optional {recording_id: InternalShare} for #314 share-reason
                 resolution without an N+1 query.
+            share_counts_map: optional output of ``get_share_counts_map`` so list
+                views skip the per-row share COUNT queries.
+            viewer_group_ids: optional output of ``get_viewer_group_ids`` for
+                tag visibility without a membership query per row.
         """
-        # Import here to avoid circular dependencies
-        from src.models.sharing import InternalShare, Share
+        shared_with_count, public_share_count = self._share_counts(share_counts_map)
 
-        # Count internal shares for this recording
-        shared_with_count = db.session.query(func.count(InternalShare.id)).filter(
-            InternalShare.recording_id == self.id
-        ).scalar() or 0
-
-        # Count public shares (link shares) for this recording
-        public_share_count = db.session.query(func.count(Share.id)).filter(
-            Share.recording_id == self.id
-        ).scalar() or 0
-
-        tags_ser, folder_ser, folder_id_ser = self._serialize_tags_and_folder(viewer_user, share_map)
+        tags_ser, folder_ser, folder_id_ser = self._serialize_tags_and_folder(viewer_user, share_map, viewer_group_ids)
 
         return {
             'id': self.id,
@@ -361,6 +509,61 @@ class Recording(db.Model):
             'keep_audio_only': self.keep_audio_only,
         }
 
+    @staticmethod
+    def list_loader_options():
+        """Eager-load options covering everything ``to_list_dict`` reads, so a
+        page of recordings serializes without per-row lazy loads."""
+        from sqlalchemy.orm import selectinload
+        from src.models.organization import Folder, RecordingTag, Tag
+        tag = selectinload(Recording.tag_associations).selectinload(RecordingTag.tag)
+        folder = selectinload(Recording.folder)
+        return (
+            tag.selectinload(Tag.group),
+            tag.selectinload(Tag.naming_template),
+            tag.selectinload(Tag.export_template),
+            tag.selectinload(Tag.recording_associations),
+            folder.selectinload(Folder.group),
+            folder.selectinload(Folder.naming_template),
+            folder.selectinload(Folder.export_template),
+            folder.selectinload(Folder.recordings),
+        )
+
+    @classmethod
+    def to_list_dicts(cls, recordings, viewer_user=None, share_map=None, viewer_group_ids=None):
+        """
+        ``to_list_dict`` for a page of recordings with the per-row lookups
+        batched: share counts in one GROUP BY per share table and duplicate
+        info in one query per distinct owner, limited to the page's hashes.
+
+        Args:
+            recordings: Recording objects, ideally loaded with ``list_loader_options``
+            viewer_user, share_map, viewer_group_ids: as for ``to_list_dict``
+
+        Returns:
+            List of dicts in the order of ``recordings``
+        """
+        share_counts_map = cls.get_share_counts_map([r.id for r in recordings])
+
+        hashes_by_owner = {}
+        for recording in recordings:
+            if recording.file_hash:
+                hashes_by_owner.setdefault(recording.user_id, set()).add(recording.file_hash)
+        dup_maps = {
+            owner_id: cls.get_duplicate_info_map(owner_id, file_hashes=hashes)
+            for owner_id, hashes in hashes_by_owner.items()
+        }
+
+        return [
+            recording.to_list_dict(
+                viewer_user=viewer_user,
+                duplicate_info_map=dup_maps.get(recording.user_id, {}),
+                share_map=share_map,
+                share_counts_map=share_counts_map,
+                viewer_group_ids=viewer_group_ids,
+            )
+            for recording in recordings
+        ]
+
     def _dup_from_map_or_query(self, duplicate_info_map):
         """Use a pre-batched duplicate-info map when provided, else fall
         back to the per-row query. The map is keyed by file_hash and is
@@ -381,7 +584,7 @@ class Recording(db.Model):
             return {'total_copies': entry['total_copies'], 'copies': copies}
         return self.get_duplicate_info()
 
-    def to_dict(self, include_html=True, viewer_user=None, duplicate_info_map=None, share_map=None):
+    def to_dict(self, include_html=True, viewer_user=None, duplicate_info_map=None, share_map=None, share_counts_map=None):
         """
         Full dict with optional HTML conversion for notes/summary.
 
@@ -390,19 +593,10 @@ class Recording(db.Model):
             viewer_user: User viewing the recording (for tag visibility filtering)
             share_map: optional {recording_id: InternalShare} for #314 share-reason
                 resolution without an N+1 query.
+            share_counts_map: optional output of ``get_share_counts_map`` so list
+                views skip the per-row share COUNT queries.
         """
-        # Import here to avoid circular dependencies
-        from src.models.sharing import InternalShare, Share
-
-        # Count internal shares for this recording
-        shared_with_count = db.session.query(func.count(InternalShare.id)).filter(
-            InternalShare.recording_id == self.id
-        ).scalar() or 0
-
-        # Count public shares (link shares) for this recording
-        public_share_count = db.session.query(func.count(Share.id)).filter(
-            Share.recording_id == self.id
-        ).scalar() or 0
+        shared_with_count, public_share_count = self._share_counts(share_counts_map)
 
         tags_ser, folder_ser, folder_id_ser = self._serialize_tags_and_folder(viewer_user, share_map)
 
@@ -4,8 +4,21 @@ Document processing and conversion services.
 
 import re
 from docx import Document
+from docx.oxml.ns import qn
 from docx.shared import Pt, RGBColor
 
+# rFonts attributes selecting Arial for Latin and East Asian text; set directly
+# on the element rather than through the Font proxy
+_UNICODE_RFONTS_ATTRS = tuple(qn(a) for a in ('w:ascii', 'w:hAnsi', 'w:eastAsia'))
+
+
+def apply_unicode_font(run):
+    """Switch a run to Arial, including the East Asian font slot, so non-Latin
+    scripts render in Word."""
+    rFonts = run._element.get_or_add_rPr().get_or_add_rFonts()
+    for attr in _UNICODE_RFONTS_ATTRS:
+        rFonts.set(attr, 'Arial')
+    return run
 
 
 def process_markdown_to_docx(doc, content):
@@ -32,18 +45,10 @@ def process_markdown_to_docx(doc, content):
 
     def ensure_unicode_font(run, text):
         """Ensure the run uses a font that supports the characters in the text."""
-        # Check if text contains non-ASCII characters
-        try:
-            text.encode('ascii')
-            # Text is pure ASCII, no special font needed
-        except UnicodeEncodeError:
-            # Text contains non-ASCII characters, use a font with better Unicode support
-            # Use Arial for broad compatibility - it has good Unicode support on most systems
-            run.font.name = 'Arial'
-            # Set the East Asian font for CJK (Chinese, Japanese, Korean) text
-            # This ensures proper rendering in Word
-            r = run._element
-            r.rPr.rFonts.set(qn('w:eastAsia'), 'Arial')
+        # Pure ASCII text needs no special font; anything else gets Arial,
+        # which has good Unicode coverage on most systems
+        if not text.isascii():
+            apply_unicode_font(run)
         return run
 
     def add_formatted_run(paragraph, text):
@@ -69,13 +74,9 @@ def process_markdown_to_docx(doc, content):
             run.font.name = 'Courier New'
             run.font.size = Pt(10)
             run.font.color.rgb = RGBColor(220, 20, 60)  # Crimson color for code
-            # Check if we need Unicode support for code
-            try:
-                text.encode('ascii')
-            except UnicodeEncodeError:
-                # Use Consolas as fallback for better Unicode support in monospace
-                r = run._element
-                r.rPr.rFonts.set(qn('w:eastAsia'), 'Consolas')
+            # Use Consolas as fallback for better Unicode support in monospace
+            if not text.isascii():
+                run._element.rPr.rFonts.set(qn('w:eastAsia'), 'Consolas')
             return run
 
         def add_link_run(para, text, url):
@@ -182,12 +183,9 @@ def process_markdown_to_docx(doc, content):
                     run.font.name = 'Courier New'
                     run.font.size = Pt(10)
                     run.font.color.rgb = RGBColor(64, 64, 64)
-                    # Check if we need Unicode support for code blocks
-                    try:
-                        code_text.encode('ascii')
-                    except UnicodeEncodeError:
-                        r = run._element
-                        r.rPr.rFonts.set(qn('w:eastAsia'), 'Consolas')
+                    # Use Consolas for non-ASCII code for better Unicode support
+                    if not code_text.isascii():
+                        run._element.rPr.rFonts.set(qn('w:eastAsia'), 'Consolas')
             i += 1
             continue
 
@@ -7,6 +7,7 @@ import time
 import random
 import numpy as np
 from flask import current_app
+from sqlalchemy import select
 from sqlalchemy.orm import joinedload
 
 try:
@@ -337,20 +338,16 @@ def get_accessible_recording_ids(user_id):
     Returns:
         list: List of recording IDs the user can access
     """
-    accessible_ids = set()
-
-    # 1. User's own recordings
-    own_recordings = db.session.query(Recording.id).filter_by(user_id=user_id).all()
-    accessible_ids.update([r.id for r in own_recordings])
-
-    # 2. Internally shared recordings
+    # Own and internally shared recordings in one round-trip; UNION dedupes
+    stmt = select(Recording.id.label('id')).where(Recording.user_id == user_id)
     if ENABLE_INTERNAL_SHARING:
-        shared_recordings = db.session.query(InternalShare.recording_id).filter_by(
-            shared_with_user_id=user_id
-        ).all()
-        accessible_ids.update([r.recording_id for r in shared_recordings])
+        stmt = stmt.union(
+            select(InternalShare.recording_id.label('id')).where(
+                InternalShare.shared_with_user_id == user_id
+            )
+        )
 
-    return list(accessible_ids)
+    return list(db.session.execute(stmt).scalars())
 
 
 
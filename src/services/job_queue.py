@@ -16,7 +16,7 @@ import time
 import logging
 from datetime import datetime
 from typing import Optional, Dict, Any, List
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +35,9 @@ POLL_INTERVAL = 1.0  # seconds between checking for new jobs
 # get_position_in_queue places it — no separate worker pool or queue needed.
 # Every consumer routes via "SUMMARY_JOBS if ... else TRANSCRIPTION_JOBS", so
 # membership in this list is the single source of truth for the whole pipeline.
-TRANSCRIPTION_JOBS = ['transcribe', 'reprocess_transcription', 'stitch']
+# 'prepare_audio' (upload conversion moved off the request thread) sits here
+# for the same reason and hands off to 'transcribe' the same way.
+TRANSCRIPTION_JOBS = ['transcribe', 'reprocess_transcription', 'stitch', 'prepare_audio']
 SUMMARY_JOBS = ['summarize', 'reprocess_summary']
 
 
@@ -344,6 +346,8 @@ class FairJobQueue:
                     self._run_reprocess_summary(job, recording, params)
                 elif job_type == 'stitch':
                     self._run_stitch(job, recording, params)
+                elif job_type == 'prepare_audio':
+                    self._run_prepare_audio(job, recording, params)
                 else:
                     raise ValueError(f"Unknown job type: {job_type}")
 
@@ -423,10 +427,11 @@ class FairJobQueue:
         from src.services.storage import get_storage_service
 
         storage = get_storage_service()
-        audio_path = (recording.audio_path or '').strip()
-        if not audio_path:
+        if not (recording.audio_path or '').strip():
             logger.error(f"Cannot run transcription job for recording {recording.id}: missing audio_path")
             raise ValueError(f"Missing audio_path for recording {recording.id}")
+
+        audio_path = recording.audio_path.strip()
         with storage.materialize(audio_path) as materialized:
             filepath = materialized.local_path
             filename_for_asr = recording.original_filename or os.path.basename(filepath)
@@ -562,13 +567,48 @@ class FairJobQueue:
             metadata=metadata,
         )
 
+    def _run_prepare_audio(self, job, recording, params):
+        """Prepare a new upload's audio, then queue its transcription.
+
+        upload_file stores the file as received and queues this job instead
+        of running ffmpeg/ffprobe on the request thread. The conversion runs
+        here (prepare_uploaded_audio, which also caches the duration) and a
+        follow-up ``transcribe`` job is enqueued with the remaining params,
+        the same hand-off ``stitch`` uses. On failure the recording is
+        flipped to FAILED by _process_job and no transcribe job follows.
+        """
+        from src.tasks.processing import prepare_uploaded_audio
+        from src.services.storage import get_storage_service
+
+        if not (recording.audio_path or '').strip():
+            logger.error(f"Cannot run prepare_audio job for recording {recording.id}: missing audio_path")
+            raise ValueError(f"Missing audio_path for recording {recording.id}")
+
+        transcribe_params = dict(params or {})
+        convert_upload = transcribe_params.pop('convert_upload', None) or {}
+        prepare_uploaded_audio(
+            recording,
+            get_storage_service(),
+            is_asr_endpoint=convert_upload.get('asr_endpoint', False),
+            size_limit_bytes=convert_upload.get('size_limit_bytes'),
+        )
+
+        self.enqueue(
+            user_id=recording.user_id,
+            recording_id=recording.id,
+            job_type='transcribe',
+            params=transcribe_params,
+            is_new_upload=job.is_new_upload,
+        )
+
     def enqueue(
         self,
         user_id: int,
         recording_id: int,
         job_type: str,
         params: Dict[str, Any] = None,
-        is_new_upload: bool = False
+        is_new_upload: bool = False,
+        commit: bool = True
     ) -> int:
         """
         Add a job to the database queue.
@@ -576,14 +616,20 @@ class FairJobQueue:
         Args:
             user_id: ID of the user who owns this job
             recording_id: ID of the recording to process
-            job_type: Type of job (transcribe, summarize, reprocess_transcription, reprocess_summary)
+            job_type: Type of job (transcribe, summarize, reprocess_transcription,
+                reprocess_summary, stitch, prepare_audio)
             params: Optional parameters for the job
             is_new_upload: True if this is a new file upload (for cleanup on failure)
+            commit: If False, only flush in the caller's app context and
+                session; the caller commits the job together with its own
+                changes (workers cannot see it until then)
 
         Returns:
             The created job ID
         """
-        with self._app_context():
+        # A fresh app context would mean a fresh session, so an uncommitted
+        # job has to stay in the caller's
+        with self._app_context() if commit else nullcontext():
             from src.database import db
             from src.models import ProcessingJob, Recording
 
@@ -617,7 +663,10 @@ class FairJobQueue:
                 else:
                     recording.status = 'QUEUED'
 
-            db.session.commit()
+            if commit:
+                db.session.commit()
+            else:
+                db.session.flush()
 
             # Auto-start workers if not running
             if not self._running:
@@ -763,6 +812,9 @@ class FairJobQueue:
         # mapping: those fire from the real transcribe job after a successful
         # stitch.
         'stitch': 'recording.transcription.failed',
+        # Same reasoning as stitch: a failed prepare_audio never reaches its
+        # transcribe job.
+        'prepare_audio': 'recording.transcription.failed',
     }
 
     # No `summary.started` in the vocabulary today; if one is added later,
@@ -4,16 +4,31 @@ LLM API integration services (OpenAI/OpenRouter).
 
 import os
 import re
-import json
 import time
 import logging
 import httpx
 from openai import OpenAI, APITimeoutError
 
+from src.utils.fast_json import dumps_bytes
+
 # Use standard logging instead of current_app.logger for context independence
 logger = logging.getLogger(__name__)
 
 
+def sse_frame(payload):
+    """Encode a payload as a UTF-8 SSE data frame."""
+    return b'data: ' + dumps_bytes(payload) + b'\n\n'
+
+
+def sse_error_frame(message):
+    """Build an SSE error frame for the given message."""
+    return sse_frame({'error': str(message)})
+
+
+# Pre-encoded SSE frame shared by the streaming chat endpoints
+SSE_END_OF_STREAM_FRAME = sse_frame({'end_of_stream': True})
+
+
 class TokenBudgetExceeded(Exception):
     """Raised when user exceeds their token budget."""
     def __init__(self, message, usage_percentage=100):
@@ -510,7 +525,7 @@ def format_api_error_message(error_str):
 def process_streaming_with_thinking(stream, user_id=None, operation_type=None, model_name=None, app=None):
     """
     Generator that processes a streaming response and separates thinking content.
-    Yields SSE-formatted data with 'delta' for regular content and 'thinking' for thinking content.
+    Yields UTF-8 encoded SSE frames with 'delta' for regular content and 'thinking' for thinking content.
 
     Args:
         stream: The streaming response from the LLM API
@@ -572,7 +587,7 @@ def process_streaming_with_thinking(stream, user_id=None, operation_type=None, m
                         # Send any content before the thinking tag
                         before_thinking = content_buffer[:think_start.start()]
                         if before_thinking:
-                            yield f"data: {json.dumps({'delta': before_thinking})}\n\n"
+                            yield sse_frame({'delta': before_thinking})
 
                         # Start capturing thinking content
                         in_thinking = True
@@ -581,7 +596,7 @@ def process_streaming_with_thinking(stream, user_id=None, operation_type=None, m
                     else:
                         # No thinking tag found, send accumulated content
                         if content_buffer:
-                            yield f"data: {json.dumps({'delta': content_buffer})}\n\n"
+                            yield sse_frame({'delta': content_buffer})
                         content_buffer = ""
                         break
                 else:
@@ -593,7 +608,7 @@ def process_streaming_with_thinking(stream, user_id=None, operation_type=None, m
 
                         # Send the thinking content as a special type
                         if thinking_buffer.strip():
-                            yield f"data: {json.dumps({'thinking': thinking_buffer.strip()})}\n\n"
+                            yield sse_frame({'thinking': thinking_buffer.strip()})
 
                         # Continue processing after the closing tag
                         in_thinking = False
@@ -608,13 +623,13 @@ def process_streaming_with_thinking(stream, user_id=None, operation_type=None, m
     # Handle any remaining content
     if in_thinking and thinking_buffer:
         # Unclosed thinking tag - send as thinking content
-        yield f"data: {json.dumps({'thinking': thinking_buffer.strip()})}\n\n"
+        yield sse_frame({'thinking': thinking_buffer.strip()})
     elif content_buffer:
         # Regular content
-        yield f"data: {json.dumps({'delta': content_buffer})}\n\n"
+        yield sse_frame({'delta': content_buffer})
 
     # Signal the end of the stream
-    yield f"data: {json.dumps({'end_of_stream': True})}\n\n"
+    yield SSE_END_OF_STREAM_FRAME
 
 
 
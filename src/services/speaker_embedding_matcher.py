@@ -12,13 +12,9 @@ It provides functions to:
 Uses 256-dimensional embeddings from WhisperX diarization.
 """
 
-import json
 import numpy as np
 from datetime import datetime
-try:
-    from sklearn.metrics.pairwise import cosine_similarity
-except ImportError:
-    cosine_similarity = None
+from sqlalchemy import select
 from src.database import db
 from src.models import Speaker
 
@@ -49,70 +45,127 @@ def deserialize_embedding(binary_data):
     return np.frombuffer(binary_data, dtype=np.float32)
 
 
+def _normalize_rows(matrix):
+    """Scale each row to unit length; all-zero rows stay zero."""
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
 def calculate_similarity(embedding1, embedding2):
     """
     Compute cosine similarity between two 256-dimensional voice embeddings.
 
     Args:
-        embedding1: numpy array, list, or binary data
-        embedding2: numpy array, list, or binary data
+        embedding1: numpy array or list of floats
+        embedding2: numpy array or list of floats
 
     Returns:
         float: Similarity score (0-1, where 1 is identical)
     """
-    # Convert to numpy arrays if needed
-    e1 = np.array(embedding1, dtype=np.float32).reshape(1, -1)
-    e2 = np.array(embedding2, dtype=np.float32).reshape(1, -1)
+    e1 = _normalize_rows(np.asarray(embedding1, dtype=np.float32).reshape(1, -1))
+    e2 = _normalize_rows(np.asarray(embedding2, dtype=np.float32).reshape(1, -1))
 
     # Cosine similarity returns values from -1 to 1
     # For voice embeddings, we typically see 0.6-0.99 range
-    return float(cosine_similarity(e1, e2)[0][0])
+    return float(e1[0] @ e2[0])
 
 
-def find_matching_speakers(target_embedding, user_id, threshold=0.70):
+def get_speakers_by_name(user_id, names):
     """
-    Find speakers matching a target voice embedding for a specific user.
+    Look up several of a user's speakers by name in a single query.
 
     Args:
-        target_embedding: The voice embedding to match against (256-dim array/list)
-        user_id: User ID to search within
-        threshold: Minimum similarity score (0-1, default 0.70 = 70%)
+        user_id: User ID owning the speakers
+        names: Iterable of speaker names
 
     Returns:
-        list: Sorted list of matching speakers with scores
-              [{'speaker_id': 5, 'name': 'John', 'similarity': 85.3, 'confidence': 0.92}, ...]
+        dict: {name: Speaker} for the names that exist (lowest id wins on duplicates)
+    """
+    names = set(names)
+    if not names:
+        return {}
+    speakers = db.session.execute(
+        select(Speaker)
+        .where(Speaker.user_id == user_id, Speaker.name.in_(names))
+        .order_by(Speaker.id)
+    ).scalars()
+    by_name = {}
+    for speaker in speakers:
+        by_name.setdefault(speaker.name, speaker)
+    return by_name
+
+
+def _load_speaker_profiles(user_id):
+    """
+    Load a user's speakers that have a voice profile, with decoded embeddings.
+
+    Returns:
+        list: (speaker, embedding) pairs; corrupted embeddings are skipped
     """
-    # Get all speakers with embeddings for this user
     speakers = Speaker.query.filter_by(user_id=user_id).filter(
         Speaker.average_embedding.isnot(None)
     ).all()
 
-    if not speakers:
-        return []
-
-    matches = []
+    profiles = []
     for speaker in speakers:
         try:
-            # Deserialize and compare
-            speaker_emb = deserialize_embedding(speaker.average_embedding)
-            similarity = calculate_similarity(target_embedding, speaker_emb)
-
-            if similarity >= threshold:
-                matches.append({
-                    'speaker_id': speaker.id,
-                    'name': speaker.name,
-                    'similarity': round(similarity * 100, 1),  # Convert to percentage
-                    'confidence': speaker.confidence_score or 0.5,
-                    'embedding_count': speaker.embedding_count or 0
-                })
-        except Exception as e:
+            profiles.append((speaker, deserialize_embedding(speaker.average_embedding)))
+        except Exception:
             # Skip speakers with corrupted embeddings
             continue
+    return profiles
+
+
+def _match_profiles(target_embedding, profiles, threshold):
+    """
+    Score a target embedding against preloaded speaker profiles in one
+    vectorised product instead of one similarity call per speaker.
+
+    Profiles whose embedding size differs from the target are skipped.
+    """
+    target = np.asarray(target_embedding, dtype=np.float32).ravel()
+    candidates = [(speaker, emb) for speaker, emb in profiles if emb.shape[0] == target.shape[0]]
+    if not candidates:
+        return []
+
+    matrix = _normalize_rows(np.vstack([emb for _, emb in candidates]))
+    similarities = matrix @ _normalize_rows(target.reshape(1, -1))[0]
+
+    matches = []
+    for (speaker, _), similarity in zip(candidates, similarities.tolist()):
+        if similarity >= threshold:
+            matches.append({
+                'speaker_id': speaker.id,
+                'name': speaker.name,
+                'similarity': round(similarity * 100, 1),  # Convert to percentage
+                'confidence': speaker.confidence_score or 0.5,
+                'embedding_count': speaker.embedding_count or 0
+            })
 
     # Sort by similarity (highest first)
     return sorted(matches, key=lambda x: x['similarity'], reverse=True)
 
 
+def find_matching_speakers(target_embedding, user_id, threshold=0.70):
+    """
+    Find speakers matching a target voice embedding for a specific user.
+
+    Args:
+        target_embedding: The voice embedding to match against (256-dim array/list)
+        user_id: User ID to search within
+        threshold: Minimum similarity score (0-1, default 0.70 = 70%)
+
+    Returns:
+        list: Sorted list of matching speakers with scores
+              [{'speaker_id': 5, 'name': 'John', 'similarity': 85.3, 'confidence': 0.92}, ...]
+    """
+    profiles = _load_speaker_profiles(user_id)
+    if not profiles:
+        return []
+    return _match_profiles(target_embedding, profiles, threshold)
+
+
 def update_speaker_embedding(speaker, new_embedding, recording_id):
     """
     Update a speaker's average embedding and history with a new sample.
@@ -291,7 +344,8 @@ def apply_auto_speaker_labels(recording, user):
         return {}
 
     # Check if recording has speaker embeddings
-    if not recording.speaker_embeddings:
+    embeddings = recording.get_speaker_embeddings()
+    if not embeddings:
         return {}
 
     # Get the user's threshold setting
@@ -299,13 +353,13 @@ def apply_auto_speaker_labels(recording, user):
     confidence_threshold = AUTO_LABEL_THRESHOLDS.get(threshold_setting, AUTO_LABEL_THRESHOLDS['medium'])
 
     speaker_map = {}
-    embeddings = recording.speaker_embeddings
 
-    for speaker_label, embedding_data in embeddings.items():
-        # embedding_data should be a list of floats (256 dimensions)
-        if not embedding_data or not isinstance(embedding_data, list):
-            continue
+    # Load the user's voice profiles once for all speakers in the recording
+    profiles = _load_speaker_profiles(user.id)
+    if not profiles:
+        return {}
 
+    for speaker_label, embedding_data in embeddings.items():
         # Find matching speakers using the USER'S chosen threshold as the
         # filter. Previously this filtered with the hardcoded 0.70
         # BASE_SIMILARITY_THRESHOLD and only then applied the user's
@@ -314,11 +368,7 @@ def apply_auto_speaker_labels(recording, user):
         # second check), so those settings did nothing. Filtering at
         # confidence_threshold directly makes the setting actually take
         # effect: low=0.30, medium=0.60, high=0.80.
-        matches = find_matching_speakers(
-            target_embedding=embedding_data,
-            user_id=user.id,
-            threshold=confidence_threshold
-        )
+        matches = _match_profiles(embedding_data, profiles, confidence_threshold)
 
         if not matches:
             continue
@@ -361,11 +411,10 @@ def apply_speaker_names_to_transcription(recording, speaker_map):
         logger.warning(f"Auto-label: No speaker_map or transcription (map={bool(speaker_map)}, trans={bool(recording.transcription)})")
         return False
 
-    try:
-        # Parse transcription as JSON array: [{speaker, sentence, start_time, end_time}, ...]
-        segments = json.loads(recording.transcription)
-    except (json.JSONDecodeError, TypeError) as e:
-        logger.warning(f"Auto-label: Failed to parse transcription as JSON: {e}")
+    # Parsed transcription as JSON array: [{speaker, sentence, start_time, end_time}, ...]
+    segments = recording.transcription_parsed
+    if segments is None:
+        logger.warning("Auto-label: Failed to parse transcription as JSON")
         return False
 
     if not isinstance(segments, list) or not segments:
@@ -393,7 +442,7 @@ def apply_speaker_names_to_transcription(recording, speaker_map):
         recording.participants = ', '.join(sorted(all_speakers))
 
     # Save updated transcription
-    recording.transcription = json.dumps(segments)
+    recording.set_transcription_data(segments)
     db.session.commit()
 
     return True
@@ -414,25 +463,23 @@ def update_speaker_profiles_from_recording(recording, speaker_map, user):
     Returns:
         int: Number of speaker profiles updated
     """
-    if not speaker_map or not recording.speaker_embeddings:
+    if not speaker_map:
+        return 0
+    embeddings = recording.get_speaker_embeddings()
+    if not embeddings:
         return 0
 
     updated_count = 0
-    embeddings = recording.speaker_embeddings
+    speakers_by_name = get_speakers_by_name(user.id, speaker_map.values())
 
     for speaker_label, speaker_name in speaker_map.items():
         if speaker_label not in embeddings:
             continue
 
         embedding_data = embeddings[speaker_label]
-        if not embedding_data or not isinstance(embedding_data, list):
-            continue
 
         # Find the speaker profile
-        speaker = Speaker.query.filter_by(
-            user_id=user.id,
-            name=speaker_name
-        ).first()
+        speaker = speakers_by_name.get(speaker_name)
 
         if not speaker:
             continue
@@ -31,44 +31,41 @@ def identify_speakers_from_transcript(transcription_data, user_id):
     from src.utils import safe_json_loads
     from src.models import SystemSetting
 
-    # Extract unique speakers in order of appearance
-    seen_speakers = set()
-    unique_speakers = []
-    for segment in transcription_data:
-        speaker = segment.get('speaker')
-        if speaker and speaker not in seen_speakers:
-            seen_speakers.add(speaker)
-            unique_speakers.append(speaker)
-
-    if not unique_speakers:
-        return {}
+    # Apply configurable transcript length limit
+    transcript_limit = SystemSetting.get_setting('transcript_length_limit', 30000)
 
-    # Normalize all labels to SPEAKER_XX format for the LLM
+    # Normalize all labels to SPEAKER_XX format for the LLM, numbering speakers
+    # in order of appearance while the transcript is formatted in the same pass.
+    # Every segment is scanned for labels, but lines stop being formatted once
+    # the length limit is reached so a long transcript isn't built in full
+    # only to be sliced.
     speaker_to_label = {}
-    for idx, speaker in enumerate(unique_speakers):
-        speaker_to_label[speaker] = f'SPEAKER_{str(idx).zfill(2)}'
-
-    # Create temporary transcript with normalized labels
     formatted_lines = []
+    formatted_length = -1  # no newline before the first line
     for segment in transcription_data:
         original_speaker = segment.get('speaker')
-        label = speaker_to_label.get(original_speaker, 'Unknown Speaker')
-        sentence = segment.get('sentence', '')
-        formatted_lines.append(f"[{label}]: {sentence}")
+        if original_speaker and original_speaker not in speaker_to_label:
+            speaker_to_label[original_speaker] = f'SPEAKER_{len(speaker_to_label):02d}'
+        if transcript_limit == -1 or formatted_length < transcript_limit:
+            label = speaker_to_label.get(original_speaker, 'Unknown Speaker')
+            line = f"[{label}]: {segment.get('sentence', '')}"
+            formatted_lines.append(line)
+            formatted_length += len(line) + 1
+
+    if not speaker_to_label:
+        return {}
+
     formatted_transcription = "\n".join(formatted_lines)
+    if transcript_limit == -1:
+        transcript_text = formatted_transcription
+    else:
+        transcript_text = formatted_transcription[:transcript_limit]
 
     speaker_labels = list(speaker_to_label.values())
 
     current_app.logger.info(f"[Auto-Identify] Formatted transcript (first 500 chars): {formatted_transcription[:500]}")
     current_app.logger.info(f"[Auto-Identify] Speaker labels: {speaker_labels}")
 
-    # Apply configurable transcript length limit
-    transcript_limit = SystemSetting.get_setting('transcript_length_limit', 30000)
-    if transcript_limit == -1:
-        transcript_text = formatted_transcription
-    else:
-        transcript_text = formatted_transcription[:transcript_limit]
-
     prompt = f"""Analyze the following conversation transcript and identify the names of the speakers based on the context and content of their dialogue.
 
 The speakers that need to be identified are: {', '.join(speaker_labels)}
@@ -39,9 +39,8 @@ def create_speaker_snippets(recording_id, speaker_map):
     if not recording or not recording.transcription:
         return 0
 
-    try:
-        transcript = json.loads(recording.transcription)
-    except (json.JSONDecodeError, TypeError):
+    transcript = recording.transcription_parsed
+    if transcript is None:
         return 0
 
     # Build a reverse map: assigned name -> speaker_info
@@ -170,8 +169,8 @@ def _generate_dynamic_snippets(speaker_id, limit=3):
             break
 
         try:
-            # Parse transcription JSON
-            transcript = json.loads(recording.transcription)
+            # Parse transcription JSON (cached on the recording)
+            transcript = recording.transcription_parsed
 
             if not isinstance(transcript, list):
                 continue
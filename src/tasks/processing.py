@@ -13,6 +13,7 @@ import re
 import json
 import time
 import mimetypes
+import shutil
 import tempfile
 import subprocess
 import httpx
@@ -25,7 +26,7 @@ from src.models import Recording, Tag, Event, TranscriptChunk, SystemSetting, Gr
 from src.services.embeddings import process_recording_chunks
 from src.services.llm import is_using_openai_api, call_llm_completion, format_api_error_message, TEXT_MODEL_NAME, client, http_client_no_proxy, TokenBudgetExceeded
 from src.utils import extract_json_object, safe_json_loads
-from src.utils.ffprobe import get_codec_info, is_video_file, is_lossless_audio, FFProbeError
+from src.utils.ffprobe import get_codec_info, get_duration, is_video_file, is_lossless_audio, FFProbeError
 from src.utils.ffmpeg_utils import convert_to_mp3, extract_audio_from_video as ffmpeg_extract_audio, compress_audio, FFmpegError, FFmpegNotFoundError
 from src.utils.audio_conversion import convert_if_needed, ConversionResult
 from src.utils.error_formatting import format_error_for_storage
@@ -2060,7 +2061,7 @@ def transcribe_with_connector(app_context, recording_id, filepath, original_file
 
                         # Store speaker embeddings if available
                         if response.speaker_embeddings:
-                            recording.speaker_embeddings = response.speaker_embeddings
+                            recording.set_speaker_embeddings(response.speaker_embeddings)
                             current_app.logger.info(f"Stored speaker embeddings for speakers: {list(response.speaker_embeddings.keys())}")
 
                     # If we reach here, transcription succeeded
@@ -2200,7 +2201,7 @@ def transcribe_with_connector(app_context, recording_id, filepath, original_file
                 current_app.logger.warning(f"Failed to record transcription usage: {usage_err}")
 
             # Apply auto speaker labelling if enabled and embeddings available
-            if recording.speaker_embeddings:
+            if recording.has_speaker_embeddings:
                 try:
                     from src.services.speaker_embedding_matcher import (
                         apply_auto_speaker_labels,
@@ -2290,6 +2291,109 @@ def transcribe_with_connector(app_context, recording_id, filepath, original_file
             raise
 
 
+def prepare_uploaded_audio(recording, storage, is_asr_endpoint=False, size_limit_bytes=None):
+    """Run the upload-time audio conversion for a new recording inside its job.
+
+    upload_file stores the file exactly as received and leaves the ffmpeg work
+    (video audio extraction, unsupported-codec conversion, lossless
+    compression) to the prepare_audio job, so the request returns once the
+    bytes are saved. This converts the stored file with convert_if_needed,
+    swaps the stored object for the result and refreshes file_size and
+    mime_type. A file that needs no conversion is left alone, which also makes
+    a retried job a no-op. The media duration is cached from the same local
+    copy when the recording does not have one yet.
+
+    Args:
+        recording: Recording whose audio_path holds the original upload
+        storage: Storage service the upload was written to
+        is_asr_endpoint: Whether the legacy ASR endpoint codec rules apply
+        size_limit_bytes: Optional cap on the converted file (the stored-file
+            limit for audio-only video uploads when chunking is off)
+
+    Raises:
+        FFmpegNotFoundError, FFmpegError: If conversion fails
+        Exception: If the converted audio exceeds size_limit_bytes
+    """
+    connector_specs = None
+    try:
+        from src.services.transcription import get_connector
+        connector_specs = get_connector().specifications
+    except Exception as e:
+        current_app.logger.warning(f"Could not get connector specs for upload conversion: {e}")
+
+    old_locator = recording.audio_path
+    original_filename = recording.original_filename or 'recording'
+    temp_dir = tempfile.mkdtemp(prefix='speakr_upload_')
+    try:
+        # Work on a private copy: with local storage materialize() returns the
+        # stored file itself, and an in-place compress would overwrite it.
+        with storage.materialize(old_locator) as materialized:
+            filepath = os.path.join(
+                temp_dir, 'upload' + os.path.splitext(materialized.local_path)[1].lower()
+            )
+            shutil.copyfile(materialized.local_path, filepath)
+
+        # Cache the duration so API responses never need to materialize the
+        # file; conversion does not change it
+        if recording.audio_duration_seconds is None:
+            try:
+                duration = get_duration(filepath, timeout=30)
+                if duration is not None and duration > 0:
+                    recording.audio_duration_seconds = float(duration)
+            except Exception as e:
+                current_app.logger.warning(f"Could not determine duration for recording {recording.id}: {e}")
+
+        needs_chunking = bool(
+            chunking_service and
+            chunking_service.needs_chunking(filepath, is_asr_endpoint, connector_specs)
+        )
+        result = convert_if_needed(
+            filepath,
+            original_filename=original_filename,
+            needs_chunking=needs_chunking,
+            is_asr_endpoint=is_asr_endpoint,
+            delete_original=True,
+            connector_specs=connector_specs
+        )
+        if not (result.was_converted or result.was_compressed) and result.output_path == filepath:
+            db.session.commit()
+            return
+
+        final_size = os.path.getsize(result.output_path)
+        if size_limit_bytes and final_size > size_limit_bytes:
+            raise Exception(
+                f"Stored file too large: the extracted audio is {final_size / 1024 / 1024:.0f} MB, "
+                f"larger than the {size_limit_bytes / 1024 / 1024:.0f} MB stored-file limit. "
+                f"Enable chunking in admin settings (ENABLE_CHUNKING=true) or use a shorter / "
+                f"lower-bitrate source video."
+            )
+
+        key_name = os.path.splitext(original_filename)[0] + os.path.splitext(result.output_path)[1]
+        stored = storage.upload_local_file(
+            result.output_path,
+            storage.build_recording_key(key_name, recording.id),
+            content_type=result.mime_type,
+            delete_source=True,
+        )
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    recording.audio_path = stored.locator
+    recording.mime_type = result.mime_type
+    recording.file_size = final_size
+    db.session.commit()
+    current_app.logger.info(
+        f"Converted upload for recording {recording.id}: {result.original_codec} -> {result.final_codec}, "
+        f"{result.original_size_mb:.1f}MB -> {result.final_size_mb:.1f}MB"
+    )
+
+    if old_locator and old_locator != stored.locator:
+        try:
+            storage.delete(old_locator, missing_ok=True)
+        except Exception as cleanup_err:
+            current_app.logger.warning(f"Failed to delete original upload after conversion: {cleanup_err}")
+
+
 def transcribe_audio_task(app_context, recording_id, filepath, filename_for_asr, start_time, language=None, min_speakers=None, max_speakers=None, tag_id=None, hotwords=None, initial_prompt=None, transcription_model=None):
     """Runs the transcription and summarization in a background thread.
 
@@ -28,7 +28,10 @@ from .security import (
 from .database import (
     add_column_if_not_exists,
     migrate_column_type,
-    create_index_if_not_exists
+    create_index_if_not_exists,
+    index_exists,
+    normalize_sqlite_datetimes,
+    delete_duplicate_rows
 )
 
 from .token_auth import (
@@ -61,6 +64,8 @@ __all__ = [
     'add_column_if_not_exists',
     'migrate_column_type',
     'create_index_if_not_exists',
+    'index_exists',
+    'normalize_sqlite_datetimes',
     # Token authentication
     'extract_token_from_request',
     'hash_token',
@@ -65,6 +65,36 @@ def add_column_if_not_exists(engine, table_name, column_name, column_type):
     return False
 
 
+def index_exists(engine, table_name, index_name):
+    """
+    Check whether an index exists, looking it up by name in the catalog.
+
+    Reflection is not enough: SQLite's inspector cannot reflect
+    expression-based indexes (it skips them with a SAWarning), so an
+    expression index would never be seen as existing.
+
+    Args:
+        engine: SQLAlchemy engine
+        table_name: Name of the table the index belongs to
+        index_name: Name of the index
+
+    Returns:
+        bool: True if the index exists
+    """
+    if engine.name == 'sqlite':
+        query = "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = :name"
+    elif engine.name == 'postgresql':
+        query = "SELECT 1 FROM pg_indexes WHERE schemaname = current_schema() AND indexname = :name"
+    elif engine.name == 'mysql':
+        query = ("SELECT 1 FROM information_schema.statistics "
+                 "WHERE table_schema = DATABASE() AND index_name = :name")
+    else:
+        return index_name in [idx['name'] for idx in inspect(engine).get_indexes(table_name)]
+
+    with engine.connect() as conn:
+        return conn.execute(text(query), {'name': index_name}).first() is not None
+
+
 def create_index_if_not_exists(engine, index_name, table_name, columns, unique=False):
     """
     Create an index on a table if it doesn't already exist.
@@ -89,8 +119,7 @@ def create_index_if_not_exists(engine, index_name, table_name, columns, unique=F
         return False
 
     # Check if index already exists
-    existing_indexes = [idx['name'] for idx in inspector.get_indexes(table_name)]
-    if index_name in existing_indexes:
+    if index_exists(engine, table_name, index_name):
         return False
 
     unique_clause = 'UNIQUE ' if unique else ''
@@ -118,6 +147,77 @@ def create_index_if_not_exists(engine, index_name, table_name, columns, unique=F
     return True
 
 
+def normalize_sqlite_datetimes(engine, table_name, columns):
+    """
+    Rewrite SQLite DATETIME values stored without microseconds into the
+    'YYYY-MM-DD HH:MM:SS.ffffff' form SQLAlchemy writes and binds.
+
+    SQLite compares these values as text, so '2024-01-01 12:00:00' sorts
+    before '2024-01-01 12:00:00.000000' although both are the same instant.
+    Rows written by raw-SQL migrations would otherwise never compare equal to
+    a bound datetime, which breaks keyset pagination on them. No-op on other
+    databases, which store real timestamps.
+
+    Args:
+        engine: SQLAlchemy engine
+        table_name: Name of the table
+        columns: Iterable of DATETIME column names to normalize
+
+    Returns:
+        int: Number of values rewritten
+    """
+    if engine.name != 'sqlite':
+        return 0
+    if table_name not in inspect(engine).get_table_names():
+        return 0
+
+    seconds_only = '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9] [0-9][0-9]:[0-9][0-9]:[0-9][0-9]'
+    rewritten = 0
+    with engine.connect() as conn:
+        for column in columns:
+            result = conn.execute(text(
+                f'UPDATE "{table_name}" SET "{column}" = "{column}" || \'.000000\' '
+                f'WHERE "{column}" GLOB \'{seconds_only}\''
+            ))
+            rewritten += result.rowcount
+        conn.commit()
+    return rewritten
+
+
+def delete_duplicate_rows(engine, table_name, columns):
+    """
+    Delete rows that repeat another row's values in the given columns,
+    keeping the one with the highest id.
+
+    Run before adding a unique index over columns that were not unique
+    before, since creating the index fails while duplicates remain.
+
+    Args:
+        engine: SQLAlchemy engine
+        table_name: Name of the table (must have an integer id primary key)
+        columns: Iterable of column names that should be unique together
+
+    Returns:
+        int: Number of rows deleted
+    """
+    if table_name not in inspect(engine).get_table_names():
+        return 0
+
+    quote = '`' if engine.name == 'mysql' else '"'
+    quoted_table = f'{quote}{table_name}{quote}'
+    group_by = ', '.join(f'{quote}{column}{quote}' for column in columns)
+
+    with engine.connect() as conn:
+        # The derived table lets MySQL select from the table it deletes from
+        result = conn.execute(text(
+            f'DELETE FROM {quoted_table} WHERE id NOT IN ('
+            f'SELECT keep_id FROM (SELECT MAX(id) AS keep_id FROM {quoted_table} '
+            f'GROUP BY {group_by}) AS keep_rows)'
+        ))
+        conn.commit()
+    return result.rowcount
+
+
 def migrate_column_type(engine, table_name, column_name, new_type, transform_sql=None):
     """
     Migrate a column to a new type if it exists.
@@ -0,0 +1,97 @@
+"""
+Fast JSON serialization helpers.
+
+Uses orjson when it is installed and falls back to the standard library json
+module otherwise, so callers get the same output either way: compact UTF-8
+encoded JSON. Decode errors are always json.JSONDecodeError (orjson's error
+type subclasses it). FastJSONProvider plugs the same encoder into Flask's
+jsonify().
+"""
+
+import json
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def dumps_bytes(obj):
+    """
+    Serialize obj to compact UTF-8 JSON bytes.
+
+    Args:
+        obj: JSON-serializable object (dict keys may be non-string scalars)
+
+    Returns:
+        bytes: The encoded JSON document
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def dumps(obj):
+    """
+    Serialize obj to a compact JSON string (non-ASCII characters unescaped).
+
+    Args:
+        obj: JSON-serializable object (dict keys may be non-string scalars)
+
+    Returns:
+        str: The encoded JSON document
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+
+def loads(data):
+    """
+    Parse a JSON document from str or bytes.
+
+    Args:
+        data: JSON text as str, bytes or bytearray
+
+    Returns:
+        The decoded Python object
+
+    Raises:
+        json.JSONDecodeError: If data is not valid JSON
+        TypeError: If data is not str/bytes (stdlib path only; orjson raises
+            JSONDecodeError instead)
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that renders jsonify() responses with orjson.
+
+    Output matches DefaultJSONProvider for compact responses: keys sorted,
+    dates via the provider's default hook (HTTP date strings), a trailing
+    newline. Non-ASCII text is emitted as UTF-8 rather than \\u escapes.
+    Pretty-printed (debug) responses and payloads orjson rejects, such as
+    integers wider than 64 bits, go through the standard library encoder.
+    """
+
+    _ORJSON_OPTIONS = (
+        orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    ) if ORJSON_AVAILABLE else 0
+
+    def response(self, *args, **kwargs):
+        if not ORJSON_AVAILABLE or self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        try:
+            body = orjson.dumps(obj, default=self.default, option=self._ORJSON_OPTIONS)
+        except TypeError:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
@@ -15,6 +15,17 @@ DEFAULT_CHANNELS = int(os.getenv('AUDIO_CHANNELS', '1'))  # Mono for speech
 DEFAULT_COMPRESSION_LEVEL = int(os.getenv('AUDIO_COMPRESSION_LEVEL', '2'))
 
 
+# Skip video, subtitle and data streams when only audio is written, so
+# containers like MP4/MKV are not demuxed and decoded for unused tracks
+AUDIO_ONLY_ARGS = ['-vn', '-sn', '-dn']
+
+
+def _ffmpeg_input_args(input_path: str) -> list:
+    """Common ffmpeg prefix: quiet output (stderr carries only errors), all
+    cores for decoding, overwrite the output."""
+    return ['ffmpeg', '-hide_banner', '-loglevel', 'error', '-threads', '0', '-i', input_path, '-y']
+
+
 class FFmpegError(Exception):
     """Custom exception for FFmpeg-related errors."""
     pass
@@ -55,10 +66,7 @@ def convert_to_mp3(
         base = os.path.splitext(input_path)[0]
         output_path = f"{base}.mp3"
     
-    cmd = [
-        'ffmpeg',
-        '-i', input_path,
-        '-y',  # Overwrite output
+    cmd = _ffmpeg_input_args(input_path) + AUDIO_ONLY_ARGS + [
         '-acodec', 'libmp3lame',
         '-b:a', bitrate,
         '-ar', sample_rate,
@@ -128,11 +136,7 @@ def extract_audio_from_video(
                 temp_audio_path = f"{base_path}_audio_temp.{output_ext}"
                 final_audio_path = f"{base_path}_audio.{output_ext}"
                 
-                cmd = [
-                    'ffmpeg',
-                    '-i', video_path,
-                    '-y',
-                    '-vn',  # No video
+                cmd = _ffmpeg_input_args(video_path) + AUDIO_ONLY_ARGS + [
                     '-acodec', 'copy',  # Copy audio stream without re-encoding
                     temp_audio_path
                 ]
@@ -147,11 +151,7 @@ def extract_audio_from_video(
                 temp_audio_path = f"{base_path}_audio_temp.{output_ext}"
                 final_audio_path = f"{base_path}_audio.{output_ext}"
                 
-                cmd = [
-                    'ffmpeg',
-                    '-i', video_path,
-                    '-y',
-                    '-vn',
+                cmd = _ffmpeg_input_args(video_path) + AUDIO_ONLY_ARGS + [
                     '-acodec', 'libmp3lame',
                     '-b:a', bitrate,
                     '-ar', DEFAULT_SAMPLE_RATE,
@@ -163,11 +163,7 @@ def extract_audio_from_video(
         elif output_format == 'mp3':
             temp_audio_path = f"{base_path}_audio_temp.mp3"
             final_audio_path = f"{base_path}_audio.mp3"
-            cmd = [
-                'ffmpeg',
-                '-i', video_path,
-                '-y',
-                '-vn',  # No video
+            cmd = _ffmpeg_input_args(video_path) + AUDIO_ONLY_ARGS + [
                 '-acodec', 'libmp3lame',
                 '-b:a', bitrate,
                 '-ar', DEFAULT_SAMPLE_RATE,
@@ -179,11 +175,7 @@ def extract_audio_from_video(
         elif output_format == 'wav':
             temp_audio_path = f"{base_path}_audio_temp.wav"
             final_audio_path = f"{base_path}_audio.wav"
-            cmd = [
-                'ffmpeg',
-                '-i', video_path,
-                '-y',
-                '-vn',
+            cmd = _ffmpeg_input_args(video_path) + AUDIO_ONLY_ARGS + [
                 '-acodec', 'pcm_s16le',
                 '-ar', DEFAULT_SAMPLE_RATE,
                 temp_audio_path
@@ -192,11 +184,7 @@ def extract_audio_from_video(
         elif output_format == 'flac':
             temp_audio_path = f"{base_path}_audio_temp.flac"
             final_audio_path = f"{base_path}_audio.flac"
-            cmd = [
-                'ffmpeg',
-                '-i', video_path,
-                '-y',
-                '-vn',
+            cmd = _ffmpeg_input_args(video_path) + AUDIO_ONLY_ARGS + [
                 '-acodec', 'flac',
                 '-compression_level', '12',
                 temp_audio_path
@@ -205,11 +193,7 @@ def extract_audio_from_video(
         elif output_format == 'opus':
             temp_audio_path = f"{base_path}_audio_temp.opus"
             final_audio_path = f"{base_path}_audio.opus"
-            cmd = [
-                'ffmpeg',
-                '-i', video_path,
-                '-y',
-                '-vn',
+            cmd = _ffmpeg_input_args(video_path) + AUDIO_ONLY_ARGS + [
                 '-acodec', 'libopus',
                 '-b:a', bitrate,
                 temp_audio_path
@@ -227,8 +211,8 @@ def extract_audio_from_video(
             shutil.copy2(temp_audio_path, debug_path)
             current_app.logger.info(f"Debug: Preserved temp audio file as {debug_path}")
         
-        # Rename temp file to final filename
-        os.rename(temp_audio_path, final_audio_path)
+        # Move temp file into place (atomic, overwrites a stale final file)
+        os.replace(temp_audio_path, final_audio_path)
         
         if cleanup_original:
             try:
@@ -309,7 +293,7 @@ def compress_audio(
         # Get original file size for logging
         original_size = os.path.getsize(input_path)
         
-        cmd = ['ffmpeg', '-i', input_path, '-y'] + config['cmd_args'] + [temp_output_path]
+        cmd = _ffmpeg_input_args(input_path) + AUDIO_ONLY_ARGS + config['cmd_args'] + [temp_output_path]
         
         _run_ffmpeg_command(cmd, f"Compression of {os.path.basename(input_path)} to {codec}")
         
@@ -323,11 +307,13 @@ def compress_audio(
             f"{compressed_size / 1024 / 1024:.1f}MB ({ratio:.1f}% reduction)"
         )
         
-        # Remove original and rename temp to final
-        if delete_original:
+        # Move temp into place atomically, then drop the original. Doing it in
+        # this order means the output path never goes missing, and when the
+        # output overwrites the input there is nothing left to delete.
+        os.replace(temp_output_path, final_output_path)
+        if delete_original and os.path.abspath(input_path) != os.path.abspath(final_output_path):
             os.remove(input_path)
             current_app.logger.debug(f"Deleted original file: {input_path}")
-        os.rename(temp_output_path, final_output_path)
         
         # Return codec_info as None since file was converted (codec changed)
         return final_output_path, config['mime'], None
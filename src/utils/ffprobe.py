@@ -59,13 +59,14 @@ def probe(filename: str, cmd: str = 'ffprobe', timeout: Optional[int] = None) ->
         raise FFProbeError(f'Failed to parse ffprobe output: {e}')
 
 
-def get_codec_info(filename: str, timeout: Optional[int] = None) -> Dict[str, Any]:
+def get_codec_info(filename: str, timeout: Optional[int] = None, probe_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Get codec information for a media file.
 
     Args:
         filename: Path to the media file
         timeout: Optional timeout in seconds
+        probe_data: Optional pre-fetched probe() output to avoid running ffprobe again
 
     Returns:
         Dictionary with keys:
@@ -82,10 +83,8 @@ def get_codec_info(filename: str, timeout: Optional[int] = None) -> Dict[str, An
     Raises:
         FFProbeError: if ffprobe fails to analyze the file
     """
-    try:
+    if probe_data is None:
         probe_data = probe(filename, timeout=timeout)
-    except FFProbeError:
-        raise
 
     result = {
         'audio_codec': None,
@@ -360,7 +359,8 @@ def _get_duration_from_packets(filename: str, timeout: Optional[int] = None) ->
         return None
 
 
-def get_creation_date(filename: str, timeout: Optional[int] = None, use_file_mtime: bool = True) -> Optional[datetime]:
+def get_creation_date(filename: str, timeout: Optional[int] = None, use_file_mtime: bool = True,
+                      probe_data: Optional[Dict[str, Any]] = None) -> Optional[datetime]:
     """
     Extract the creation/recording date from a media file's metadata.
 
@@ -375,20 +375,22 @@ def get_creation_date(filename: str, timeout: Optional[int] = None, use_file_mti
         filename: Path to the media file
         timeout: Optional timeout in seconds
         use_file_mtime: If True, fall back to file modification time when no metadata found
+        probe_data: Optional pre-fetched probe() output to avoid running ffprobe again
 
     Returns:
         datetime object if creation date found, None otherwise
     """
     import os
 
-    try:
-        probe_data = probe(filename, timeout=timeout)
-    except FFProbeError as e:
-        logger.warning(f"Failed to probe {filename} for creation date: {e}")
-        # Even if probe fails, we can still try file mtime
-        if use_file_mtime:
-            return _get_file_mtime(filename)
-        return None
+    if probe_data is None:
+        try:
+            probe_data = probe(filename, timeout=timeout)
+        except FFProbeError as e:
+            logger.warning(f"Failed to probe {filename} for creation date: {e}")
+            # Even if probe fails, we can still try file mtime
+            if use_file_mtime:
+                return _get_file_mtime(filename)
+            return None
 
     # Tags to check for creation date (in order of preference)
     date_tags = ['creation_time', 'date', 'encoded_date', 'date_recorded', 'recording_time']
@@ -0,0 +1,37 @@
+"""Serving stored recording audio from local disk.
+
+Flask's send_file already streams a path through the WSGI server's
+``wsgi.file_wrapper`` (sendfile(2) under gunicorn) and, with
+``conditional=True``, answers Range, If-None-Match and If-Modified-Since, so
+the player's seeks fetch only the bytes they need. Deployments behind Apache
+or lighttpd can go one step further and let the web server send the file:
+with AUDIO_X_SENDFILE=true the response carries an ``X-Sendfile`` header and
+no body.
+
+This is enabled per audio response rather than through Flask's app-wide
+USE_X_SENDFILE, because other endpoints send temporary files that are
+deleted as soon as the response closes, before a web server could read them.
+"""
+
+from flask import current_app, request
+from werkzeug.utils import send_file as _send_file
+
+
+def send_audio_file(path, **kwargs):
+    """``flask.send_file`` for a stored audio file.
+
+    Always conditional (Range requests, ETag and Last-Modified from the file
+    itself), and handed to the web server via X-Sendfile when
+    AUDIO_X_SENDFILE is on. Extra keyword arguments (mimetype,
+    as_attachment, download_name, ...) are passed through.
+    """
+    return _send_file(
+        path,
+        environ=request.environ,
+        use_x_sendfile=current_app.config.get('AUDIO_X_SENDFILE', False),
+        response_class=current_app.response_class,
+        _root_path=current_app.root_path,
+        max_age=current_app.get_send_file_max_age,
+        conditional=True,
+        **kwargs,
+    )
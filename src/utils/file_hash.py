@@ -22,3 +22,30 @@ def compute_file_sha256(filepath, chunk_size=8192):
                 break
             sha256.update(chunk)
     return sha256.hexdigest()
+
+
+def save_stream_with_sha256(stream, filepath, chunk_size=1024 * 1024):
+    """
+    Write a readable binary stream to a file, hashing it on the way.
+
+    Equivalent to saving the stream and then calling compute_file_sha256 on
+    the result, without reading the written file back from disk.
+
+    Args:
+        stream: Binary file-like object positioned at the start (e.g. a
+            Werkzeug FileStorage.stream)
+        filepath: Destination path
+        chunk_size: Size of chunks to copy at a time (default 1MB)
+
+    Returns:
+        64-character hex digest string
+    """
+    sha256 = hashlib.sha256()
+    with open(filepath, 'wb') as f:
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            sha256.update(chunk)
+            f.write(chunk)
+    return sha256.hexdigest()
@@ -1,8 +1,8 @@
 """
 Render the stored simplified-JSON transcript into text using a transcript-template
 format string. Used to inject timestamps into the transcript sent to the
-summarizer / chat (#304). Mirrors the placeholder/filter handling in
-file_exporter.format_transcription_with_template so the formats line up.
+summarizer / chat (#304), and by file_exporter.format_transcription_with_template
+(auto-export, /api/v1) so every path produces the same timestamps.
 
 Segment schema (see TranscriptionResponse.to_storage_format):
     {"speaker": str, "sentence": str, "start_time": float|None, "end_time": float|None}
@@ -11,9 +11,9 @@ Supported placeholders: {{index}} {{speaker}} {{text}} {{start_time}} {{end_time
 Supported filters: |upper, and |srt on start_time/end_time.
 """
 
+import functools
 import json
 import re
-from datetime import timedelta
 
 # Built-in default used when timestamps are requested but no template is chosen.
 DEFAULT_TIMESTAMP_FORMAT = "[{{start_time}}] {{speaker}}: {{text}}"
@@ -22,18 +22,74 @@ DEFAULT_TIMESTAMP_FORMAT = "[{{start_time}}] {{speaker}}: {{text}}"
 def _fmt_time(seconds):
     if seconds is None:
         return "00:00:00"
-    td = timedelta(seconds=seconds)
-    total = td.total_seconds()
-    return f"{int(total // 3600):02d}:{int((total % 3600) // 60):02d}:{int(total % 60):02d}"
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return "%02d:%02d:%02d" % (hours, minutes, secs)
 
 
 def _fmt_srt_time(seconds):
     if seconds is None:
         return "00:00:00,000"
-    td = timedelta(seconds=seconds)
-    total = td.total_seconds()
-    return (f"{int(total // 3600):02d}:{int((total % 3600) // 60):02d}:"
-            f"{int(total % 60):02d},{int((total % 1) * 1000):03d}")
+    secs, millis = divmod(int(round(seconds * 1000)), 1000)
+    minutes, secs = divmod(secs, 60)
+    hours, minutes = divmod(minutes, 60)
+    return "%02d:%02d:%02d,%03d" % (hours, minutes, secs, millis)
+
+
+# Per-segment renderers for each supported {{name}} / {{name|filter}} placeholder.
+_FIELD_RENDERERS = {
+    ('index', None): lambda index, segment: str(index),
+    ('speaker', None): lambda index, segment: segment.get('speaker', 'Unknown'),
+    ('text', None): lambda index, segment: segment.get('sentence', ''),
+    ('start_time', None): lambda index, segment: _fmt_time(segment.get('start_time')),
+    ('end_time', None): lambda index, segment: _fmt_time(segment.get('end_time')),
+    ('start_time', 'srt'): lambda index, segment: _fmt_srt_time(segment.get('start_time')),
+    ('end_time', 'srt'): lambda index, segment: _fmt_srt_time(segment.get('end_time')),
+}
+for (_name, _filter), _render in list(_FIELD_RENDERERS.items()):
+    if _filter is None:
+        _FIELD_RENDERERS[(_name, 'upper')] = (
+            lambda index, segment, _render=_render: _render(index, segment).upper()
+        )
+
+_PLACEHOLDER_RE = re.compile(r'\{\{(\w+)(?:\|(\w+))?\}\}')
+
+
+@functools.lru_cache(maxsize=512)
+def compile_template(template_format):
+    """Parse a template format once into a tuple of literal strings and renderers.
+
+    Unknown plain placeholders are kept verbatim; an unknown placeholder with
+    the |upper filter renders as an empty string, as it always has.
+    """
+    tokens = []
+    pos = 0
+    for match in _PLACEHOLDER_RE.finditer(template_format):
+        if match.start() > pos:
+            tokens.append(template_format[pos:match.start()])
+        renderer = _FIELD_RENDERERS.get((match.group(1), match.group(2)))
+        if renderer is not None:
+            tokens.append(renderer)
+        elif match.group(2) == 'upper':
+            tokens.append('')
+        else:
+            tokens.append(match.group(0))
+        pos = match.end()
+    if pos < len(template_format):
+        tokens.append(template_format[pos:])
+    return tuple(tokens)
+
+
+def render_segments(segments, template_format):
+    """Render a list of transcript segments, one line per segment."""
+    tokens = compile_template(template_format)
+    if all(token.__class__ is str for token in tokens):
+        # No placeholders to fill: every line is the same literal text.
+        return '\n'.join([''.join(tokens)] * len(segments))
+    return '\n'.join(
+        ''.join(token if token.__class__ is str else token(index, segment) for token in tokens)
+        for index, segment in enumerate(segments, 1)
+    )
 
 
 def render_transcription(transcription_text, template_format):
@@ -49,26 +105,4 @@ def render_transcription(transcription_text, template_format):
     if not isinstance(data, list):
         return None
 
-    fmt = template_format or DEFAULT_TIMESTAMP_FORMAT
-    lines = []
-    for index, segment in enumerate(data, 1):
-        line = fmt
-        replacements = {
-            '{{index}}': str(index),
-            '{{speaker}}': segment.get('speaker', 'Unknown'),
-            '{{text}}': segment.get('sentence', ''),
-            '{{start_time}}': _fmt_time(segment.get('start_time')),
-            '{{end_time}}': _fmt_time(segment.get('end_time')),
-        }
-        # SRT-time filters first (more specific than the |upper sweep).
-        line = line.replace('{{start_time|srt}}', _fmt_srt_time(segment.get('start_time')))
-        line = line.replace('{{end_time|srt}}', _fmt_srt_time(segment.get('end_time')))
-        line = re.sub(
-            r'\{\{(.*?)\|upper\}\}',
-            lambda m: replacements.get('{{' + m.group(1) + '}}', '').upper(),
-            line,
-        )
-        for key, value in replacements.items():
-            line = line.replace(key, value)
-        lines.append(line)
-    return '\n'.join(lines)
+    return render_segments(data, template_format or DEFAULT_TIMESTAMP_FORMAT)
@@ -2835,8 +2835,9 @@ document.addEventListener('DOMContentLoaded', async () => {
                     // still-processing state and then dedupe away the real
                     // transcribe completion — leaving the recording stuck on
                     // "Processing". A FAILED stitch IS terminal (no transcribe
-                    // follows), so only skip the completed case.
-                    if (job.job_type === 'stitch' && job.job_status === 'completed') continue;
+                    // follows), so only skip the completed case. A new
+                    // upload's 'prepare_audio' job hands off the same way.
+                    if ((job.job_type === 'stitch' || job.job_type === 'prepare_audio') && job.job_status === 'completed') continue;
                     if (job.job_status === 'completed' && !completedRecordingIds.has(job.recording_id)) {
                         completedRecordingIds.add(job.recording_id);
                         try {
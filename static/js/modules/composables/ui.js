@@ -763,6 +763,26 @@ export function useUI(state, utils, processedTranscription) {
         }
     };
 
+    // Long summaries/notes are converted in the background: the server answers
+    // 202 with a file_url that is polled until the document is ready, giving
+    // up after WORD_DOWNLOAD_MAX_POLLS seconds.
+    const WORD_DOWNLOAD_MAX_POLLS = 300;
+    const fetchWordDownload = async (url) => {
+        let response = await fetch(url);
+        if (response.status !== 202) {
+            return response;
+        }
+        const { file_url: fileUrl } = await response.json();
+        for (let attempt = 0; response.status === 202; attempt++) {
+            if (attempt >= WORD_DOWNLOAD_MAX_POLLS) {
+                throw new Error('Timed out waiting for the Word document');
+            }
+            await new Promise(resolve => setTimeout(resolve, 1000));
+            response = await fetch(fileUrl);
+        }
+        return response;
+    };
+
     const downloadNotes = async () => {
         if (!selectedRecording.value || !selectedRecording.value.notes) {
             showToast(t('messages.noNotesAvailableDownload'), 'fa-exclamation-circle');
@@ -770,7 +790,7 @@ export function useUI(state, utils, processedTranscription) {
         }
 
         try {
-            const response = await fetch(`/recording/${selectedRecording.value.id}/download/notes`);
+            const response = await fetchWordDownload(`/recording/${selectedRecording.value.id}/download/notes`);
             if (!response.ok) {
                 const error = await response.json();
                 showToast(error.error || t('messages.notesDownloadFailed'), 'fa-exclamation-circle');
@@ -1615,7 +1635,7 @@ export function useUI(state, utils, processedTranscription) {
         }
 
         try {
-            const response = await fetch(`/recording/${selectedRecording.value.id}/download/summary`);
+            const response = await fetchWordDownload(`/recording/${selectedRecording.value.id}/download/summary`);
             if (!response.ok) {
                 const error = await response.json();
                 showToast(error.error || t('messages.summaryDownloadFailed'), 'fa-exclamation-circle');
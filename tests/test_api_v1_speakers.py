@@ -624,7 +624,7 @@ def test_identify_happy_path():
             })
 
             with patch("src.services.llm.call_llm_completion", return_value=mock_completion), \
-                 patch("src.models.system.SystemSetting") as mock_ss:
+                 patch("src.models.SystemSetting") as mock_ss:
                 mock_ss.get_setting.return_value = 30000
                 resp = client.post(f"/api/v1/recordings/{rec.id}/speakers/identify",
                                    headers={"X-API-Token": token})
@@ -657,7 +657,7 @@ def test_identify_post_processing_unknown_values():
             })
 
             with patch("src.services.llm.call_llm_completion", return_value=mock_completion), \
-                 patch("src.models.system.SystemSetting") as mock_ss:
+                 patch("src.models.SystemSetting") as mock_ss:
                 mock_ss.get_setting.return_value = 30000
                 resp = client.post(f"/api/v1/recordings/{rec.id}/speakers/identify",
                                    headers={"X-API-Token": token})
@@ -701,7 +701,7 @@ def test_identify_llm_error():
         try:
             with patch("src.services.llm.call_llm_completion",
                        side_effect=RuntimeError("LLM down")), \
-                 patch("src.models.system.SystemSetting") as mock_ss:
+                 patch("src.models.SystemSetting") as mock_ss:
                 mock_ss.get_setting.return_value = 30000
                 resp = client.post(f"/api/v1/recordings/{rec.id}/speakers/identify",
                                    headers={"X-API-Token": token})
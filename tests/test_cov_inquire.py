@@ -688,6 +688,38 @@ def test_chat_thinking_tags_split_out(client):
         assert 'Before' in deltas and 'After' in deltas
 
 
+def test_chat_thinking_tags_case_insensitive(client):
+    """Mixed-case thinking tags are still split out of the delta stream."""
+    user_id = _make_user()
+    rec_id = _make_recording(user_id)
+    chunk_id = _make_chunk(user_id, rec_id)
+
+    def llm_side_effect(messages, **kwargs):
+        if kwargs.get('operation_type') == 'query_routing':
+            return _llm_msg("RAG")
+        return _llm_msg('["t"]')
+
+    streamed = ["Before ", "<THINKING>hidden", " reasoning</Thinking>", "After"]
+
+    with _login(client, user_id), \
+         patch('src.api.inquire.ENABLE_INQUIRE_MODE', True), \
+         patch('src.api.inquire.client', MagicMock()), \
+         patch('src.api.inquire.EMBEDDINGS_AVAILABLE', True), \
+         patch('src.api.inquire.call_llm_completion', side_effect=llm_side_effect), \
+         patch('src.api.inquire.semantic_search_chunks',
+               side_effect=lambda *a, **k: [_get_chunk_pair(chunk_id, 0.7)]), \
+         patch('src.api.inquire.call_chat_completion',
+               return_value=_stream_chunks(streamed)):
+        resp = client.post('/api/inquire/chat', json={'message': 'q'})
+        assert resp.status_code == 200
+        events = _sse_events(resp)
+        thinking = [e['thinking'] for e in events if 'thinking' in e]
+        deltas = "".join(e['delta'] for e in events if 'delta' in e)
+        assert any('hidden reasoning' in t for t in thinking)
+        assert 'hidden' not in deltas
+        assert 'After' in deltas
+
+
 def test_chat_full_transcript_request(client):
     """If the model emits REQUEST_FULL_TRANSCRIPT, the full transcript is fetched
     and a second completion is run via process_streaming_with_thinking."""
@@ -722,6 +754,39 @@ def test_chat_full_transcript_request(client):
         pst.assert_called()
 
 
+def test_chat_full_transcript_request_split_across_tokens(client):
+    """The REQUEST_FULL_TRANSCRIPT marker is still detected when streamed in pieces."""
+    user_id = _make_user()
+    rec_id = _make_recording(user_id, transcription="THE FULL TRANSCRIPT BODY")
+    chunk_id = _make_chunk(user_id, rec_id)
+
+    def llm_side_effect(messages, **kwargs):
+        if kwargs.get('operation_type') == 'query_routing':
+            return _llm_msg("RAG")
+        return _llm_msg('["t"]')
+
+    first_stream = _stream_chunks([" REQUEST_", "FULL_TRANS", "CRIPT:", f"{rec_id}\n"])
+
+    with _login(client, user_id), \
+         patch('src.api.inquire.ENABLE_INQUIRE_MODE', True), \
+         patch('src.api.inquire.client', MagicMock()), \
+         patch('src.api.inquire.EMBEDDINGS_AVAILABLE', True), \
+         patch('src.api.inquire.call_llm_completion', side_effect=llm_side_effect), \
+         patch('src.api.inquire.semantic_search_chunks',
+               side_effect=lambda *a, **k: [_get_chunk_pair(chunk_id, 0.7)]), \
+         patch('src.api.inquire.call_chat_completion', return_value=first_stream), \
+         patch('src.api.inquire.process_streaming_with_thinking',
+               return_value=iter([
+                   "data: " + json.dumps({'delta': 'full-transcript answer'}) + "\n\n",
+               ])) as pst:
+        resp = client.post('/api/inquire/chat', json={'message': 'give me everything'})
+        assert resp.status_code == 200
+        events = _sse_events(resp)
+        deltas = "".join(e.get('delta', '') for e in events)
+        assert 'full-transcript answer' in deltas
+        pst.assert_called()
+
+
 def test_chat_full_transcript_request_wrong_owner(client):
     """REQUEST_FULL_TRANSCRIPT for a recording the user doesn't own -> error event."""
     owner = _make_user()
@@ -861,6 +926,56 @@ def test_chat_rag_dedups_repeated_chunks(client):
     assert captured.get('system_prompt', '').count(marker) == 1
 
 
+def test_chat_rag_system_prompt_starts_with_static_rules(client):
+    """The static formatting rules lead the system prompt so providers can cache
+    them as a shared prefix; the retrieved context follows them."""
+    from src.api.inquire import INQUIRE_SYSTEM_PROMPT_RULES
+    user_id = _make_user()
+    rec_id = _make_recording(user_id, title="Prefix Rec", participants=None)
+    marker = "PREFIXCONTEXT_" + _suffix()
+    chunk_id = _make_chunk(user_id, rec_id, content=marker, chunk_index=0)
+
+    captured = {}
+    with _login(client, user_id), \
+         patch('src.api.inquire.ENABLE_INQUIRE_MODE', True), \
+         patch('src.api.inquire.client', MagicMock()), \
+         patch('src.api.inquire.EMBEDDINGS_AVAILABLE', True), \
+         patch('src.api.inquire.call_llm_completion', side_effect=_rag_router_then('[]')), \
+         patch('src.api.inquire.semantic_search_chunks',
+               side_effect=lambda *a, **k: [_get_chunk_pair(chunk_id, 0.8)]), \
+         patch('src.api.inquire.call_chat_completion',
+               side_effect=_capturing_chat_completion(captured)):
+        resp = client.post('/api/inquire/chat', json={'message': 'tell me'})
+        assert resp.status_code == 200
+        _sse_events(resp)
+    sp = captured.get('system_prompt', '')
+    assert sp.startswith(INQUIRE_SYSTEM_PROMPT_RULES)
+    assert marker in sp[len(INQUIRE_SYSTEM_PROMPT_RULES):]
+
+
+def test_chat_uses_module_max_tokens(client):
+    """CHAT_MAX_TOKENS is read once at import and passed to every chat completion."""
+    user_id = _make_user()
+    rec_id = _make_recording(user_id, title="Tokens Rec", participants=None)
+    chunk_id = _make_chunk(user_id, rec_id, chunk_index=0)
+
+    captured = {}
+    with _login(client, user_id), \
+         patch('src.api.inquire.CHAT_MAX_TOKENS', 1234), \
+         patch('src.api.inquire.ENABLE_INQUIRE_MODE', True), \
+         patch('src.api.inquire.client', MagicMock()), \
+         patch('src.api.inquire.EMBEDDINGS_AVAILABLE', True), \
+         patch('src.api.inquire.call_llm_completion', side_effect=_rag_router_then('[]')), \
+         patch('src.api.inquire.semantic_search_chunks',
+               side_effect=lambda *a, **k: [_get_chunk_pair(chunk_id, 0.8)]), \
+         patch('src.api.inquire.call_chat_completion',
+               side_effect=_capturing_chat_completion(captured)):
+        resp = client.post('/api/inquire/chat', json={'message': 'tell me'})
+        assert resp.status_code == 200
+        _sse_events(resp)
+    assert captured['kwargs']['max_tokens'] == 1234
+
+
 def test_chat_rag_sorts_by_similarity_desc(client):
     """inquire.py:403 — combined results are sorted by similarity DESCENDING before
     the top-N truncation, so the highest-scored chunk survives a top-1 cut.
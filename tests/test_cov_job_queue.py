@@ -444,6 +444,56 @@ def test_transcribe_falls_back_to_basename_when_no_original_filename(track):
     assert args[3] == "materialized_basename.mp3"   # basename fallback, not ""
 
 
+def test_prepare_audio_converts_then_queues_transcription(track):
+    """prepare_audio runs the upload conversion and hands the remaining
+    params to a follow-up transcribe job for the same new upload."""
+    uid = _make_user(); track.user_ids.append(uid)
+    rid = _make_recording(uid, status="QUEUED")
+    track.recording_ids.append(rid)
+    jid = job_queue.enqueue(uid, rid, "prepare_audio", params={
+        "language": "de",
+        "convert_upload": {"asr_endpoint": False, "size_limit_bytes": 2048},
+    }, is_new_upload=True); track.job_ids.append(jid)
+    job = _claim(rid, ["prepare_audio"], "transcription")
+
+    fake_prepare = MagicMock()
+    with patch("src.tasks.processing.prepare_uploaded_audio", fake_prepare), \
+         patch("src.services.storage.get_storage_service", return_value=MagicMock()), \
+         patch.object(job_queue, "_emit_completion_webhook"):
+        job_queue._process_job(job)
+
+    assert fake_prepare.call_args.kwargs == {"is_asr_endpoint": False, "size_limit_bytes": 2048}
+    db.session.expire_all()
+    assert db.session.get(ProcessingJob, jid).status == "completed"
+    follow_up = ProcessingJob.query.filter_by(recording_id=rid, job_type="transcribe").one()
+    track.job_ids.append(follow_up.id)
+    assert follow_up.status == "queued" and follow_up.is_new_upload
+    assert json.loads(follow_up.params) == {"language": "de"}
+    assert db.session.get(Recording, rid).status == "QUEUED"
+
+
+def test_prepare_audio_failure_does_not_queue_transcription(track):
+    uid = _make_user(); track.user_ids.append(uid)
+    rid = _make_recording(uid, status="QUEUED")
+    track.recording_ids.append(rid)
+    jid = job_queue.enqueue(uid, rid, "prepare_audio", params={
+        "convert_upload": {"asr_endpoint": False},
+    }); track.job_ids.append(jid)
+    job = _claim(rid, ["prepare_audio"], "transcription")
+
+    with patch("src.tasks.processing.prepare_uploaded_audio",
+               side_effect=Exception("Stored file too large: 900 MB")), \
+         patch("src.services.storage.get_storage_service", return_value=MagicMock()), \
+         patch.object(job_queue, "_emit_failure_webhook") as failed:
+        job_queue._process_job(job)
+
+    db.session.expire_all()
+    assert db.session.get(ProcessingJob, jid).status == "failed"
+    assert db.session.get(Recording, rid).status == "FAILED"
+    assert ProcessingJob.query.filter_by(recording_id=rid, job_type="transcribe").count() == 0
+    failed.assert_called_once()
+
+
 def test_process_job_summarize_dispatches_summary_task(track):
     uid = _make_user(); track.user_ids.append(uid)
     rid = _make_recording(uid); track.recording_ids.append(rid)
@@ -31,6 +31,8 @@ from src.services.llm import (
     format_api_error_message,
     process_streaming_with_thinking,
     extract_cache_tokens,
+    sse_error_frame,
+    SSE_END_OF_STREAM_FRAME,
     TokenBudgetExceeded,
 )
 
@@ -743,6 +745,17 @@ def test_streaming_usage_record_error_non_blocking(monkeypatch):
     assert events[-1] == {"end_of_stream": True}
 
 
+def test_sse_frames_are_utf8_bytes():
+    stream = [make_chunk("héllo")]
+    frames = list(process_streaming_with_thinking(stream))
+    assert all(isinstance(f, bytes) for f in frames)
+    assert frames[-1] is SSE_END_OF_STREAM_FRAME
+    assert json.loads(frames[0][len(b"data: "):]) == {"delta": "héllo"}
+    frame = sse_error_frame(ValueError('bad "input"'))
+    assert frame.startswith(b"data: ") and frame.endswith(b"\n\n")
+    assert json.loads(frame[len(b"data: "):]) == {"error": 'bad "input"'}
+
+
 # ===========================================================================
 # MUTATION-VERIFIED coverage for budget / token-usage / GPT-5 / stream-options
 # logic that no existing test catches.
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Coverage tests for src/api/naming_templates.py.
+
+User-scoped CRUD for recording title naming templates. Pattern follows
+tests/test_cov_initial_prompt_templates.py: isolated DB via repo-root conftest,
+login by session injection, hermetic/offline.
+"""
+
+import uuid
+
+import pytest
+
+from src.app import app, db
+from src.models import User, NamingTemplate, Tag
+
+app.config['WTF_CSRF_ENABLED'] = False
+app.config['TESTING'] = True
+
+
+def _mk_user():
+    suffix = uuid.uuid4().hex[:8]
+    u = User(username=f"u_{suffix}", email=f"{suffix}@local.test", password="x")
+    db.session.add(u)
+    db.session.commit()
+    return u
+
+
+def _login(client, user):
+    with client.session_transaction() as s:
+        s['_user_id'] = str(user.id)
+        s['_fresh'] = True
+
+
+@pytest.fixture
+def ctx():
+    with app.app_context():
+        yield
+
+
+@pytest.fixture
+def user(ctx):
+    u = _mk_user()
+    yield u
+    Tag.query.filter_by(user_id=u.id).delete()
+    NamingTemplate.query.filter_by(user_id=u.id).delete()
+    db.session.delete(u)
+    db.session.commit()
+
+
+@pytest.fixture
+def client(user):
+    c = app.test_client()
+    _login(c, user)
+    return c
+
+
+def test_create_stores_regex_patterns_as_dict(client, user):
+    resp = client.post('/api/naming-templates',
+                       json={'name': 'Calls', 'template': '{{phone}} {{date}}',
+                             'regex_patterns': {'phone': '^(\\d{10})'}})
+    assert resp.status_code == 201
+    created = resp.get_json()
+    assert created['regex_patterns'] == {'phone': '^(\\d{10})'}
+
+    db.session.expire_all()
+    template = db.session.get(NamingTemplate, created['id'])
+    assert template.regex_patterns == {'phone': '^(\\d{10})'}
+
+
+def test_update_clears_regex_patterns(client, user):
+    created = client.post('/api/naming-templates',
+                          json={'name': 'Calls', 'template': '{{phone}}',
+                                'regex_patterns': {'phone': '(\\d+)'}}).get_json()
+    resp = client.put(f"/api/naming-templates/{created['id']}", json={'regex_patterns': {}})
+    assert resp.status_code == 200
+    assert resp.get_json()['regex_patterns'] == {}
+
+
+def test_delete_blocked_while_tag_uses_template(client, user):
+    created = client.post('/api/naming-templates',
+                          json={'name': 'Used', 'template': '{{filename}}'}).get_json()
+    for i in range(2):
+        db.session.add(Tag(user_id=user.id, name=f"t{i}_{uuid.uuid4().hex[:6]}",
+                           naming_template_id=created['id']))
+    db.session.commit()
+
+    resp = client.delete(f"/api/naming-templates/{created['id']}")
+    assert resp.status_code == 400
+    assert '2 tag(s)' in resp.get_json()['error']
+
+
+def test_delete_unused_template(client, user):
+    created = client.post('/api/naming-templates',
+                          json={'name': 'Unused', 'template': '{{filename}}'}).get_json()
+    resp = client.delete(f"/api/naming-templates/{created['id']}")
+    assert resp.status_code == 200
+    assert db.session.get(NamingTemplate, created['id']) is None
@@ -765,6 +765,112 @@ def test_transcribe_audio_task_sets_processing_time():
         assert out.processing_time_seconds >= 0
 
 
+# ---------------------------------------------------------------------------
+# prepare_uploaded_audio — upload conversion run inside the prepare_audio job
+# ---------------------------------------------------------------------------
+
+class _ConvStorage:
+    """Minimal StorageService stand-in backed by a directory."""
+
+    def __init__(self, root):
+        self.root = root
+        self.deleted = []
+
+    def _path(self, locator):
+        return os.path.join(self.root, locator.split("://", 1)[1])
+
+    @contextmanager
+    def materialize(self, locator):
+        yield MagicMock(local_path=self._path(locator))
+
+    def build_recording_key(self, original_filename, recording_id=None, *, now=None):
+        return f"{recording_id}_{original_filename}"
+
+    def upload_local_file(self, local_path, key, *, content_type=None, delete_source=False):
+        os.replace(local_path, os.path.join(self.root, key))
+        return MagicMock(locator=f"local://{key}")
+
+    def delete(self, locator, missing_ok=True):
+        self.deleted.append(locator)
+        os.remove(self._path(locator))
+        return True
+
+
+def _conversion(output_path, converted=True):
+    def _convert(filepath, **kwargs):
+        if converted:
+            with open(output_path(filepath), "wb") as f:
+                f.write(b"converted")
+        result = MagicMock(was_converted=converted, was_compressed=False,
+                           mime_type="audio/mpeg", original_size_mb=0.0, final_size_mb=0.0)
+        result.output_path = output_path(filepath) if converted else filepath
+        return result
+    return _convert
+
+
+def _stored_upload(tmp_path, user_id, name="talk.flac"):
+    (tmp_path / name).write_bytes(b"original-bytes")
+    recording = Recording(user_id=user_id, original_filename=name, audio_path=f"local://{name}",
+                          status="PENDING", mime_type="audio/flac", file_size=14)
+    db.session.add(recording)
+    db.session.commit()
+    return recording
+
+
+def test_prepare_uploaded_audio_swaps_converted_file(tmp_path):
+    with app.app_context():
+        user = _make_user("prep_swap")
+        rec = _stored_upload(tmp_path, user.id)
+        storage = _ConvStorage(str(tmp_path))
+        to_mp3 = lambda p: os.path.splitext(p)[0] + ".mp3"
+        with patch.object(proc, "convert_if_needed", side_effect=_conversion(to_mp3)), \
+             patch.object(proc, "chunking_service", None):
+            proc.prepare_uploaded_audio(rec, storage)
+
+        db.session.expire_all()
+        out = db.session.get(Recording, rec.id)
+        assert out.audio_path == f"local://{rec.id}_talk.mp3"
+        assert out.mime_type == "audio/mpeg"
+        assert out.file_size == len(b"converted")
+        assert (tmp_path / f"{rec.id}_talk.mp3").read_bytes() == b"converted"
+        assert storage.deleted == ["local://talk.flac"]
+        assert not (tmp_path / "talk.flac").exists()
+
+
+def test_prepare_uploaded_audio_leaves_supported_file(tmp_path):
+    with app.app_context():
+        user = _make_user("prep_noop")
+        rec = _stored_upload(tmp_path, user.id, name="talk.mp3")
+        storage = _ConvStorage(str(tmp_path))
+        with patch.object(proc, "convert_if_needed", side_effect=_conversion(None, converted=False)), \
+             patch.object(proc, "chunking_service", None), \
+             patch.object(proc, "get_duration", return_value=42.0):
+            proc.prepare_uploaded_audio(rec, storage)
+
+        assert rec.audio_path == "local://talk.mp3"
+        # The duration is cached (and committed) even when nothing converts
+        db.session.expire_all()
+        assert db.session.get(Recording, rec.id).audio_duration_seconds == 42.0
+        assert (tmp_path / "talk.mp3").read_bytes() == b"original-bytes"
+        assert storage.deleted == []
+
+
+def test_prepare_uploaded_audio_rejects_oversized_extraction(tmp_path):
+    with app.app_context():
+        user = _make_user("prep_cap")
+        rec = _stored_upload(tmp_path, user.id, name="talk.mp4")
+        storage = _ConvStorage(str(tmp_path))
+        to_mp3 = lambda p: os.path.splitext(p)[0] + ".mp3"
+        with patch.object(proc, "convert_if_needed", side_effect=_conversion(to_mp3)), \
+             patch.object(proc, "chunking_service", None), \
+             pytest.raises(Exception, match="too large"):
+            proc.prepare_uploaded_audio(rec, storage, size_limit_bytes=4)
+
+        assert rec.audio_path == "local://talk.mp4"
+        assert (tmp_path / "talk.mp4").exists()
+        assert sorted(os.listdir(tmp_path)) == ["talk.mp4"]
+
+
 # ---------------------------------------------------------------------------
 # apply_team_tag_auto_shares — group-tag -> auto-share fan-out
 # ---------------------------------------------------------------------------
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Coverage tests for src/api/push_notifications.py.
+
+Subscription endpoints plus the send_push_notification fan-out. The push
+services are never contacted: the module's cached webpush() is patched and a throwaway
+VAPID key pair is generated per session. Pattern follows
+tests/test_cov_initial_prompt_templates.py: isolated DB via repo-root conftest,
+login by session injection, hermetic/offline.
+"""
+
+import json
+import threading
+import time
+import uuid
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+from py_vapid import Vapid
+from pywebpush import WebPushException
+
+from src.app import app, db
+from src.models import User
+from src.models.push_subscription import PushSubscription
+import src.api.push_notifications as push
+
+app.config['WTF_CSRF_ENABLED'] = False
+app.config['TESTING'] = True
+
+
+@pytest.fixture(scope='module')
+def vapid_private_key():
+    vapid = Vapid()
+    vapid.generate_keys()
+    return vapid.private_pem().decode('utf-8')
+
+
+@pytest.fixture(autouse=True)
+def enabled_push(vapid_private_key):
+    # Bind the real pywebpush symbols so tests can patch the cached webpush
+    push._load_pywebpush()
+    with patch.object(push, 'PUSH_ENABLED', True), \
+         patch.object(push, 'VAPID_PUBLIC_KEY', 'test-public-key'), \
+         patch.object(push, 'VAPID_PRIVATE_KEY', vapid_private_key):
+        yield
+
+
+def _mk_user():
+    suffix = uuid.uuid4().hex[:8]
+    u = User(username=f"u_{suffix}", email=f"{suffix}@local.test", password="x")
+    db.session.add(u)
+    db.session.commit()
+    return u
+
+
+def _mk_subscription(user, host='push.example.com'):
+    sub = PushSubscription(
+        user_id=user.id,
+        endpoint=f"https://{host}/send/{uuid.uuid4().hex}",
+        p256dh_key='p256dh',
+        auth_key='auth',
+    )
+    db.session.add(sub)
+    db.session.commit()
+    return sub
+
+
+def _login(client, user):
+    with client.session_transaction() as s:
+        s['_user_id'] = str(user.id)
+        s['_fresh'] = True
+
+
+def _push_error(status_code):
+    response = MagicMock()
+    response.status_code = status_code
+    return WebPushException(f"Push failed: {status_code}", response=response)
+
+
+@pytest.fixture
+def ctx():
+    with app.app_context():
+        yield
+
+
+@pytest.fixture
+def user(ctx):
+    u = _mk_user()
+    yield u
+    PushSubscription.query.filter_by(user_id=u.id).delete()
+    db.session.delete(u)
+    db.session.commit()
+
+
+@pytest.fixture
+def client(user):
+    c = app.test_client()
+    _login(c, user)
+    return c
+
+
+def test_send_delivers_to_every_subscription(user):
+    subs = [_mk_subscription(user) for _ in range(3)]
+    endpoints = {s.endpoint for s in subs}
+
+    with patch.object(push, '_webpush') as webpush:
+        push.send_push_notification(user.id, 'Done', 'Your recording is ready', url='/r/1')
+
+    assert webpush.call_count == 3
+    sent_to = {c.kwargs['subscription_info']['endpoint'] for c in webpush.call_args_list}
+    assert sent_to == endpoints
+    assert PushSubscription.query.filter_by(user_id=user.id).count() == 3
+
+
+def test_send_reuses_shared_http_session(user):
+    _mk_subscription(user)
+    _mk_subscription(user)
+
+    with patch.object(push, '_webpush') as webpush:
+        push.send_push_notification(user.id, 'Done', 'Body')
+        push.send_push_notification(user.id, 'Again', 'Body')
+
+    sessions = {id(c.kwargs['requests_session']) for c in webpush.call_args_list}
+    assert sessions == {id(push._get_push_session())}
+
+
+def test_http_session_adapts_httpx_for_pywebpush():
+    seen = {}
+
+    def handler(request):
+        seen.update(url=str(request.url), body=request.content, ttl=request.headers['ttl'])
+        return httpx.Response(410, text='gone')
+
+    session = push._HttpxPushSession(httpx.Client(transport=httpx.MockTransport(handler)))
+    resp = session.post('https://push.example.com/send/abc', data=b'cipher',
+                        headers={'ttl': '0'}, timeout=None)
+
+    assert seen == {'url': 'https://push.example.com/send/abc', 'body': b'cipher', 'ttl': '0'}
+    assert (resp.status_code, resp.reason, resp.text) == (410, 'Gone', 'gone')
+
+
+def test_send_runs_deliveries_concurrently(user):
+    for host in ('fcm.googleapis.com', 'updates.push.services.mozilla.com',
+                 'wns2-par02p.notify.windows.com'):
+        _mk_subscription(user, host=host)
+    barrier = threading.Barrier(3, timeout=5)
+
+    # Every call waits for the other two; a serial loop would time out here.
+    with patch.object(push, '_webpush', side_effect=lambda **kw: barrier.wait()) as webpush:
+        push.send_push_notification(user.id, 'Done', 'Body')
+
+    assert webpush.call_count == 3
+    assert not barrier.broken
+
+
+def test_send_caps_concurrency_per_push_origin(user):
+    for _ in range(6):
+        _mk_subscription(user, host='fcm.googleapis.com')
+    lock = threading.Lock()
+    active = {'now': 0, 'max': 0}
+
+    def fake_webpush(**kwargs):
+        with lock:
+            active['now'] += 1
+            active['max'] = max(active['max'], active['now'])
+        time.sleep(0.05)
+        with lock:
+            active['now'] -= 1
+
+    with patch.object(push, '_webpush', side_effect=fake_webpush) as webpush, \
+         patch.object(push, 'PUSH_PER_ORIGIN_CONCURRENCY', 2), \
+         patch.dict(push._origin_semaphores, clear=True):
+        push.send_push_notification(user.id, 'Done', 'Body')
+
+    assert webpush.call_count == 6
+    assert active['max'] == 2
+
+
+def test_send_signs_vapid_token_once_per_origin(user):
+    for _ in range(3):
+        _mk_subscription(user, host='fcm.googleapis.com')
+    _mk_subscription(user, host='updates.push.services.mozilla.com')
+
+    with patch.object(push, '_webpush') as webpush, \
+         patch.object(push, '_vapid_auth_headers', wraps=push._vapid_auth_headers) as sign, \
+         patch.dict(push._vapid_header_cache, clear=True):
+        push.send_push_notification(user.id, 'Done', 'Body')
+
+    assert sorted(c.args[1] for c in sign.call_args_list) == [
+        'https://fcm.googleapis.com', 'https://updates.push.services.mozilla.com']
+    assert webpush.call_count == 4
+    for c in webpush.call_args_list:
+        assert c.kwargs['headers']['Authorization'].startswith('vapid t=')
+        assert 'vapid_claims' not in c.kwargs
+    payloads = {c.kwargs['data'] for c in webpush.call_args_list}
+    assert len(payloads) == 1 and isinstance(payloads.pop(), bytes)
+
+
+def test_send_reuses_vapid_signer_and_tokens_across_sends(user):
+    _mk_subscription(user, host='fcm.googleapis.com')
+
+    with patch.object(push, '_webpush') as webpush, \
+         patch.object(push, '_load_vapid', wraps=push._load_vapid) as load, \
+         patch.object(push, '_vapid_auth_headers', wraps=push._vapid_auth_headers) as sign, \
+         patch.object(push, '_vapid_signer', (None, None)), \
+         patch.dict(push._vapid_header_cache, clear=True):
+        push.send_push_notification(user.id, 'Done', 'Body')
+        push.send_push_notification(user.id, 'Again', 'Body')
+        push._vapid_header_cache['https://fcm.googleapis.com'] = (0, {})
+        push.send_push_notification(user.id, 'Expired token', 'Body')
+
+    assert load.call_count == 1
+    assert sign.call_count == 2
+    assert webpush.call_count == 3
+
+
+def test_send_removes_expired_subscriptions_only(user):
+    gone = _mk_subscription(user)
+    missing = _mk_subscription(user)
+    flaky = _mk_subscription(user)
+    healthy = _mk_subscription(user)
+    gone_id, missing_id, flaky_id, healthy_id = gone.id, missing.id, flaky.id, healthy.id
+    errors = {gone.endpoint: _push_error(410), missing.endpoint: _push_error(404),
+              flaky.endpoint: _push_error(500)}
+
+    def fake_webpush(**kwargs):
+        error = errors.get(kwargs['subscription_info']['endpoint'])
+        if error:
+            raise error
+
+    with patch.object(push, '_webpush', side_effect=fake_webpush):
+        push.send_push_notification(user.id, 'Done', 'Body')
+
+    db.session.expire_all()
+    remaining = {s.id for s in PushSubscription.query.filter_by(user_id=user.id)}
+    assert remaining == {flaky_id, healthy_id}
+    assert gone_id not in remaining and missing_id not in remaining
+
+
+def test_send_deletes_expired_subscriptions_in_chunks(user):
+    subs = [_mk_subscription(user) for _ in range(5)]
+    expired_ids = {s.id for s in subs[:3]}
+    expired_endpoints = {s.endpoint for s in subs[:3]}
+
+    def fake_webpush(**kwargs):
+        if kwargs['subscription_info']['endpoint'] in expired_endpoints:
+            raise _push_error(410)
+
+    with patch.object(push, '_webpush', side_effect=fake_webpush), \
+         patch.object(push, 'EXPIRED_DELETE_CHUNK_SIZE', 2):
+        push.send_push_notification(user.id, 'Done', 'Body')
+
+    db.session.expire_all()
+    remaining = {s.id for s in PushSubscription.query.filter_by(user_id=user.id)}
+    assert remaining == {s.id for s in subs[3:]}
+    assert not remaining & expired_ids
+
+
+def test_send_async_returns_before_delivery(user):
+    _mk_subscription(user)
+    release = threading.Event()
+
+    with patch.object(push, '_webpush', side_effect=lambda **kw: release.wait(5)) as webpush, \
+         patch.object(push, 'PUSH_COALESCE_SECONDS', 0.01):
+        future = push.send_push_notification_async(user.id, 'Done', 'Body')
+        assert not future.done()
+        release.set()
+        future.result(timeout=5)
+
+    assert webpush.call_count == 1
+
+
+def test_send_async_coalesces_burst_per_user(user):
+    _mk_subscription(user)
+    _mk_subscription(user)
+
+    with patch.object(push, '_webpush') as webpush, \
+         patch.object(push, 'PUSH_COALESCE_SECONDS', 0.2):
+        futures = [push.send_push_notification_async(user.id, f'Recording {i} ready', 'Body',
+                                                     url='/recordings')
+                   for i in range(3)]
+        assert len({id(f) for f in futures}) == 1
+        assert futures[0].result(timeout=5) == 3
+
+    assert webpush.call_count == 2
+    payload = json.loads(webpush.call_args.kwargs['data'])
+    assert payload['title'] == '3 new notifications'
+    assert payload['body'] == 'Recording 0 ready\nRecording 1 ready\nRecording 2 ready'
+    assert payload['data'] == {'count': 3, 'url': '/recordings'}
+
+
+def test_send_async_skips_when_disabled(user):
+    with patch.object(push, 'PUSH_ENABLED', False):
+        assert push.send_push_notification_async(user.id, 'Done', 'Body') is None
+
+
+def test_send_without_subscriptions_is_noop(user):
+    with patch.object(push, '_webpush') as webpush:
+        push.send_push_notification(user.id, 'Done', 'Body')
+    webpush.assert_not_called()
+
+
+def test_subscribe_and_unsubscribe(client, user):
+    payload = {'endpoint': f'https://push.example.com/{uuid.uuid4().hex}',
+               'keys': {'p256dh': 'k1', 'auth': 'a1'}}
+
+    resp = client.post('/api/push/subscribe', json=payload)
+    assert resp.status_code == 200
+    first = resp.get_json()
+    assert first['success'] is True
+
+    resp = client.post('/api/push/subscribe', json=payload)
+    assert resp.get_json()['subscription_id'] == first['subscription_id']
+
+    resp = client.post('/api/push/unsubscribe', json={'endpoint': payload['endpoint']})
+    assert resp.status_code == 200
+    assert PushSubscription.query.filter_by(user_id=user.id).count() == 0
+
+
+def test_subscribe_again_refreshes_rotated_keys(client, user):
+    endpoint = f'https://push.example.com/{uuid.uuid4().hex}'
+    first = client.post('/api/push/subscribe', json={
+        'endpoint': endpoint, 'keys': {'p256dh': 'old-p256dh', 'auth': 'old-auth'}}).get_json()
+    second = client.post('/api/push/subscribe', json={
+        'endpoint': endpoint, 'keys': {'p256dh': 'new-p256dh', 'auth': 'new-auth'}}).get_json()
+
+    assert second['success'] is True
+    assert second['subscription_id'] == first['subscription_id']
+    db.session.expire_all()
+    sub = db.session.get(PushSubscription, first['subscription_id'])
+    assert (sub.p256dh_key, sub.auth_key) == ('new-p256dh', 'new-auth')
+    assert PushSubscription.query.filter_by(user_id=user.id).count() == 1
+
+
+def test_subscribe_without_unique_index_uses_savepoint_fallback(client, user):
+    endpoint = f'https://push.example.com/{uuid.uuid4().hex}'
+    with patch.object(push, '_user_endpoint_index', (db.engine, False)):
+        first = client.post('/api/push/subscribe', json={
+            'endpoint': endpoint, 'keys': {'p256dh': 'old-p256dh', 'auth': 'old-auth'}}).get_json()
+        second = client.post('/api/push/subscribe', json={
+            'endpoint': endpoint, 'keys': {'p256dh': 'new-p256dh', 'auth': 'new-auth'}}).get_json()
+
+    assert second['subscription_id'] == first['subscription_id']
+    db.session.expire_all()
+    sub = db.session.get(PushSubscription, first['subscription_id'])
+    assert (sub.p256dh_key, sub.auth_key) == ('new-p256dh', 'new-auth')
+
+
+def test_unique_index_checked_once_per_engine(client, user):
+    with patch.object(push, '_user_endpoint_index', (None, False)), \
+         patch.object(push, 'index_exists', return_value=True) as exists:
+        for _ in range(3):
+            client.post('/api/push/subscribe', json={
+                'endpoint': f'https://push.example.com/{uuid.uuid4().hex}',
+                'keys': {'p256dh': 'k', 'auth': 'a'}})
+    exists.assert_called_once()
+
+
+def test_unsubscribe_works_while_push_disabled(client, user):
+    sub = _mk_subscription(user)
+
+    with patch.object(push, 'PUSH_ENABLED', False):
+        resp = client.post('/api/push/unsubscribe', json={'endpoint': sub.endpoint})
+
+    assert resp.status_code == 200
+    assert PushSubscription.query.filter_by(user_id=user.id).count() == 0
+
+
+def test_push_config_reports_public_key():
+    resp = app.test_client().get('/api/push/config')
+    assert resp.status_code == 200
+    assert resp.get_json() == {'enabled': True, 'public_key': 'test-public-key'}
+    assert resp.headers['Cache-Control'] == 'public, max-age=3600'
+
+
+def test_push_config_when_disabled():
+    with patch.object(push, 'PUSH_ENABLED', False):
+        resp = app.test_client().get('/api/push/config')
+    assert resp.get_json() == {'enabled': False, 'public_key': None}
+
+
+def test_bootstrap_binds_vapid_constants():
+    config = {'enabled': True, 'public_key': 'pub', 'private_key': 'priv'}
+    with patch.object(push, '_get_vapid_config', return_value=config), \
+         patch.object(push, 'PUSH_ENABLED', False), \
+         patch.object(push, 'VAPID_PUBLIC_KEY', None), \
+         patch.object(push, 'VAPID_PRIVATE_KEY', None):
+        push._bootstrap_vapid_config(None)
+        assert (push.PUSH_ENABLED, push.VAPID_PUBLIC_KEY, push.VAPID_PRIVATE_KEY) == \
+            (True, 'pub', 'priv')
@@ -239,6 +239,33 @@ def test_get_recordings_lists_only_owner(owner, other):
     assert theirs_id not in ids
 
 
+def test_get_recordings_batches_share_counts_and_tags(owner, other):
+    from src.models.sharing import InternalShare, Share
+    tagname = f"listtag{uuid.uuid4().hex[:6]}"
+    with _db():
+        u = db.session.get(User, owner)
+        tag = Tag(name=tagname, user_id=u.id)
+        db.session.add(tag)
+        db.session.commit()
+        shared = make_recording(u, title="list-shared")
+        plain = make_recording(u, title="list-plain")
+        db.session.add(RecordingTag(recording_id=shared.id, tag_id=tag.id, order=1))
+        db.session.add(InternalShare(recording_id=shared.id, owner_id=owner,
+                                     shared_with_user_id=other))
+        db.session.add(Share(recording_id=shared.id, user_id=owner))
+        db.session.add(Share(recording_id=shared.id, user_id=owner))
+        db.session.commit()
+        shared_id, plain_id = shared.id, plain.id
+
+    c = new_client()
+    login(c, owner)
+    by_id = {r["id"]: r for r in c.get("/recordings").get_json()}
+    assert (by_id[shared_id]["shared_with_count"], by_id[shared_id]["public_share_count"]) == (1, 2)
+    assert [t["name"] for t in by_id[shared_id]["tags"]] == [tagname]
+    assert (by_id[plain_id]["shared_with_count"], by_id[plain_id]["public_share_count"]) == (0, 0)
+    assert by_id[plain_id]["tags"] == []
+
+
 def test_get_recordings_unauthenticated_returns_empty_array():
     c = new_client()
     resp = c.get("/recordings")
@@ -268,6 +295,63 @@ def test_paginated_list_owner_scoped(owner, other):
     assert "pagination" in body
 
 
+def test_paginated_list_includes_internal_shares_once(owner, other):
+    from src.models.sharing import InternalShare
+    with _db():
+        u = db.session.get(User, owner)
+        o = db.session.get(User, other)
+        mine_id = make_recording(u, title="p-own-shared").id
+        shared_id = make_recording(o, title="p-shared-in").id
+        db.session.add(InternalShare(recording_id=shared_id, owner_id=other,
+                                     shared_with_user_id=owner))
+        # A share of one's own recording must not list it twice
+        db.session.add(InternalShare(recording_id=mine_id, owner_id=owner,
+                                     shared_with_user_id=owner))
+        db.session.commit()
+
+    c = new_client()
+    login(c, owner)
+    with patch.object(rec_module, "ENABLE_INTERNAL_SHARING", True):
+        recs = c.get("/api/recordings?per_page=100").get_json()["recordings"]
+        with _db():
+            assert {mine_id, shared_id} <= set(rec_module.get_accessible_recording_ids(owner))
+            other_username = db.session.get(User, other).username
+    ids = [r["id"] for r in recs]
+    assert shared_id in ids
+    assert ids.count(mine_id) == 1
+    shared = next(r for r in recs if r["id"] == shared_id)
+    assert shared["owner_username"] == other_username
+    assert shared["share_info"]["owner_username"] == other_username
+
+    with patch.object(rec_module, "ENABLE_INTERNAL_SHARING", False):
+        ids = [r["id"] for r in c.get("/api/recordings?per_page=100").get_json()["recordings"]]
+    assert mine_id in ids
+    assert shared_id not in ids
+
+
+def test_paginated_list_uses_recipient_state_for_shares(owner, other):
+    from src.models.sharing import InternalShare, SharedRecordingState
+    with _db():
+        o = db.session.get(User, other)
+        with_state = make_recording(o, title="p-state")
+        without_state = make_recording(o, title="p-no-state")
+        with_state.is_inbox, with_state.is_highlighted = True, False
+        for rec in (with_state, without_state):
+            db.session.add(InternalShare(recording_id=rec.id, owner_id=other,
+                                         shared_with_user_id=owner))
+        db.session.add(SharedRecordingState(recording_id=with_state.id, user_id=owner,
+                                            is_inbox=False, is_highlighted=True))
+        db.session.commit()
+        with_state_id, without_state_id = with_state.id, without_state.id
+
+    c = new_client()
+    login(c, owner)
+    with patch.object(rec_module, "ENABLE_INTERNAL_SHARING", True):
+        recs = {r["id"]: r for r in c.get("/api/recordings?per_page=100").get_json()["recordings"]}
+    assert (recs[with_state_id]["is_inbox"], recs[with_state_id]["is_highlighted"]) == (False, True)
+    assert (recs[without_state_id]["is_inbox"], recs[without_state_id]["is_highlighted"]) == (True, False)
+
+
 def test_paginated_list_pagination_metadata(owner):
     with _db():
         u = db.session.get(User, owner)
@@ -346,6 +430,78 @@ def test_paginated_text_search_by_title(owner):
     assert nomatch_id not in ids
 
 
+@pytest.mark.parametrize("fts_enabled", [True, False])
+def test_paginated_text_search_in_transcription(owner, fts_enabled):
+    if fts_enabled and not app.config.get("TRANSCRIPTION_FTS_ENABLED"):
+        pytest.skip("trigram transcript index not available")
+    marker = f"Quarterly{uuid.uuid4().hex[:8]}"
+    with _db():
+        u = db.session.get(User, owner)
+        edited = make_recording(u, title="edited", transcription=f"old text {marker}")
+        kept_id = make_recording(u, title="kept", transcription=f"we discussed {marker} numbers").id
+        db.session.commit()
+        edited.transcription = "nothing relevant any more"
+        db.session.commit()
+        edited_id = edited.id
+
+    c = new_client()
+    login(c, owner)
+    with patch.dict(app.config, {"TRANSCRIPTION_FTS_ENABLED": fts_enabled}):
+        resp = c.get("/api/recordings", query_string={"q": marker.lower(), "per_page": 100})
+    ids = {r["id"] for r in resp.get_json()["recordings"]}
+    assert kept_id in ids
+    assert edited_id not in ids
+
+
+@pytest.mark.parametrize("fts_enabled", [True, False])
+@pytest.mark.parametrize("field", ["title", "transcription"])
+def test_paginated_text_search_treats_wildcards_literally(owner, fts_enabled, field):
+    marker = uuid.uuid4().hex[:8]
+    with _db():
+        u = db.session.get(User, owner)
+        ids = {}
+        for key, value in (("percent", f"{marker} up 50% now"), ("underscore", f"{marker} a_b"),
+                           ("plain", f"{marker} up 505 now ab")):
+            rec = make_recording(u, title=f"wild-{key}")
+            setattr(rec, field, value)
+            ids[rec.id] = key
+        db.session.commit()
+
+    c = new_client()
+    login(c, owner)
+
+    def keys(term):
+        with patch.dict(app.config, {"TRANSCRIPTION_FTS_ENABLED": fts_enabled}):
+            resp = c.get("/api/recordings", query_string={"q": term, "per_page": 100})
+        return {ids[r["id"]] for r in resp.get_json()["recordings"] if r["id"] in ids}
+
+    assert keys(f"{marker} up 50%") == {"percent"}
+    assert keys("a_b") == {"underscore"}
+
+
+def test_paginated_text_search_in_personal_notes(owner, other):
+    from src.models.sharing import InternalShare, SharedRecordingState
+    marker = f"pnote{uuid.uuid4().hex[:8]}"
+    with _db():
+        o = db.session.get(User, other)
+        noted = make_recording(o, title="noted-share")
+        owner_only = make_recording(o, title="owner-notes-share")
+        owner_only.notes = f"owner wrote {marker}"
+        for rec in (noted, owner_only):
+            db.session.add(InternalShare(recording_id=rec.id, owner_id=other,
+                                         shared_with_user_id=owner))
+        db.session.add(SharedRecordingState(recording_id=noted.id, user_id=owner,
+                                            personal_notes=f"my {marker} note"))
+        db.session.commit()
+        noted_id = noted.id
+
+    c = new_client()
+    login(c, owner)
+    with patch.object(rec_module, "ENABLE_INTERNAL_SHARING", True):
+        resp = c.get("/api/recordings", query_string={"q": marker, "per_page": 100})
+    assert [r["id"] for r in resp.get_json()["recordings"]] == [noted_id]
+
+
 def test_paginated_tag_filter(owner):
     tagname = f"covtag{uuid.uuid4().hex[:6]}"
     with _db():
@@ -367,6 +523,26 @@ def test_paginated_tag_filter(owner):
     assert untagged_id not in ids
 
 
+def test_paginated_tag_filter_matching_several_tags_lists_once(owner):
+    prefix = f"covmulti{uuid.uuid4().hex[:6]}"
+    with _db():
+        u = db.session.get(User, owner)
+        tags = [Tag(name=f"{prefix} {n}", user_id=u.id) for n in ("a", "b")]
+        db.session.add_all(tags)
+        db.session.commit()
+        rec = make_recording(u, title="multi-tagged")
+        for order, tag in enumerate(tags):
+            db.session.add(RecordingTag(recording_id=rec.id, tag_id=tag.id, order=order))
+        db.session.commit()
+        rid = rec.id
+
+    c = new_client()
+    login(c, owner)
+    body = c.get(f"/api/recordings?q=tag:{prefix}&per_page=100").get_json()
+    assert [r["id"] for r in body["recordings"]] == [rid]
+    assert body["pagination"]["total"] == 1
+
+
 def test_paginated_speaker_filter(owner):
     speaker = f"covspk{uuid.uuid4().hex[:6]}"
     with _db():
@@ -385,6 +561,275 @@ def test_paginated_speaker_filter(owner):
     assert nomatch_id not in ids
 
 
+def test_paginated_combined_filters(owner):
+    from datetime import datetime
+    speaker = f"covmix{uuid.uuid4().hex[:6]}"
+    with _db():
+        u = db.session.get(User, owner)
+        recs = {}
+        for key, when in (("in", datetime(2021, 3, 10)), ("early", datetime(2021, 2, 1)),
+                          ("late", datetime(2021, 5, 1))):
+            rec = make_recording(u, title=f"mix-{key}")
+            rec.participants = speaker
+            rec.meeting_date = when
+            recs[key] = rec.id
+        db.session.commit()
+
+    c = new_client()
+    login(c, owner)
+    q = f"Speaker:{speaker} DATE_FROM:2021-03-01 date_to:2021-03-31 mix"
+    resp = c.get("/api/recordings", query_string={"q": q, "per_page": 100})
+    ids = {r["id"] for r in resp.get_json()["recordings"]}
+    assert ids == {recs["in"]}
+
+
+@pytest.mark.parametrize("date_filter,expected", [
+    ("date:2019-07-04", {"day"}),
+    ("date:2019-07", {"day", "month"}),
+    ("date:2019", {"day", "month", "year"}),
+    ("date:2019-07-04 date:2020", {"day", "other"}),
+    ("date:2019-13 date:2019-01", {"year"}),
+])
+def test_paginated_literal_date_filters(owner, date_filter, expected):
+    from datetime import datetime
+    speaker = f"covdate{uuid.uuid4().hex[:6]}"
+    with _db():
+        u = db.session.get(User, owner)
+        recs = {}
+        for key, when in (("day", datetime(2019, 7, 4, 9)), ("month", datetime(2019, 7, 20)),
+                          ("year", datetime(2019, 1, 2)), ("other", datetime(2020, 7, 4))):
+            rec = make_recording(u, title=f"date-{key}")
+            rec.participants = speaker
+            rec.meeting_date = when
+            recs[rec.id] = key
+        db.session.commit()
+
+    c = new_client()
+    login(c, owner)
+    resp = c.get("/api/recordings", query_string={"q": f"speaker:{speaker} {date_filter}", "per_page": 100})
+    assert {recs[r["id"]] for r in resp.get_json()["recordings"]} == expected
+
+
+def test_paginated_date_range_bounds(owner):
+    from datetime import datetime, timedelta
+    speaker = f"covrange{uuid.uuid4().hex[:6]}"
+    now = datetime.now()
+    with _db():
+        u = db.session.get(User, owner)
+        recs = {}
+        for key, meeting, created in (
+            ("late", datetime(2019, 7, 4, 23, 59), None),
+            ("next", datetime(2019, 7, 5, 0, 0), None),
+            ("today", now, None),
+            ("yesterday", None, now - timedelta(days=1)),
+        ):
+            rec = make_recording(u, title=f"range-{key}")
+            rec.participants = speaker
+            rec.meeting_date = meeting
+            if created is not None:
+                rec.created_at = created
+            recs[rec.id] = key
+        db.session.commit()
+
+    c = new_client()
+    login(c, owner)
+
+    def keys(extra):
+        resp = c.get("/api/recordings", query_string={"q": f"speaker:{speaker} {extra}", "per_page": 100})
+        return {recs[r["id"]] for r in resp.get_json()["recordings"]}
+
+    assert keys("date_from:2019-07-04 date_to:2019-07-04") == {"late"}
+    assert keys("date:today") == {"today"}
+    assert keys("date:yesterday") == {"yesterday"}
+
+
+def test_paginated_sort_by_meeting_date_falls_back_to_created(owner):
+    from datetime import datetime
+    speaker = f"covsort{uuid.uuid4().hex[:6]}"
+    with _db():
+        u = db.session.get(User, owner)
+        ids = {}
+        for key, meeting, created in (
+            ("old-meeting", datetime(2018, 1, 1), datetime(2023, 1, 1)),
+            ("uploaded", None, datetime(2020, 6, 1)),
+            ("new-meeting", datetime(2021, 1, 1), datetime(2019, 1, 1)),
+        ):
+            rec = make_recording(u, title=key)
+            rec.participants = speaker
+            rec.meeting_date = meeting
+            rec.created_at = created
+            ids[rec.id] = key
+        db.session.commit()
+
+    c = new_client()
+    login(c, owner)
+    resp = c.get("/api/recordings", query_string={"q": f"speaker:{speaker}", "sort_by": "meeting_date", "per_page": 100})
+    assert [ids[r["id"]] for r in resp.get_json()["recordings"]] == ["new-meeting", "uploaded", "old-meeting"]
+
+
+def test_paginated_total_on_every_page(owner):
+    speaker = f"covtotal{uuid.uuid4().hex[:6]}"
+    with _db():
+        u = db.session.get(User, owner)
+        for i in range(5):
+            make_recording(u, title=f"total-{i}").participants = speaker
+        db.session.commit()
+
+    c = new_client()
+    login(c, owner)
+
+    def page(n):
+        resp = c.get("/api/recordings", query_string={"q": f"speaker:{speaker}", "per_page": 2, "page": n})
+        return resp.get_json()
+
+    for n, size in ((1, 2), (3, 1), (4, 0)):
+        body = page(n)
+        assert len(body["recordings"]) == size
+        assert body["pagination"]["total"] == 5
+        assert body["pagination"]["total_pages"] == 3
+    assert page(3)["pagination"]["has_next"] is False
+
+
+@pytest.mark.parametrize("sort_by", ["created_at", "meeting_date"])
+def test_paginated_cursor_walks_same_order_as_pages(owner, sort_by):
+    from datetime import datetime
+    speaker = f"covcursor{uuid.uuid4().hex[:6]}"
+    stamp = datetime(2024, 5, 1, 9, 30, 15, 250000)
+    with _db():
+        u = db.session.get(User, owner)
+        for i in range(5):
+            rec = make_recording(u, title=f"cursor-{i}")
+            rec.participants = speaker
+            rec.created_at = stamp  # ties are broken by id
+            rec.meeting_date = datetime(2024, 1, 1 + i) if i % 2 else None
+        db.session.commit()
+
+    c = new_client()
+    login(c, owner)
+    query = {"q": f"speaker:{speaker}", "sort_by": sort_by, "per_page": 2}
+    expected = [r["id"] for r in c.get("/api/recordings", query_string={**query, "per_page": 10})
+                .get_json()["recordings"]]
+
+    first = c.get("/api/recordings", query_string=query).get_json()
+    walked = [r["id"] for r in first["recordings"]]
+    cursor = first["pagination"]["next_cursor"]
+    while cursor:
+        body = c.get("/api/recordings", query_string={**query, "after": cursor}).get_json()
+        walked += [r["id"] for r in body["recordings"]]
+        cursor = body["pagination"]["next_cursor"]
+        assert body["pagination"]["has_next"] is (cursor is not None)
+    assert len(expected) == 5
+    assert walked == expected
+
+
+def test_paginated_cursor_pages_across_migrated_meeting_dates(owner):
+    """Rows written by the DATE->DATETIME migration are stored without
+    microseconds; once init_db normalizes them the cursor row is not
+    repeated on the next page."""
+    from sqlalchemy import text
+    from src.utils import normalize_sqlite_datetimes
+    speaker = f"covmigr{uuid.uuid4().hex[:6]}"
+    with _db():
+        u = db.session.get(User, owner)
+        ids = []
+        for i in range(3):
+            rec = make_recording(u, title=f"migrated-{i}")
+            rec.participants = speaker
+            ids.append(rec.id)
+        db.session.commit()
+        if db.engine.name != "sqlite":
+            pytest.skip("SQLite stores DATETIME as text")
+        # What the legacy migration wrote: datetime(date(d) || ' 12:00:00')
+        for i, rid in enumerate(ids):
+            db.session.execute(text(
+                "UPDATE recording SET meeting_date = :d WHERE id = :id"
+            ), {"d": f"2023-06-0{i + 1} 12:00:00", "id": rid})
+        db.session.commit()
+        assert normalize_sqlite_datetimes(db.engine, "recording", ["meeting_date"]) >= 3
+        stored = db.session.execute(text(
+            "SELECT meeting_date FROM recording WHERE id = :id"), {"id": ids[0]}).scalar()
+        assert stored == "2023-06-01 12:00:00.000000"
+        # Idempotent: normalized values are left alone
+        assert normalize_sqlite_datetimes(db.engine, "recording", ["meeting_date"]) == 0
+
+    c = new_client()
+    login(c, owner)
+    query = {"q": f"speaker:{speaker}", "sort_by": "meeting_date", "per_page": 1}
+    body = c.get("/api/recordings", query_string=query).get_json()
+    walked = [r["id"] for r in body["recordings"]]
+    cursor = body["pagination"]["next_cursor"]
+    while cursor and len(walked) < 10:
+        body = c.get("/api/recordings", query_string={**query, "after": cursor}).get_json()
+        walked += [r["id"] for r in body["recordings"]]
+        cursor = body["pagination"]["next_cursor"]
+    assert walked == list(reversed(ids))
+
+
+def test_paginated_invalid_cursor_is_400(owner):
+    c = new_client()
+    login(c, owner)
+    assert c.get("/api/recordings", query_string={"after": "not-a-cursor"}).status_code == 400
+
+
+def test_paginated_query_count_independent_of_page_size(owner, other):
+    """Serializing a page batches tags, folders, share counts and duplicate
+    info, so a bigger page issues no extra statements."""
+    from sqlalchemy import event
+    from src.models.sharing import InternalShare
+
+    speaker = f"covqueries{uuid.uuid4().hex[:6]}"
+    with _db():
+        u = db.session.get(User, owner)
+        for i in range(6):
+            folder = Folder(name=f"qf-{speaker}-{i}", user_id=owner)
+            tag = Tag(name=f"qt-{i}", user_id=owner)
+            db.session.add_all([folder, tag])
+            db.session.commit()
+            rec = make_recording(u, title=f"queries-{i}", folder_id=folder.id)
+            rec.participants = speaker
+            rec.file_hash = f"{speaker}-{i % 3}"
+            db.session.add(RecordingTag(recording_id=rec.id, tag_id=tag.id, order=1))
+            db.session.add(InternalShare(recording_id=rec.id, owner_id=owner,
+                                         shared_with_user_id=other))
+        db.session.commit()
+        engine = db.engine
+
+    c = new_client()
+    login(c, owner)
+
+    def statements_for(per_page):
+        statements = []
+
+        def capture(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            body = c.get("/api/recordings", query_string={
+                "q": f"speaker:{speaker}", "per_page": per_page}).get_json()
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+        assert len(body["recordings"]) == per_page
+        rec = body["recordings"][0]
+        assert rec["folder"]["recording_count"] == 1
+        assert rec["tags"][0]["recording_count"] == 1
+        assert rec["shared_with_count"] == 1
+        assert rec["duplicate_info"]["total_copies"] == 2
+        return len(statements)
+
+    assert statements_for(2) == statements_for(6)
+
+
+@pytest.mark.parametrize("page,per_page,expected", [(0, 2, (1, 2)), (-3, 0, (1, 1)), (1, -5, (1, 1)), (1, 10**6, (1, 100))])
+def test_paginated_clamps_page_and_per_page(owner, page, per_page, expected):
+    c = new_client()
+    login(c, owner)
+    resp = c.get("/api/recordings", query_string={"page": page, "per_page": per_page})
+    assert resp.status_code == 200
+    pagination = resp.get_json()["pagination"]
+    assert (pagination["page"], pagination["per_page"]) == expected
+
+
 def test_paginated_requires_login():
     c = new_client()
     resp = c.get("/api/recordings")
@@ -578,6 +1023,74 @@ def test_batch_status_too_many(owner):
     assert resp.status_code == 400
 
 
+def test_job_queue_status_batches_titles_and_positions(owner):
+    """Titles come from one recording query and queue positions from one
+    active-jobs query, however many jobs the user has."""
+    from datetime import datetime, timedelta
+    from sqlalchemy import event
+    from src.models import ProcessingJob
+
+    base = datetime.utcnow() - timedelta(minutes=30)
+    with _db():
+        u = db.session.get(User, owner)
+        recs = [make_recording(u, title=f"queued-{i}") for i in range(4)]
+        jobs = [
+            ProcessingJob(user_id=owner, recording_id=recs[0].id, job_type="transcribe",
+                          status="processing", created_at=base),
+            ProcessingJob(user_id=owner, recording_id=recs[1].id, job_type="transcribe",
+                          status="queued", created_at=base + timedelta(seconds=1)),
+            ProcessingJob(user_id=owner, recording_id=recs[2].id, job_type="prepare_audio",
+                          status="queued", created_at=base + timedelta(seconds=2)),
+            ProcessingJob(user_id=owner, recording_id=recs[3].id, job_type="summarize",
+                          status="queued", created_at=base + timedelta(seconds=3)),
+        ]
+        db.session.add_all(jobs)
+        db.session.commit()
+        job_ids = [j.id for j in jobs]
+
+        def expected_position(job, job_types):
+            ahead = ProcessingJob.query.filter(
+                ProcessingJob.status == "queued", ProcessingJob.job_type.in_(job_types),
+                ProcessingJob.created_at < job.created_at).count()
+            running = ProcessingJob.query.filter(
+                ProcessingJob.status == "processing", ProcessingJob.job_type.in_(job_types)).count()
+            return ahead + running + 1
+
+        from src.services.job_queue import TRANSCRIPTION_JOBS, SUMMARY_JOBS
+        expected = {
+            job_ids[1]: expected_position(jobs[1], TRANSCRIPTION_JOBS),
+            job_ids[2]: expected_position(jobs[2], TRANSCRIPTION_JOBS),
+            job_ids[3]: expected_position(jobs[3], SUMMARY_JOBS),
+        }
+        engine = db.engine
+
+    c = new_client()
+    login(c, owner)
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        resp = c.get("/api/recordings/job-queue-status")
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    assert resp.status_code == 200
+    by_id = {j["id"]: j for j in resp.get_json()["jobs"]}
+    assert by_id[job_ids[0]]["position"] is None
+    assert by_id[job_ids[1]]["recording_title"] == "queued-1"
+    for jid, position in expected.items():
+        assert by_id[jid]["position"] == position
+    assert by_id[job_ids[2]]["position"] == by_id[job_ids[1]]["position"] + 1
+    assert len([s for s in statements if "FROM recording" in s]) == 1
+    assert len([s for s in statements if "count(" in s.lower()]) == 0
+
+    with _db():
+        ProcessingJob.query.filter(ProcessingJob.id.in_(job_ids)).delete()
+        db.session.commit()
+
+
 # =========================================================================== #
 # AUDIO delivery
 # =========================================================================== #
@@ -603,6 +1116,36 @@ def test_audio_local_send_file(owner):
         os.remove(path)
 
 
+def test_audio_local_range_and_x_sendfile(owner):
+    """Seeks are answered with 206 partial content, and AUDIO_X_SENDFILE
+    hands the file to the web server instead of sending the body."""
+    fd, path = tempfile.mkstemp(suffix=".mp3")
+    os.write(fd, b"ID3fakeaudio")
+    os.close(fd)
+    try:
+        with _db():
+            u = db.session.get(User, owner)
+            rid = make_recording(u, title="audio-range").id
+
+        storage = FakeStorage(delivery=_Delivery(mode="local_file", local_path=path))
+        c = new_client()
+        login(c, owner)
+        with use_storage(storage):
+            resp = c.get(f"/audio/{rid}", headers={"Range": "bytes=3-6"})
+            assert resp.status_code == 206
+            assert resp.data == b"fake"
+            assert resp.headers["Content-Range"] == "bytes 3-6/12"
+            assert "ETag" in resp.headers and "Last-Modified" in resp.headers
+
+            with patch.dict(app.config, {"AUDIO_X_SENDFILE": True}):
+                resp = c.get(f"/audio/{rid}")
+            assert resp.status_code == 200
+            assert resp.headers["X-Sendfile"] == path
+            assert resp.data == b""
+    finally:
+        os.remove(path)
+
+
 def test_audio_s3_redirect(owner):
     with _db():
         u = db.session.get(User, owner)
@@ -710,6 +1253,27 @@ def test_reprocess_transcription_enqueues(owner):
     assert call["params"]["min_speakers"] == 2
 
 
+def test_reprocess_transcription_clears_events(owner):
+    from datetime import datetime
+    from src.models.events import Event
+    with _db():
+        u = db.session.get(User, owner)
+        rid = make_recording(u, status="COMPLETED").id
+        keep_rid = make_recording(u, status="COMPLETED").id
+        for r in (rid, rid, keep_rid):
+            db.session.add(Event(recording_id=r, title="standup", start_datetime=datetime(2024, 1, 1)))
+        db.session.commit()
+
+    c = new_client()
+    login(c, owner)
+    with use_storage(FakeStorage(exists=True)), capture_enqueue():
+        resp = c.post(f"/recording/{rid}/reprocess_transcription", json={})
+    assert resp.status_code in (200, 202)
+    with _db():
+        assert Event.query.filter_by(recording_id=rid).count() == 0
+        assert Event.query.filter_by(recording_id=keep_rid).count() == 1
+
+
 def test_reprocess_transcription_non_owner_denied(owner, other):
     with _db():
         u = db.session.get(User, owner)
@@ -1211,6 +1775,21 @@ def test_download_transcript_plain_text_returned_verbatim(owner):
     assert "_formatted" not in cd
 
 
+def test_download_transcript_utf8_body_and_length(owner):
+    """The body is UTF-8 text/plain with a byte-accurate Content-Length."""
+    with _db():
+        u = db.session.get(User, owner)
+        rid = make_recording(u, transcription="réunion 会议").id
+
+    c = new_client()
+    login(c, owner)
+    resp = c.get(f"/recording/{rid}/download/transcript")
+    assert resp.status_code == 200
+    assert resp.headers["Content-Type"] == "text/plain; charset=utf-8"
+    assert resp.data == "réunion 会议".encode("utf-8")
+    assert int(resp.headers["Content-Length"]) == len(resp.data)
+
+
 def test_download_transcript_diarized_no_template_basic_format(owner):
     """A diarized transcript with no template uses the basic `[speaker]: text`
     format and a `_formatted` filename.
@@ -1286,6 +1865,24 @@ def test_download_transcript_explicit_template_id(owner):
     assert "DEF " not in body
 
 
+def test_download_transcript_ignores_other_users_template(owner, other):
+    """A template_id belonging to someone else falls back to the basic format."""
+    with _db():
+        o = db.session.get(User, other)
+        foreign_id = _make_template(o, name="TheirTmpl", template="THEIRS {{text}}").id
+        u = db.session.get(User, owner)
+        rid = make_recording(u, transcription=_diarized_json(), title="diar-foreign").id
+
+    c = new_client()
+    login(c, owner)
+    resp = c.get(f"/recording/{rid}/download/transcript?template_id={foreign_id}")
+    assert resp.status_code == 200
+    body = resp.data.decode()
+    assert "[Alice]: Hello there" in body
+    assert "THEIRS" not in body
+    assert "TheirTmpl" not in resp.headers.get("Content-Disposition", "")
+
+
 # --- /download/summary : content-presence guard (line 303) ---------------- #
 
 def test_download_summary_empty_400(owner):
@@ -1324,6 +1921,166 @@ def test_download_summary_present_returns_docx(owner):
     assert len(resp.data) > 0
 
 
+def test_download_summary_docx_streams_with_content_length(owner):
+    """The .docx is served from a spooled temp file with an exact Content-Length."""
+    with _db():
+        u = db.session.get(User, owner)
+        rid = make_recording(u, summary="Plain summary.").id
+
+    c = new_client()
+    login(c, owner)
+    resp = c.get(f"/recording/{rid}/download/summary")
+    assert resp.status_code == 200
+    assert resp.data[:2] == b"PK"
+    assert int(resp.headers["Content-Length"]) == len(resp.data)
+
+    partial = c.get(f"/recording/{rid}/download/summary", headers={"Range": "bytes=0-9"})
+    assert partial.status_code == 206
+    assert partial.data == resp.data[:10]
+
+
+def test_download_summary_non_ascii_title_uses_unicode_font(owner):
+    """Non-ASCII headings get the Arial/eastAsia font; ASCII paragraphs keep the default."""
+    import io
+    import docx
+
+    with _db():
+        u = db.session.get(User, owner)
+        rid = make_recording(u, title="会议记录", summary="Plain summary.\n\n**重点** and more").id
+
+    c = new_client()
+    login(c, owner)
+    resp = c.get(f"/recording/{rid}/download/summary")
+    assert resp.status_code == 200
+    document = docx.Document(io.BytesIO(resp.data))
+    heading = document.paragraphs[0]
+    assert heading.text.endswith("会议记录")
+    assert all(run.font.name == "Arial" for run in heading.runs)
+    east_asia = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}eastAsia"
+    assert all(run._element.rPr.rFonts.get(east_asia) == "Arial" for run in heading.runs)
+    bold = next(r for p in document.paragraphs for r in p.runs if r.text == "重点")
+    assert bold.bold and bold.font.name == "Arial"
+    assert bold._element.rPr.rFonts.get(east_asia) == "Arial"
+    uploaded = next(p for p in document.paragraphs if p.text.startswith("Uploaded:"))
+    assert all(run.font.name is None for run in uploaded.runs)
+
+
+def test_download_summary_large_is_built_in_background(owner, other):
+    """Over the threshold the summary export returns 202 and a pollable file URL."""
+    with _db():
+        u = db.session.get(User, owner)
+        rid = make_recording(u, title="Big", summary="# Heading\n\n" + "word " * 50).id
+
+    c = new_client()
+    login(c, owner)
+    with patch.object(rec_module, "DOCX_BACKGROUND_THRESHOLD", 10):
+        resp = c.get(f"/recording/{rid}/download/summary")
+    assert resp.status_code == 202
+    body = resp.get_json()
+    job_id, file_url = body["job_id"], body["file_url"]
+    assert file_url == f"/recording/{rid}/download/{job_id}/file"
+
+    # Another user cannot collect it
+    intruder = new_client()
+    login(intruder, other)
+    assert intruder.get(file_url).status_code == 404
+
+    done = _poll_docx_job(c, file_url)
+    assert done.status_code == 200
+    assert done.data[:2] == b"PK"
+    assert 'filename="summary-Big.docx"' in done.headers["Content-Disposition"]
+    # Collected jobs are forgotten, files included
+    assert c.get(file_url).status_code == 404
+    with app.test_request_context():
+        assert not [n for n in os.listdir(rec_module._docx_job_dir()) if n.startswith(job_id)]
+
+
+def _poll_docx_job(client, file_url, timeout=30):
+    import time
+    deadline = time.monotonic() + timeout
+    resp = client.get(file_url)
+    while resp.status_code == 202 and time.monotonic() < deadline:
+        time.sleep(0.05)
+        resp = client.get(file_url)
+    return resp
+
+
+def test_docx_job_is_shared_through_files_not_process_memory(owner):
+    """A job is visible to any worker: its state is files in the staging dir,
+    so a fresh executor (another process) can still serve it, and an expired
+    or failed job is reported and cleaned up."""
+    with _db():
+        u = db.session.get(User, owner)
+        rid = make_recording(u, title="Shared", summary="# Heading\n\n" + "word " * 50).id
+
+    c = new_client()
+    login(c, owner)
+    with patch.object(rec_module, "DOCX_BACKGROUND_THRESHOLD", 10):
+        job_id = c.get(f"/recording/{rid}/download/summary").get_json()["job_id"]
+    file_url = f"/recording/{rid}/download/{job_id}/file"
+    assert _poll_docx_job(c, file_url).status_code == 200
+
+    # A build failure is written next to the job and surfaces as a 500
+    with patch.object(rec_module, "DOCX_BACKGROUND_THRESHOLD", 10), \
+         patch.object(rec_module, "_build_markdown_docx", side_effect=RuntimeError("boom")):
+        job_id = c.get(f"/recording/{rid}/download/summary").get_json()["job_id"]
+        failed = _poll_docx_job(c, f"/recording/{rid}/download/{job_id}/file")
+    assert failed.status_code == 500
+
+    # Past the TTL a job is gone, even when another worker never built it
+    with app.test_request_context():
+        job_dir = rec_module._docx_job_dir()
+    stale_id = uuid.uuid4().hex
+    meta = os.path.join(job_dir, f"{stale_id}.json")
+    with open(meta, "w") as f:
+        json.dump({"user_id": owner, "recording_id": rid, "filename": "x.docx"}, f)
+    assert c.get(f"/recording/{rid}/download/{stale_id}/file").status_code == 202
+    old = os.path.getmtime(meta) - rec_module.DOCX_JOB_TTL_SECONDS - 1
+    os.utime(meta, (old, old))
+    assert c.get(f"/recording/{rid}/download/{stale_id}/file").status_code == 404
+    assert not os.path.exists(meta)
+    assert c.get(f"/recording/{rid}/download/not-a-job/file").status_code == 404
+
+
+def test_download_summary_does_not_load_transcription(owner):
+    """The Word export selects only the columns it needs, not the transcript."""
+    from sqlalchemy import event
+
+    with _db():
+        u = db.session.get(User, owner)
+        rid = make_recording(u, summary="Short.").id
+        engine = db.engine
+
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    c = new_client()
+    login(c, owner)
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        resp = c.get(f"/recording/{rid}/download/summary")
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    assert resp.status_code == 200
+    recording_selects = [st for st in statements if "FROM recording" in st]
+    assert recording_selects
+    assert not any("recording.transcription" in st for st in recording_selects)
+
+
+def test_download_summary_filename_sanitized(owner):
+    """Reserved filename characters are dropped and whitespace/dash runs collapse."""
+    with _db():
+        u = db.session.get(User, owner)
+        rid = make_recording(u, title='Q3: plan / "draft"  -- v2?').id
+
+    c = new_client()
+    login(c, owner)
+    resp = c.get(f"/recording/{rid}/download/summary")
+    assert resp.headers["Content-Disposition"] == 'attachment; filename="summary-Q3-plan-draft-v2.docx"'
+
+
 # --- /download/chat : messages-presence guard (line 421) ------------------ #
 
 def test_download_chat_empty_messages_400(owner):
@@ -1378,6 +2135,10 @@ def test_download_chat_with_messages_returns_docx(owner):
     assert resp.status_code == 200
     assert "wordprocessingml" in resp.headers["Content-Type"]
     assert len(resp.data) > 0
+    # One-off document from the POST body: sized, not cacheable, no ranges
+    assert int(resp.headers["Content-Length"]) == len(resp.data)
+    assert "no-cache" in resp.headers["Cache-Control"]
+    assert "Accept-Ranges" not in resp.headers
 
 
 # --- ENABLE_INQUIRE_MODE gate on the async reindex helper (line 118) ------- #
@@ -17,6 +17,7 @@ created. No assertions on global counts of all recordings.
 """
 
 import io
+import json
 import os
 import sys
 import uuid
@@ -26,7 +27,7 @@ from unittest.mock import patch, MagicMock
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.app import app, db
-from src.models import User, Recording, Tag, Folder, RecordingTag, SystemSetting
+from src.models import User, Recording, Tag, Folder, RecordingTag, SystemSetting, Speaker
 
 app.config["WTF_CSRF_ENABLED"] = False
 
@@ -108,6 +109,7 @@ class _FakeStorage:
     def __init__(self, staging_dir):
         self._staging = staging_dir
         self.uploaded = []
+        self.deleted = []
 
     def get_staging_dir(self):
         os.makedirs(self._staging, exist_ok=True)
@@ -120,28 +122,22 @@ class _FakeStorage:
         self.uploaded.append((local_path, key))
         return _FakeStoredObject(locator=f"local://{key}", key=key)
 
+    def delete(self, locator, missing_ok=True):
+        self.deleted.append(locator)
+        return True
+
 
 @contextmanager
 def _upload_mocks(staging_dir, has_video=False, audio_codec="mp3"):
-    """Patch all external upload effects. convert_if_needed returns the input
-    path untouched (no conversion); storage is faked so no file moves."""
+    """Patch all external upload effects. Conversion is deferred to the
+    (mocked) transcription job; storage is faked so no file moves."""
     fake_storage = _FakeStorage(staging_dir)
 
-    def _convert(filepath, **kwargs):
-        result = MagicMock()
-        result.output_path = filepath
-        result.was_converted = False
-        result.was_compressed = False
-        result.original_codec = audio_codec
-        result.final_codec = audio_codec
-        result.size_reduction_percent = 0.0
-        return result
-
     with patch("src.api.recordings.get_storage_service", return_value=fake_storage), \
+         patch("src.api.recordings.probe", return_value={}), \
          patch("src.api.recordings.get_codec_info",
                return_value={"has_video": has_video, "audio_codec": audio_codec,
                              "video_codec": "h264" if has_video else None, "duration": 12.0}), \
-         patch("src.api.recordings.convert_if_needed", side_effect=_convert), \
          patch("src.api.recordings.get_duration", return_value=12.0), \
          patch("src.api.recordings.get_creation_date", return_value=None), \
          patch("src.services.job_queue.job_queue.enqueue", return_value=1) as enqueue_mock:
@@ -192,16 +188,69 @@ def test_upload_creates_recording_row_with_locator_and_enqueues():
         assert rec.audio_path is not None and rec.audio_path.startswith("local://")
         assert storage.uploaded  # upload_local_file was invoked
         assert rec.file_hash is not None
-        assert rec.audio_duration_seconds == 12.0
-        # Enqueued a transcribe job for this recording
+        # Probing and conversion are left to the prepare_audio job, which
+        # then queues the transcription
+        assert rec.audio_duration_seconds is None
         assert enqueue.called
         kwargs = enqueue.call_args.kwargs
         assert kwargs["recording_id"] == rec.id
-        assert kwargs["job_type"] == "transcribe"
+        assert kwargs["job_type"] == "prepare_audio"
         assert kwargs["is_new_upload"] is True
         _cleanup(rec, user)
 
 
+def test_upload_commits_recording_and_job_together():
+    from src.models import ProcessingJob
+    from src.services.job_queue import job_queue
+    with app.app_context():
+        user = _mk_user("up_tx")
+        client = app.test_client()
+        _login(client, user)
+        staging = os.path.join(app.config["UPLOAD_FOLDER"], f"stg_{uuid.uuid4().hex[:6]}")
+        fake_storage = _FakeStorage(staging)
+        # A real enqueue, as wired up by startup (init_app), minus the workers
+        with patch("src.api.recordings.get_storage_service", return_value=fake_storage), \
+             patch("src.api.recordings.probe", return_value={}), \
+             patch("src.api.recordings.get_codec_info", return_value={"has_video": False, "audio_codec": "mp3"}), \
+             patch("src.api.recordings.get_duration", return_value=12.0), \
+             patch.object(job_queue, "_app", app), \
+             patch.object(job_queue, "_running", True):
+            resp = _do_upload(client)
+            assert resp.status_code == 202, resp.data
+            db.session.expire_all()
+            rec = _latest_rec(user)
+            assert rec.status == "QUEUED"
+            job = ProcessingJob.query.filter_by(recording_id=rec.id).one()
+            assert job.job_type == "prepare_audio" and job.status == "queued"
+
+            # A failure while queueing rolls back the recording and its file
+            with patch.object(job_queue, "enqueue", side_effect=RuntimeError("queue down")):
+                resp = _do_upload(client, filename="second.mp3")
+            assert resp.status_code == 500
+            db.session.expire_all()
+            assert _latest_rec(user).id == rec.id
+            assert fake_storage.deleted == [f"local://{fake_storage.uploaded[1][1]}"]
+        _cleanup(job, rec, user)
+
+
+def test_upload_hash_matches_saved_bytes():
+    import hashlib
+    payload = os.urandom(3 * 1024 * 1024 + 17)  # spans several copy chunks
+    with app.app_context():
+        user = _mk_user("up_hash")
+        client = app.test_client()
+        _login(client, user)
+        staging = os.path.join(app.config["UPLOAD_FOLDER"], f"stg_{uuid.uuid4().hex[:6]}")
+        with _upload_mocks(staging) as (storage, _):
+            resp = _do_upload(client, payload=payload)
+        assert resp.status_code == 202, resp.data
+        rec = _latest_rec(user)
+        assert rec.file_hash == hashlib.sha256(payload).hexdigest()
+        with open(storage.uploaded[0][0], "rb") as f:
+            assert f.read() == payload
+        _cleanup(rec, user)
+
+
 def test_upload_default_title_is_placeholder():
     with app.app_context():
         user = _mk_user("up_title")
@@ -301,6 +350,7 @@ def test_upload_with_tags_creates_associations_in_order():
                   .order_by(RecordingTag.order).all())
         assert [a.tag_id for a in assocs] == [tag1.id, tag2.id]
         assert [a.order for a in assocs] == [1, 2]
+        assert len({a.added_at for a in assocs}) == 1  # one timestamp per upload
         # First tag id is passed to the job
         assert enqueue.call_args.kwargs["params"]["tag_id"] == tag1.id
         for a in assocs:
@@ -344,6 +394,41 @@ def test_upload_other_users_tag_is_ignored():
         _cleanup(rec, foreign_tag, owner, other)
 
 
+def test_upload_tags_filtered_in_order_with_group_membership():
+    from src.models import Group, GroupMembership
+    with app.app_context():
+        owner = _mk_user("up_gtag")
+        other = _mk_user("up_gtag_o")
+        member_group = Group(name=f"g_{uuid.uuid4().hex[:6]}")
+        other_group = Group(name=f"g_{uuid.uuid4().hex[:6]}")
+        db.session.add_all([member_group, other_group])
+        db.session.commit()
+        membership = GroupMembership(group_id=member_group.id, user_id=owner.id, role="member")
+        db.session.add(membership)
+        db.session.commit()
+        own = _mk_tag(owner)
+        group_tag = _mk_tag(other, group_id=member_group.id)
+        outside_tag = _mk_tag(other, group_id=other_group.id)
+        client = app.test_client()
+        _login(client, owner)
+        staging = os.path.join(app.config["UPLOAD_FOLDER"], f"stg_{uuid.uuid4().hex[:6]}")
+        with _upload_mocks(staging):
+            resp = _do_upload(client, **{"tag_ids[0]": str(group_tag.id),
+                                         "tag_ids[1]": str(outside_tag.id),
+                                         "tag_ids[2]": "nope",
+                                         "tag_ids[3]": str(own.id),
+                                         "tag_ids[4]": str(group_tag.id)})
+        assert resp.status_code == 202
+        rec = _latest_rec(owner)
+        assocs = (RecordingTag.query.filter_by(recording_id=rec.id)
+                  .order_by(RecordingTag.order).all())
+        assert [a.tag_id for a in assocs] == [group_tag.id, own.id]
+        for a in assocs:
+            db.session.delete(a)
+        db.session.commit()
+        _cleanup(rec, own, group_tag, outside_tag, membership, member_group, other_group, owner, other)
+
+
 def test_upload_with_folder_sets_folder_id():
     with app.app_context():
         user = _mk_user("up_fld")
@@ -563,26 +648,60 @@ def test_upload_requires_login():
         assert resp.status_code in (302, 401)
 
 
-def test_upload_ffmpeg_error_returns_500():
+def test_upload_defers_conversion_to_job():
     with app.app_context():
-        user = _mk_user("up_ffmpeg")
+        user = _mk_user("up_defer")
         client = app.test_client()
         _login(client, user)
         staging = os.path.join(app.config["UPLOAD_FOLDER"], f"stg_{uuid.uuid4().hex[:6]}")
-        from src.utils.ffmpeg_utils import FFmpegError
-        fake_storage = _FakeStorage(staging)
-        with patch("src.api.recordings.get_storage_service", return_value=fake_storage), \
-             patch("src.api.recordings.get_codec_info",
-                   return_value={"has_video": False, "audio_codec": "flac"}), \
-             patch("src.api.recordings.convert_if_needed",
-                   side_effect=FFmpegError("boom")), \
-             patch("src.services.job_queue.job_queue.enqueue", return_value=1):
+        with _upload_mocks(staging, audio_codec="flac") as (_, enqueue_mock):
             resp = _do_upload(client, filename="a.flac")
-        assert resp.status_code == 500
-        # An error payload is returned; the exact wording (convert-specific vs
-        # the generic upload handler) is an implementation detail.
-        assert resp.get_json().get("error")
-        _cleanup(user)
+        assert resp.status_code == 202
+        params = enqueue_mock.call_args.kwargs["params"]
+        assert params["convert_upload"] == {"asr_endpoint": False}
+        _cleanup(_latest_rec(user), user)
+
+
+def test_upload_probes_once_and_types_file_by_content():
+    """A single ffprobe run feeds the codec info, the MIME type (from the
+    container, not the client's extension) and the creation date."""
+    from datetime import datetime
+    with app.app_context():
+        user = _mk_user("up_probe")
+        client = app.test_client()
+        _login(client, user)
+        staging = os.path.join(app.config["UPLOAD_FOLDER"], f"stg_{uuid.uuid4().hex[:6]}")
+        probe_data = {
+            "format": {"format_name": "wav", "duration": "7.5",
+                       "tags": {"creation_time": "2024-03-05T10:20:30.000000Z"}},
+            "streams": [{"codec_type": "audio", "codec_name": "pcm_s16le"}],
+        }
+        with patch("src.api.recordings.get_storage_service", return_value=_FakeStorage(staging)), \
+             patch("src.api.recordings.probe", return_value=probe_data) as probe_mock, \
+             patch("src.services.job_queue.job_queue.enqueue", return_value=1):
+            resp = _do_upload(client, filename="misnamed.mp3")
+        assert resp.status_code == 202, resp.data
+        probe_mock.assert_called_once()
+        rec = _latest_rec(user)
+        assert rec.mime_type == "audio/wav"
+        assert rec.meeting_date.replace(microsecond=0) == datetime(2024, 3, 5, 10, 20, 30)
+        _cleanup(rec, user)
+
+
+def test_upload_audio_only_video_caps_converted_size():
+    with app.app_context():
+        user = _mk_user("up_cap")
+        client = app.test_client()
+        _login(client, user)
+        staging = os.path.join(app.config["UPLOAD_FOLDER"], f"stg_{uuid.uuid4().hex[:6]}")
+        with _upload_mocks(staging, has_video=True, audio_codec="aac") as (_, enqueue_mock), \
+             patch("src.api.recordings.chunking_service", None):
+            resp = _do_upload(client, filename="talk.mp4", keep_audio_only="true")
+        assert resp.status_code == 202
+        convert_upload = enqueue_mock.call_args.kwargs["params"]["convert_upload"]
+        regular_mb = int(SystemSetting.get_setting("max_file_size_mb", 250))
+        assert convert_upload["size_limit_bytes"] == regular_mb * 1024 * 1024
+        _cleanup(_latest_rec(user), user)
 
 
 # --------------------------------------------------------------------------- #
@@ -684,6 +803,33 @@ def test_update_transcription_sets_field():
         _cleanup(rec, user)
 
 
+def test_update_transcript_relabels_and_sets_participants():
+    with app.app_context():
+        user = _mk_user("ut_tx")
+        client = app.test_client()
+        _login(client, user)
+        rec = _mk_recording(user)
+        transcript = [
+            {"speaker": "SPEAKER_00", "sentence": "hi"},
+            {"speaker": "Zed", "sentence": "hey"},
+            {"speaker": "SPEAKER_01", "sentence": "yo"},
+            {"speaker": "SPEAKER_02", "sentence": "unnamed"},
+            {"speaker": "", "sentence": "noise"},
+        ]
+        with patch("src.api.recordings.reindex_recording_chunks_async"), \
+                patch("src.api.recordings.update_speaker_usage") as usage:
+            resp = client.post(f"/recording/{rec.id}/update_transcript", json={
+                "transcript_data": transcript,
+                "speaker_map": {"SPEAKER_00": {"name": "Bea"}, "SPEAKER_01": {"name": " Al "}},
+            })
+        assert resp.status_code == 200
+        db.session.refresh(rec)
+        assert rec.participants == "Al, Bea, Zed"
+        assert [s["speaker"] for s in json.loads(rec.transcription)] == ["Bea", "Zed", "Al", "SPEAKER_02", ""]
+        usage.assert_called_once_with(["Bea", "Al"])
+        _cleanup(rec, user)
+
+
 def test_update_transcription_missing_data_400():
     with app.app_context():
         user = _mk_user("ut_nd")
@@ -721,6 +867,111 @@ def test_update_transcription_forbidden_for_other_user():
         _cleanup(rec, owner, other)
 
 
+# --------------------------------------------------------------------------- #
+# update_speakers (plain-text transcript)
+# --------------------------------------------------------------------------- #
+
+def test_update_speakers_plain_text_relabels_in_one_pass():
+    with app.app_context():
+        user = _mk_user("us_plain")
+        client = app.test_client()
+        _login(client, user)
+        rec = _mk_recording(
+            user,
+            transcription="[SPEAKER_1]: hi\n[ speaker_10 ]: hello\n[SPEAKER_2]: yo",
+        )
+        with patch("src.api.recordings.reindex_recording_chunks_async"):
+            resp = client.post(f"/recording/{rec.id}/update_speakers", json={"speaker_map": {
+                "SPEAKER_1": {"name": "SPEAKER_2"},
+                "SPEAKER_2": {"name": "Bob"},
+                "SPEAKER_10": {"name": "Carol"},
+            }})
+        assert resp.status_code == 200
+        db.session.refresh(rec)
+        # Swapped labels are not re-replaced, and SPEAKER_1 does not eat SPEAKER_10
+        assert rec.transcription == "[SPEAKER_2]: hi\n[Carol]: hello\n[Bob]: yo"
+        assert set(rec.participants.split(", ")) == {"SPEAKER_2", "Bob", "Carol"}
+        _cleanup(rec, user)
+
+
+def test_update_speakers_json_relabels_and_collects_participants():
+    with app.app_context():
+        user = _mk_user("us_json")
+        client = app.test_client()
+        _login(client, user)
+        rec = _mk_recording(user, transcription=json.dumps([
+            {"speaker": "SPEAKER_00", "sentence": "a"},
+            {"speaker": "Dana", "sentence": "b"},
+            {"speaker": "SPEAKER_01", "sentence": "c"},
+            {"speaker": "SPEAKER_02", "sentence": "d"},
+            {"speaker": "SPEAKER_00", "sentence": "e"},
+        ]))
+        with patch("src.api.recordings.reindex_recording_chunks_async"), \
+                patch("src.api.recordings.update_speaker_usage") as usage:
+            resp = client.post(f"/recording/{rec.id}/update_speakers", json={"speaker_map": {
+                "SPEAKER_00": {"name": "Ann"},
+                "SPEAKER_01": {"name": "  "},
+                "SPEAKER_02": {"name": "Ann"},
+            }})
+        assert resp.status_code == 200
+        db.session.refresh(rec)
+        speakers = [seg["speaker"] for seg in json.loads(rec.transcription)]
+        assert speakers == ["Ann", "Dana", "SPEAKER_01", "Ann", "Ann"]
+        # Default labels are left out; pre-existing names are kept
+        assert rec.participants == "Ann, Dana"
+        usage.assert_called_once_with(["Ann"])
+        _cleanup(rec, user)
+
+
+def test_update_speakers_json_without_matches_keeps_stored_text():
+    with app.app_context():
+        user = _mk_user("us_noop")
+        client = app.test_client()
+        _login(client, user)
+        stored = '[{"speaker": "Dana", "sentence": "b"}]'
+        rec = _mk_recording(user, transcription=stored)
+        with patch("src.api.recordings.reindex_recording_chunks_async"):
+            resp = client.post(f"/recording/{rec.id}/update_speakers", json={"speaker_map": {
+                "SPEAKER_00": {"name": "Ann"},
+            }})
+        assert resp.status_code == 200
+        db.session.refresh(rec)
+        # Nothing relabelled: the stored JSON is not rewritten
+        assert rec.transcription == stored
+        assert rec.participants == "Dana"
+        _cleanup(rec, user)
+
+
+def test_update_speakers_updates_voice_profiles_for_known_speakers():
+    with app.app_context():
+        user = _mk_user("us_emb")
+        ann = Speaker(name="Ann", user_id=user.id)
+        db.session.add(ann)
+        db.session.commit()
+        client = app.test_client()
+        _login(client, user)
+        rec = _mk_recording(
+            user,
+            transcription=json.dumps([{"speaker": "SPEAKER_00", "sentence": "a"},
+                                      {"speaker": "SPEAKER_01", "sentence": "b"}]),
+            speaker_embeddings=json.dumps({"SPEAKER_00": [0.1] * 256, "SPEAKER_01": [0.2] * 256}),
+        )
+        with patch("src.api.recordings.reindex_recording_chunks_async"), \
+                patch("src.api.recordings.update_speaker_usage"), \
+                patch("src.api.recordings.create_speaker_snippets", return_value=0), \
+                patch("src.api.recordings.update_speaker_embedding", return_value=None) as update_emb:
+            resp = client.post(f"/recording/{rec.id}/update_speakers", json={"speaker_map": {
+                "SPEAKER_00": {"name": "Ann"},
+                "SPEAKER_01": {"name": "Nobody Yet"},
+            }})
+        assert resp.status_code == 200
+        # Only the speaker with an existing profile is updated
+        update_emb.assert_called_once()
+        assert update_emb.call_args[0][0].id == ann.id
+        assert update_emb.call_args[0][2] == rec.id
+        _cleanup(rec, ann, user)
+
+
 # --------------------------------------------------------------------------- #
 # toggle inbox / highlight
 # --------------------------------------------------------------------------- #
@@ -1011,3 +1262,25 @@ def test_resolve_transcription_model_accepts_from_db_visible_list():
         assert _resolve_transcription_model("vis-model") == "vis-model"
         assert _resolve_transcription_model("plain-model") == "plain-model"
         assert _resolve_transcription_model("nope") is None
+
+
+def test_transcription_parsed_is_cached_per_value():
+    rec = Recording(transcription='[{"speaker": "A", "sentence": "hi"}]')
+    with patch("src.models.recording.fast_json.loads", wraps=json.loads) as loads:
+        first = rec.transcription_parsed
+        assert first == [{"speaker": "A", "sentence": "hi"}]
+        assert rec.transcription_parsed is first
+        assert loads.call_count == 1
+
+        rec.transcription = '[{"speaker": "B", "sentence": "yo"}]'
+        assert rec.transcription_parsed[0]["speaker"] == "B"
+        assert loads.call_count == 2
+
+        data = [{"speaker": "C", "sentence": "ok"}]
+        rec.set_transcription_data(data)
+        assert json.loads(rec.transcription) == data
+        assert rec.transcription_parsed is data
+        assert loads.call_count == 2
+
+    assert Recording(transcription="plain text").transcription_parsed is None
+    assert Recording(transcription=None).transcription_parsed is None
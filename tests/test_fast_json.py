@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for src/utils/fast_json.py.
+
+The orjson and stdlib code paths must produce identical bytes so callers do
+not depend on which one is installed.
+"""
+
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from flask.json.provider import DefaultJSONProvider
+
+import src.utils.fast_json as fast_json
+
+
+PAYLOAD = {
+    'title': 'Réunion terminée',
+    'body': 'Line one\nLine "two"',
+    'data': {'url': '/recordings/1', 'count': 3, 'ratio': 0.5, 'tags': [], 'ok': True, 'none': None},
+}
+
+
+def test_dumps_bytes_is_compact_utf8():
+    out = fast_json.dumps_bytes(PAYLOAD)
+    assert isinstance(out, bytes)
+    assert b': ' not in out and b', ' not in out
+    assert json.loads(out) == PAYLOAD
+    assert 'Réunion'.encode('utf-8') in out
+
+
+@pytest.mark.skipif(not fast_json.ORJSON_AVAILABLE, reason='orjson not installed')
+def test_dumps_bytes_fallback_matches_orjson():
+    with_orjson = fast_json.dumps_bytes(PAYLOAD)
+    with patch.object(fast_json, 'ORJSON_AVAILABLE', False):
+        assert fast_json.dumps_bytes(PAYLOAD) == with_orjson
+
+
+def test_dumps_and_loads_round_trip_str():
+    out = fast_json.dumps(PAYLOAD)
+    assert isinstance(out, str)
+    assert 'Réunion' in out
+    assert fast_json.loads(out) == PAYLOAD
+    assert fast_json.loads(out.encode('utf-8')) == PAYLOAD
+
+
+@pytest.mark.parametrize('bad', ['not json', '', '{"a":'])
+def test_loads_raises_stdlib_decode_error(bad):
+    with pytest.raises(json.JSONDecodeError):
+        fast_json.loads(bad)
+
+
+@pytest.mark.skipif(not fast_json.ORJSON_AVAILABLE, reason='orjson not installed')
+def test_dumps_fallback_matches_orjson():
+    with_orjson = fast_json.dumps(PAYLOAD)
+    with patch.object(fast_json, 'ORJSON_AVAILABLE', False):
+        assert fast_json.dumps(PAYLOAD) == with_orjson
+
+
+def _jsonify_data(provider_cls, payload):
+    from flask import Flask, jsonify
+    app = Flask(__name__)
+    app.json = provider_cls(app)
+    with app.app_context():
+        resp = jsonify(payload)
+    return resp.mimetype, resp.get_data()
+
+
+@pytest.mark.skipif(not fast_json.ORJSON_AVAILABLE, reason='orjson not installed')
+@pytest.mark.parametrize('payload', [
+    {'z': 1, 'a': {'when': datetime(2024, 1, 2, 3, 4, 5), 'day': date(2024, 1, 2)}, 'm': [1.5, None]},
+    {'big': 2 ** 70, 'id': uuid.UUID(int=1), 'price': Decimal('1.10')},  # orjson rejects the int
+])
+def test_provider_response_matches_default_provider(payload):
+    assert _jsonify_data(fast_json.FastJSONProvider, payload) == _jsonify_data(DefaultJSONProvider, payload)
+
+
+@pytest.mark.skipif(not fast_json.ORJSON_AVAILABLE, reason='orjson not installed')
+def test_provider_response_is_utf8():
+    mimetype, body = _jsonify_data(fast_json.FastJSONProvider, PAYLOAD)
+    assert mimetype == 'application/json'
+    assert body.endswith(b'\n')
+    assert 'Réunion'.encode('utf-8') in body
+    assert json.loads(body) == PAYLOAD
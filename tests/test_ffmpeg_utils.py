@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for the ffmpeg argv built by src/utils/ffmpeg_utils.py.
+
+subprocess.run is patched, so ffmpeg does not need to be installed; the
+tests only pin the command shape (quiet logging, audio-only output).
+"""
+
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.app import app
+from src.utils import ffmpeg_utils
+
+
+@pytest.fixture
+def ran():
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        # compress_audio stats and renames the temp output
+        out = cmd[-1]
+        with open(out, 'wb') as f:
+            f.write(b'x')
+
+    with app.app_context(), patch.object(ffmpeg_utils.subprocess, 'run', side_effect=fake_run):
+        yield calls
+
+
+def _assert_audio_only(cmd, input_path):
+    assert cmd[:6] == ['ffmpeg', '-hide_banner', '-loglevel', 'error', '-threads', '0']
+    assert cmd[cmd.index('-i') + 1] == input_path
+    for flag in ffmpeg_utils.AUDIO_ONLY_ARGS:
+        assert flag in cmd
+
+
+def test_convert_to_mp3_skips_non_audio_streams(ran, tmp_path):
+    src = str(tmp_path / 'talk.mkv')
+    assert ffmpeg_utils.convert_to_mp3(src) == str(tmp_path / 'talk.mp3')
+    _assert_audio_only(ran[0], src)
+    assert ran[0][ran[0].index('-acodec') + 1] == 'libmp3lame'
+
+
+@pytest.mark.parametrize('codec', ['mp3', 'flac', 'opus'])
+def test_compress_audio_skips_non_audio_streams(ran, tmp_path, codec):
+    src = tmp_path / 'talk.wav'
+    src.write_bytes(b'RIFF')
+    out, _, _ = ffmpeg_utils.compress_audio(str(src), codec=codec)
+    assert os.path.exists(out)
+    _assert_audio_only(ran[0], str(src))
+
+
+@pytest.mark.parametrize('fmt', ['mp3', 'wav', 'flac', 'opus'])
+def test_extract_audio_from_video_skips_non_audio_streams(ran, tmp_path, fmt):
+    src = tmp_path / 'clip.mp4'
+    src.write_bytes(b'\x00')
+    out, _ = ffmpeg_utils.extract_audio_from_video(str(src), output_format=fmt, cleanup_original=False)
+    assert out.endswith(f'_audio.{fmt}')
+    _assert_audio_only(ran[0], str(src))
+
+
+def test_compress_audio_replaces_same_named_input(ran, tmp_path):
+    src = tmp_path / 'talk.mp3'
+    src.write_bytes(b'original')
+    out, _, _ = ffmpeg_utils.compress_audio(str(src), codec='mp3')
+    assert out == str(src)
+    assert src.read_bytes() == b'x'
+    assert not (tmp_path / 'talk_compressed_temp.mp3').exists()
+
+
+def test_compress_audio_removes_original_after_move(ran, tmp_path):
+    src = tmp_path / 'talk.wav'
+    src.write_bytes(b'original')
+    out, _, _ = ffmpeg_utils.compress_audio(str(src), codec='flac')
+    assert out == str(tmp_path / 'talk.flac')
+    assert os.path.exists(out)
+    assert not src.exists()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Template formatting used by the automated file exporter
+(file_exporter.format_transcription_with_template).
+
+The user's default template is looked up through TranscriptTemplate.query;
+these tests patch that lookup so no app/DB is needed.
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import src.file_exporter as file_exporter
+
+SEGMENTS = json.dumps([
+    {"speaker": "Alice", "sentence": "Hello there", "start_time": 1.5, "end_time": 3.25},
+    {"speaker": "Bob", "sentence": "{{end_time|srt}} |upper}}", "start_time": 3725.0, "end_time": None},
+])
+USER = SimpleNamespace(id=1)
+
+
+def _format(template_format):
+    template = SimpleNamespace(template=template_format) if template_format else None
+    with patch('src.models.TranscriptTemplate') as model:
+        model.query.filter_by.return_value.first.return_value = template
+        return file_exporter.format_transcription_with_template(SEGMENTS, USER)
+
+
+def test_default_format_without_template():
+    assert _format(None) == "[Alice]: Hello there\n[Bob]: {{end_time|srt}} |upper}}"
+
+
+def test_filters_and_time_formats():
+    out = _format("{{index}} {{speaker|upper}} {{start_time}} {{start_time|srt}}-{{end_time|srt}}")
+    assert out.splitlines() == [
+        "1 ALICE 00:00:01 00:00:01,500-00:00:03,250",
+        "2 BOB 01:02:05 01:02:05,000-00:00:00,000",
+    ]
+
+
+def test_plain_template_leaves_filter_like_text_alone():
+    # Filter syntax that only appears in segment text is not substituted.
+    out = _format("{{speaker}}: {{text}}")
+    assert out.splitlines()[1] == "Bob: {{end_time|srt}} |upper}}"
+
+
+def test_plain_text_transcription_returned_as_is():
+    assert file_exporter.format_transcription_with_template("not json", USER) == "not json"
+
+
+def test_srt_times_match_the_ui_renderer():
+    # 0.29 s is 0.28999... in binary; truncating gave ',289' here while the
+    # UI download rounded to ',290'. Both now use transcript_render.
+    from src.utils.transcript_render import render_segments
+    segments = [{"speaker": "A", "sentence": "hi", "start_time": 0.29, "end_time": 59.9999}]
+    template_format = "{{start_time|srt}} --> {{end_time|srt}} {{end_time}}"
+    with patch('src.models.TranscriptTemplate') as model:
+        model.query.filter_by.return_value.first.return_value = SimpleNamespace(template=template_format)
+        out = file_exporter.format_transcription_with_template(json.dumps(segments), USER)
+    assert out == "00:00:00,290 --> 00:01:00,000 00:00:59"
+    assert out == render_segments(segments, template_format)
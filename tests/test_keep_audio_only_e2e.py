@@ -52,33 +52,16 @@ def test_upload_with_keep_audio_only_persists_flag_on_recording():
         _login(client, user)
 
         # Mock the codec probe to claim "video file" without invoking ffprobe.
-        # Mock convert_if_needed so we don't actually shell out to ffmpeg.
-        with patch('src.api.recordings.get_codec_info') as mock_probe, \
-             patch('src.api.recordings.convert_if_needed') as mock_convert, \
-             patch('src.services.job_queue.job_queue.enqueue', return_value=1):
+        # Conversion itself runs in the (mocked) transcription job.
+        with patch('src.api.recordings.probe', return_value={}), \
+             patch('src.api.recordings.get_codec_info') as mock_probe, \
+             patch('src.services.job_queue.job_queue.enqueue', return_value=1) as mock_enqueue:
             mock_probe.return_value = {
                 'has_video': True,
                 'audio_codec': 'aac',
                 'video_codec': 'h264',
                 'duration': 30.0,
             }
-            # The storage layer now MOVES the converted file into the storage
-            # root, so the mocked conversion must produce a real file on disk
-            # (a fake path would FileNotFoundError on shutil.move). A real
-            # production conversion always yields a real file, so this keeps the
-            # test faithful to the post-storage upload flow.
-            import tempfile
-            conv_fd, conv_path = tempfile.mkstemp(suffix='.mp3')
-            os.write(conv_fd, b'\x00' * (1024 * 1024))
-            os.close(conv_fd)
-            convert_result = MagicMock()
-            convert_result.output_path = conv_path
-            convert_result.was_converted = True
-            convert_result.was_compressed = False
-            convert_result.original_codec = 'aac'
-            convert_result.final_codec = 'mp3'
-            mock_convert.return_value = convert_result
-
             data = {
                 'keep_audio_only': 'true',
                 'title': 'e2e-test',
@@ -98,6 +81,8 @@ def test_upload_with_keep_audio_only_persists_flag_on_recording():
         assert rec.keep_audio_only is True, (
             f'keep_audio_only form field set true, but Recording.keep_audio_only={rec.keep_audio_only}'
         )
+        # The video stream is dropped by the job's upload conversion
+        assert 'convert_upload' in mock_enqueue.call_args.kwargs['params']
 
         db.session.delete(rec)
         db.session.delete(user)
@@ -114,7 +99,8 @@ def test_upload_without_keep_audio_only_leaves_flag_off_when_video_retention_on(
         client = app.test_client()
         _login(client, user)
 
-        with patch('src.api.recordings.get_codec_info') as mock_probe, \
+        with patch('src.api.recordings.probe', return_value={}), \
+             patch('src.api.recordings.get_codec_info') as mock_probe, \
              patch('src.services.job_queue.job_queue.enqueue', return_value=1):
             mock_probe.return_value = {
                 'has_video': True,
@@ -137,6 +137,15 @@ class TestDatabaseMigrations(unittest.TestCase):
             for col in expected:
                 self.assertIn(col, columns, f"Missing tag column: {col}")
 
+    def test_push_subscription_user_endpoint_index(self):
+        """Verify the composite unique index backing push subscription lookups."""
+        with self.app.app_context():
+            from sqlalchemy import inspect
+            indexes = {idx['name']: idx for idx in inspect(db.engine).get_indexes('push_subscriptions')}
+            self.assertIn('ix_pushsub_user_endpoint', indexes)
+            self.assertEqual(indexes['ix_pushsub_user_endpoint']['column_names'], ['user_id', 'endpoint'])
+            self.assertTrue(indexes['ix_pushsub_user_endpoint']['unique'])
+
     def test_system_settings_initialized(self):
         """Verify that default system settings were created."""
         with self.app.app_context():
@@ -150,6 +159,26 @@ class TestDatabaseMigrations(unittest.TestCase):
                 setting = SystemSetting.query.filter_by(key=key).first()
                 self.assertIsNotNone(setting, f"Missing system setting: {key}")
 
+    def test_naming_template_regex_patterns_json_roundtrip(self):
+        """regex_patterns is stored as a native JSON value and read back as a dict."""
+        with self.app.app_context():
+            from src.models import NamingTemplate, User
+            user = User(username='regex_rt', email='regex_rt@example.com')
+            db.session.add(user)
+            db.session.commit()
+
+            patterns = {'phone': '^(\\d{10})'}
+            template = NamingTemplate(user_id=user.id, name='Phone',
+                                      template='{{phone}}', regex_patterns=patterns)
+            db.session.add(template)
+            db.session.commit()
+            db.session.expire_all()
+
+            stored = db.session.get(NamingTemplate, template.id)
+            self.assertEqual(stored.regex_patterns, patterns)
+            self.assertEqual(stored.get_regex_patterns(), patterns)
+            self.assertEqual(stored.apply('5551234567-call.mp3'), '5551234567')
+
     def test_engine_type_matches_expectation(self):
         """Sanity check: confirm we're testing against the expected engine."""
         with self.app.app_context():
@@ -161,5 +190,61 @@ class TestDatabaseMigrations(unittest.TestCase):
                 self.assertEqual(engine_name, 'sqlite')
 
 
+
+class TestPushSubscriptionDuplicateMigration(unittest.TestCase):
+    """Duplicate (user_id, endpoint) rows left by the old subscribe() must not
+    block the unique index that the upsert's ON CONFLICT clause relies on."""
+
+    def test_duplicates_removed_before_unique_index_and_subscribe_works(self):
+        from sqlalchemy import text
+        from src.models import User
+        from src.utils import index_exists
+        from src.api.push_notifications import _upsert_subscription
+
+        app = Flask(__name__)
+        # Raw legacy DDL below is SQLite-specific
+        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+        app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        app.config['TESTING'] = True
+        db.init_app(app)
+
+        with app.app_context():
+            db.create_all()
+            user = User(username='pushdup', email='pushdup@example.com')
+            db.session.add(user)
+            db.session.commit()
+            user_id = user.id
+
+            # A push_subscriptions table without any uniqueness on endpoint
+            db.session.execute(text('DROP TABLE push_subscriptions'))
+            db.session.execute(text(
+                'CREATE TABLE push_subscriptions ('
+                'id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, '
+                'endpoint VARCHAR(500) NOT NULL, p256dh_key VARCHAR(200) NOT NULL, '
+                'auth_key VARCHAR(100) NOT NULL, created_at DATETIME, updated_at DATETIME)'
+            ))
+            for sub_id, endpoint in ((1, 'https://push.example/a'),
+                                     (2, 'https://push.example/a'),
+                                     (3, 'https://push.example/b')):
+                db.session.execute(text(
+                    'INSERT INTO push_subscriptions (id, user_id, endpoint, p256dh_key, auth_key) '
+                    "VALUES (:id, :user_id, :endpoint, 'k', 'a')"
+                ), {'id': sub_id, 'user_id': user_id, 'endpoint': endpoint})
+            db.session.commit()
+
+            initialize_database(app)
+
+            self.assertTrue(index_exists(db.engine, 'push_subscriptions', 'ix_pushsub_user_endpoint'))
+            ids = db.session.execute(text('SELECT id FROM push_subscriptions ORDER BY id')).scalars().all()
+            self.assertEqual(ids, [2, 3])
+
+            sub_id = _upsert_subscription(user_id, 'https://push.example/a', 'new-key', 'new-auth')
+            db.session.commit()
+            self.assertEqual(sub_id, 2)
+            rows = db.session.execute(text(
+                'SELECT id, p256dh_key FROM push_subscriptions ORDER BY id')).all()
+            self.assertEqual([tuple(r) for r in rows], [(2, 'new-key'), (3, 'k')])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -170,6 +170,27 @@ def test_tag_defaults_apply_when_no_user_input():
         assert params.get("initial_prompt") == "tag_prompt", f"got {params!r}"
 
 
+def test_first_tag_by_order_wins():
+    """With several tags, the lowest RecordingTag.order supplies the defaults."""
+    with app.app_context():
+        user, rec = setup_recording()
+        first = Tag(name=f"t1_{user.id}", user_id=user.id, default_hotwords="first_hot")
+        second = Tag(name=f"t2_{user.id}", user_id=user.id, default_hotwords="second_hot",
+                     default_initial_prompt="second_prompt")
+        db.session.add_all([first, second])
+        db.session.flush()
+        # Insert the later-ordered association first
+        db.session.add(RecordingTag(recording_id=rec.id, tag_id=second.id, order=2))
+        db.session.add(RecordingTag(recording_id=rec.id, tag_id=first.id, order=1))
+        db.session.commit()
+        client = app.test_client()
+        login_client(client, user)
+        resp, params = call_reprocess(client, rec.id, {})
+        assert resp.status_code in (200, 202)
+        assert params.get("hotwords") == "first_hot", f"got {params!r}"
+        assert params.get("initial_prompt") == "second_prompt", f"got {params!r}"
+
+
 def test_folder_defaults_apply_when_no_tag():
     """Folder defaults apply when there's no tag override and no user input."""
     with app.app_context():
@@ -237,6 +258,7 @@ def main():
     try:
         run("user input wins over all defaults", test_user_input_wins)
         run("tag defaults apply when no user input", test_tag_defaults_apply_when_no_user_input)
+        run("lowest-ordered tag supplies defaults first", test_first_tag_by_order_wins)
         run("folder defaults apply when no tag", test_folder_defaults_apply_when_no_tag)
         run("user account defaults apply as last resort", test_user_defaults_apply_as_last_resort)
         run("nothing configured → both None", test_empty_when_nothing_configured)
@@ -130,3 +130,101 @@ def test_manual_share_hides_owner_tags_and_folder(ctx):
     vd = rec.to_dict(viewer_user=viewer)
     assert vd['tags'] == []
     assert vd['folder'] is None and vd['folder_id'] is None
+
+
+def test_preloaded_group_ids_match_membership_lookup(ctx):
+    member, outsider = _u(), _u()
+    grp = Group(name=f"g_{uuid.uuid4().hex[:6]}")
+    db.session.add(grp)
+    db.session.commit()
+    db.session.add(GroupMembership(group_id=grp.id, user_id=member.id, role='member'))
+    group_tag = Tag(name="Team", user_id=member.id, group_id=grp.id)
+    personal_tag = Tag(name="Own", user_id=member.id)
+    db.session.add_all([group_tag, personal_tag])
+    db.session.commit()
+    rec = Recording(user_id=member.id, title="R4", audio_path="local://r4.mp3", status="COMPLETED")
+    db.session.add(rec)
+    db.session.commit()
+    _tag_recording(rec, group_tag)
+    _tag_recording(rec, personal_tag)
+
+    assert Recording.get_viewer_group_ids(member) == {grp.id}
+    for viewer, expected in ((member, ["Own", "Team"]), (outsider, [])):
+        group_ids = Recording.get_viewer_group_ids(viewer)
+        preloaded = sorted(t.name for t in rec.get_visible_tags(viewer, group_ids))
+        assert preloaded == sorted(t.name for t in rec.get_visible_tags(viewer)) == expected
+        listed = rec.to_list_dict(viewer_user=viewer, viewer_group_ids=group_ids)
+        assert sorted(t['name'] for t in listed['tags']) == expected
+
+
+def test_batched_edit_ids_match_per_recording_check(ctx, monkeypatch):
+    import src.app as app_module
+    monkeypatch.setattr(app_module, 'ENABLE_INTERNAL_SHARING', True)
+    owner, viewer = _u(), _u()
+    grp = Group(name=f"g_{uuid.uuid4().hex[:6]}")
+    db.session.add(grp)
+    db.session.commit()
+    db.session.add(GroupMembership(group_id=grp.id, user_id=viewer.id, role='admin'))
+    lead_tag = Tag(name="Lead", user_id=owner.id, group_id=grp.id, share_with_group_lead=True)
+    db.session.add(lead_tag)
+    db.session.commit()
+
+    def rec(user, title, share_edit=None):
+        r = Recording(user_id=user.id, title=title, audio_path="local://e.mp3", status="COMPLETED")
+        db.session.add(r)
+        db.session.commit()
+        if share_edit is not None:
+            db.session.add(InternalShare(recording_id=r.id, owner_id=owner.id,
+                                         shared_with_user_id=viewer.id, can_edit=share_edit))
+            db.session.commit()
+        return r
+
+    own = rec(viewer, "own")
+    edit_share = rec(owner, "edit", share_edit=True)
+    view_share = rec(owner, "view", share_edit=False)
+    lead_share = rec(owner, "lead", share_edit=False)
+    _tag_recording(lead_share, lead_tag)
+    unshared = rec(owner, "none")
+    page = [own, edit_share, view_share, lead_share, unshared]
+
+    share_map = {s.recording_id: s for s in InternalShare.query.filter(
+        InternalShare.shared_with_user_id == viewer.id).all()}
+    editable = app_module.get_editable_recording_ids(page, viewer, share_map)
+    assert editable == {own.id, edit_share.id, lead_share.id}
+    assert editable == {r.id for r in page
+                        if app_module.has_recording_access(r, viewer, require_edit=True)}
+
+
+def test_access_check_memoized_per_request(monkeypatch):
+    import src.app as app_module
+    monkeypatch.setattr(app_module, 'ENABLE_INTERNAL_SHARING', True)
+    with app.app_context():
+        owner, viewer = _u(), _u()
+        rec = Recording(user_id=owner.id, title="M", audio_path="local://m.mp3", status="COMPLETED")
+        db.session.add(rec)
+        db.session.commit()
+        db.session.add(InternalShare(recording_id=rec.id, owner_id=owner.id,
+                                     shared_with_user_id=viewer.id, can_edit=True))
+        db.session.commit()
+
+        calls = []
+        real_check = app_module._check_recording_access
+
+        def counting_check(*args):
+            calls.append(args[2:])
+            return real_check(*args)
+
+        monkeypatch.setattr(app_module, '_check_recording_access', counting_check)
+        for _ in range(2):
+            with app.test_request_context('/'):
+                app.preprocess_request()
+                assert app_module.has_recording_access(rec, viewer, require_edit=True)
+                assert app_module.has_recording_access(rec, viewer, require_edit=True)
+                assert app_module.has_recording_access(rec, viewer)
+        # One check per access level per request
+        assert calls == [(True, False), (False, False)] * 2
+
+        # Outside a request nothing is cached
+        app_module.has_recording_access(rec, viewer)
+        app_module.has_recording_access(rec, viewer)
+        assert len(calls) == 6
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Voice-embedding similarity in src/services/speaker_embedding_matcher.py.
+
+Profiles are plain (speaker, embedding) pairs here, so no app/DB is needed.
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.services.speaker_embedding_matcher import (
+    calculate_similarity, _match_profiles, serialize_embedding, deserialize_embedding,
+)
+
+
+def _speaker(speaker_id, name):
+    return SimpleNamespace(id=speaker_id, name=name, confidence_score=None, embedding_count=3)
+
+
+def test_calculate_similarity_cosine():
+    a = np.arange(1, 257, dtype=np.float32)
+    assert calculate_similarity(a, a * 2) == pytest.approx(1.0, abs=1e-6)
+    assert calculate_similarity([1.0, 0.0], [0.0, 1.0]) == pytest.approx(0.0)
+    assert calculate_similarity([1.0, 1.0], [1.0, 0.0]) == pytest.approx(0.7071, abs=1e-4)
+    # A zero vector is not similar to anything rather than NaN
+    assert calculate_similarity([0.0, 0.0], [1.0, 0.0]) == 0.0
+
+
+def test_match_profiles_scores_sorts_and_filters():
+    target = [1.0, 0.0, 0.0]
+    profiles = [
+        (_speaker(1, "Far"), np.array([0.0, 1.0, 0.0], dtype=np.float32)),
+        (_speaker(2, "Close"), np.array([0.9, 0.1, 0.0], dtype=np.float32)),
+        (_speaker(3, "Exact"), np.array([2.0, 0.0, 0.0], dtype=np.float32)),
+        (_speaker(4, "WrongDim"), np.array([1.0, 0.0], dtype=np.float32)),
+    ]
+    matches = _match_profiles(target, profiles, threshold=0.7)
+    assert [m["name"] for m in matches] == ["Exact", "Close"]
+    assert matches[0] == {"speaker_id": 3, "name": "Exact", "similarity": 100.0,
+                          "confidence": 0.5, "embedding_count": 3}
+    assert matches[1]["similarity"] == pytest.approx(99.4, abs=0.1)
+
+
+def test_match_profiles_matches_pairwise_similarity():
+    rng = np.random.default_rng(0)
+    target = rng.normal(size=256).astype(np.float32)
+    profiles = [(_speaker(i, f"s{i}"), deserialize_embedding(serialize_embedding(rng.normal(size=256))))
+                for i in range(20)]
+    matches = {m["speaker_id"]: m["similarity"] for m in _match_profiles(target, profiles, threshold=-1.0)}
+    for speaker, emb in profiles:
+        assert matches[speaker.id] == pytest.approx(round(calculate_similarity(target, emb) * 100, 1), abs=0.11)
+
+
+def test_match_profiles_empty():
+    assert _match_profiles([1.0, 0.0], [], threshold=0.5) == []
+
+
+def test_recording_packs_speaker_embeddings():
+    from src.models import Recording
+    rec = Recording()
+    assert not rec.has_speaker_embeddings
+    assert rec.get_speaker_embeddings() == {}
+
+    rng = np.random.default_rng(1)
+    voices = {"SPEAKER_00": rng.normal(size=256).tolist(), "SPEAKER_01": [0.0] * 256,
+              "SPEAKER_02": list(range(256))}
+    rec.set_speaker_embeddings(voices)
+    assert rec.has_speaker_embeddings
+    assert rec.speaker_embeddings is None
+    assert rec.speaker_embeddings_labels["labels"] == ["SPEAKER_00", "SPEAKER_01", "SPEAKER_02"]
+    assert len(rec.speaker_embeddings_blob) == 3 * 256  # int8 rows
+
+    embeddings = rec.get_speaker_embeddings()
+    assert list(embeddings) == list(voices)
+    assert embeddings["SPEAKER_00"].dtype == np.float32
+    assert calculate_similarity(embeddings["SPEAKER_00"], voices["SPEAKER_00"]) > 0.999
+    assert not embeddings["SPEAKER_01"].any()
+    assert embeddings["SPEAKER_02"][-1] == pytest.approx(255.0)
+    assert np.abs(embeddings["SPEAKER_02"] - np.arange(256)).max() <= 255 / 127 / 2 + 1e-4
+
+    rec.set_speaker_embeddings(None)
+    assert not rec.has_speaker_embeddings
+
+
+@pytest.mark.parametrize("legacy", [
+    {"SPEAKER_00": [0.25] * 4, "SPEAKER_01": [], "SPEAKER_02": None},
+    '{"SPEAKER_00": [0.25, 0.25, 0.25, 0.25], "SPEAKER_01": []}',
+])
+def test_recording_reads_legacy_json_embeddings(legacy):
+    from src.models import Recording
+    rec = Recording(speaker_embeddings=legacy)
+    assert rec.has_speaker_embeddings
+    embeddings = rec.get_speaker_embeddings()
+    assert list(embeddings) == ["SPEAKER_00"]
+    assert embeddings["SPEAKER_00"].tolist() == [0.25] * 4
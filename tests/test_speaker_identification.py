@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+LLM speaker identification (src/services/speaker_identification.py):
+label normalisation, transcript formatting and mapping back to the
+original speaker labels. The LLM call is patched.
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.app import app
+from src.services.speaker_identification import identify_speakers_from_transcript
+
+
+def _completion(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def test_labels_follow_first_appearance_and_map_back():
+    segments = [
+        {"speaker": "B", "sentence": "Hi, I'm Bea."},
+        {"speaker": "", "sentence": "(noise)"},
+        {"speaker": "A", "sentence": "Hello Bea, Al here."},
+        {"speaker": "B", "sentence": "Welcome."},
+    ]
+    prompts = []
+
+    def fake_llm(messages, **kwargs):
+        prompts.append(messages[-1]["content"])
+        return _completion(json.dumps({"SPEAKER_00": "Bea", "SPEAKER_01": "Al"}))
+
+    with app.app_context(), \
+            patch("src.services.llm.call_llm_completion", side_effect=fake_llm), \
+            patch("src.models.SystemSetting.get_setting", return_value=-1):
+        result = identify_speakers_from_transcript(segments, user_id=1)
+
+    assert result == {"B": "Bea", "A": "Al"}
+    assert "The speakers that need to be identified are: SPEAKER_00, SPEAKER_01" in prompts[0]
+    assert ("[SPEAKER_00]: Hi, I'm Bea.\n[Unknown Speaker]: (noise)\n"
+            "[SPEAKER_01]: Hello Bea, Al here.\n[SPEAKER_00]: Welcome.") in prompts[0]
+
+
+def test_no_speakers_skips_llm():
+    with app.app_context(), patch("src.services.llm.call_llm_completion") as llm:
+        assert identify_speakers_from_transcript([{"sentence": "x"}], user_id=1) == {}
+    llm.assert_not_called()
+
+
+def test_transcript_limit_truncates_but_lists_all_speakers():
+    segments = [{"speaker": "A", "sentence": "x" * 40} for _ in range(50)]
+    segments.append({"speaker": "Late", "sentence": "only at the end"})
+    prompts = []
+
+    def fake_llm(messages, **kwargs):
+        prompts.append(messages[-1]["content"])
+        return _completion("{}")
+
+    full = "\n".join(f"[SPEAKER_00]: {'x' * 40}" for _ in range(50))
+    with app.app_context(), \
+            patch("src.services.llm.call_llm_completion", side_effect=fake_llm), \
+            patch("src.models.SystemSetting.get_setting", return_value=100):
+        identify_speakers_from_transcript(segments, user_id=1)
+
+    assert "The speakers that need to be identified are: SPEAKER_00, SPEAKER_01" in prompts[0]
+    assert f"transcript:\n\n{full[:100]}\n\nBased on" in prompts[0]
+    assert "only at the end" not in prompts[0]
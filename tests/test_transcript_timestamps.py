@@ -14,7 +14,9 @@ Run:
 
 import json
 
-from src.utils.transcript_render import render_transcription, DEFAULT_TIMESTAMP_FORMAT
+from src.utils.transcript_render import (
+    render_transcription, render_segments, compile_template, DEFAULT_TIMESTAMP_FORMAT,
+)
 from src.tasks.processing import format_transcription_for_llm
 
 SEGMENTS = json.dumps([
@@ -34,6 +36,38 @@ def test_render_custom_template_and_srt_filter():
     assert out.splitlines()[1] == "00:01:05,000 BOB: Hi"
 
 
+def test_render_segments_all_placeholders_and_unknowns():
+    segments = json.loads(SEGMENTS)
+    out = render_segments(
+        segments, "{{index}}|{{end_time}}|{{end_time|srt}}|{{text|upper}}|{{foo}}|{{foo|upper}}|")
+    assert out.splitlines() == [
+        "1|00:00:02|00:00:02,000|HELLO THERE|{{foo}}||",
+        "2|00:01:07|00:01:07,000|HI|{{foo}}||",
+    ]
+
+
+def test_time_formatting_integer_math():
+    segments = [{"speaker": "A", "sentence": "x", "start_time": 3725.5, "end_time": 0.29},
+                {"speaker": "A", "sentence": "y", "start_time": None, "end_time": 59.9996}]
+    out = render_segments(segments, "{{start_time}} {{start_time|srt}} {{end_time|srt}}")
+    assert out.splitlines() == [
+        "01:02:05 01:02:05,500 00:00:00,290",
+        "00:00:00 00:00:00,000 00:01:00,000",
+    ]
+
+
+def test_compile_template_is_cached_per_format():
+    fmt = "{{index}} {{speaker}}: {{text}}"
+    assert compile_template(fmt) is compile_template(fmt)
+
+
+def test_render_segments_literal_template_repeats_text():
+    segments = json.loads(SEGMENTS)
+    assert render_segments(segments, "---") == "---\n---"
+    assert render_segments(segments, "{{foo}} x") == "{{foo}} x\n{{foo}} x"
+    assert render_segments([], "---") == ""
+
+
 def test_render_returns_none_for_plain_text():
     # Not our JSON segment list -> caller falls back to plain handling.
     assert render_transcription("just a plain transcript", DEFAULT_TIMESTAMP_FORMAT) is None
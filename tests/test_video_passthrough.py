@@ -314,8 +314,8 @@ class TestUploadHandlerPassthrough(unittest.TestCase):
         self.assertIn('VIDEO_RETENTION or VIDEO_PASSTHROUGH_ASR', RECORDINGS)
 
     def test_convert_if_needed_still_in_else(self):
-        """convert_if_needed still runs for audio files or when both flags are off."""
-        self.assertIn('convert_if_needed(', RECORDINGS)
+        """Audio files (or both flags off) are still queued for conversion in the job."""
+        self.assertIn("convert_upload = {'asr_endpoint': USE_ASR_ENDPOINT}", RECORDINGS)
 
     def test_passthrough_log_message(self):
         """Upload handler logs which mode caused the skip."""
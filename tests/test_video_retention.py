@@ -154,9 +154,9 @@ class TestUploadHandlerVideoRetention(unittest.TestCase):
         self.assertIn('if is_likely_video_by_ext:', self.content)
         # And the post-extraction size guard still caps the stored audio
         # against the regular limit, but only when chunking won't handle
-        # it (chunking pipeline accepts large audio).
-        self.assertIn('regular_limit_mb * 1024 * 1024', self.content)
-        self.assertIn('extracted_audio_mb', self.content)
+        # it (chunking pipeline accepts large audio). The cap is handed to
+        # the transcription job, which runs the extraction.
+        self.assertIn("convert_upload['size_limit_bytes'] = regular_limit_mb * 1024 * 1024", self.content)
         self.assertIn('chunking_will_handle_large_audio', self.content)
 
     def test_upload_handler_persists_keep_audio_only_on_recording(self):
@@ -183,8 +183,8 @@ class TestUploadHandlerVideoRetention(unittest.TestCase):
         self.assertIn("has_video = codec_info.get('has_video', False)", self.content)
 
     def test_convert_if_needed_still_in_else_branch(self):
-        """convert_if_needed still runs for non-video files or when retention is off."""
-        self.assertIn('convert_if_needed(', self.content)
+        """Non-video files (or retention off) are queued for conversion in the job."""
+        self.assertIn("convert_upload = {'asr_endpoint': USE_ASR_ENDPOINT}", self.content)
 
     def test_processing_pipeline_still_converts_audio(self):
         """Processing pipeline runs convert_if_needed on extracted audio (the safety net)."""
@@ -250,29 +250,39 @@ class TestAudioConversionNotModified(unittest.TestCase):
 
 
 class TestSendFileConditional(unittest.TestCase):
-    """Test that send_file calls use conditional=True for range request support."""
+    """Test that audio is served through send_audio_file, which always uses
+    conditional=True for range request support."""
 
     def _read_file(self, rel_path):
         with open(os.path.join(PROJECT_ROOT, rel_path), 'r') as f:
             return f.read()
 
+    def test_send_audio_file_is_conditional(self):
+        """The shared audio send_file wrapper passes conditional=True."""
+        content = self._read_file('src/utils/file_delivery.py')
+        self.assertIn('conditional=True,', content)
+
     def test_recordings_streaming_has_conditional(self):
-        """Streaming send_file in recordings.py has conditional=True."""
+        """Streaming in recordings.py goes through send_audio_file."""
         content = self._read_file('src/api/recordings.py')
-        self.assertIn('return send_file(delivery.local_path, mimetype=recording.mime_type, conditional=True)', content)
+        self.assertIn('return send_audio_file(delivery.local_path, mimetype=recording.mime_type)', content)
 
     def test_recordings_download_has_conditional(self):
-        """Download send_file in recordings.py has conditional=True."""
+        """Download in recordings.py goes through send_audio_file."""
         content = self._read_file('src/api/recordings.py')
-        self.assertIn('as_attachment=True,', content)
+        self.assertIn('return send_audio_file(\n                delivery.local_path,\n                as_attachment=True,', content)
         self.assertIn('download_name=download_name,', content)
         self.assertIn('mimetype=recording.mime_type,', content)
-        self.assertIn('conditional=True,', content)
 
     def test_shares_has_conditional(self):
-        """send_file in shares.py has conditional=True."""
+        """shares.py goes through send_audio_file."""
         content = self._read_file('src/api/shares.py')
-        self.assertIn('send_file(delivery.local_path, mimetype=(recording.mime_type or delivery.mimetype), conditional=True)', content)
+        self.assertIn('send_audio_file(delivery.local_path, mimetype=(recording.mime_type or delivery.mimetype))', content)
+
+    def test_api_v1_has_conditional(self):
+        """The API v1 audio endpoint goes through send_audio_file."""
+        content = self._read_file('src/api/api_v1.py')
+        self.assertIn('return send_audio_file(\n        delivery.local_path,', content)
 
 
 class TestFrontendTemplates(unittest.TestCase):